@@ -1,23 +1,151 @@
-from flask import Flask, request, jsonify
+from flask import Flask, Request, request, jsonify, g
+from flask.json.provider import DefaultJSONProvider
 from flask_cors import CORS
 import os
 import sys
 import json
+import tempfile
+import time
 
 # Add scripts directory to path to import manager and config loader
 sys.path.append(os.path.join(os.getcwd(), 'scripts'))
 import manager
 from config_loader import config
-
-# Load configuration
+from content_store import DuplicateIdError
+from upload_jobs import JobQueue
+from http_cache import ResponseCache, encodings, MIN_COMPRESS_SIZE
+from translation_catalog import TranslationCatalog
+from request_metrics import metrics, phase
+from werkzeug.utils import secure_filename
+
+# Load configuration (a no-op when manager already loaded it)
 config.load_all()
 
+class UploadRequest(Request):
+    """Request whose uploaded files stay in memory up to uploads.memoryLimit
+    bytes and spill to an anonymous temp file beyond that, so upload
+    handlers can stream request.files straight to Cloudinary/GitHub."""
+
+    def _get_file_stream(self, total_content_length, content_type, filename=None, content_length=None):
+        limit = config.get_upload_config().get('memoryLimit', 1024 * 1024)
+        return tempfile.SpooledTemporaryFile(max_size=limit, mode='rb+')
+
+class TimedJSONProvider(DefaultJSONProvider):
+    """Flask's JSON provider, timing request parsing and response
+    serialization as the 'parse' and 'serialize' phases"""
+
+    def dumps(self, obj, **kwargs):
+        with phase('serialize'):
+            return super().dumps(obj, **kwargs)
+
+    def loads(self, s, **kwargs):
+        with phase('parse'):
+            return super().loads(s, **kwargs)
+
 app = Flask(__name__)
+app.request_class = UploadRequest
+app.json = TimedJSONProvider(app)
 CORS(app) # Broadest possible CORS for local dev
 
-UPLOAD_FOLDER = 'temp_uploads'
-if not os.path.exists(UPLOAD_FOLDER):
-    os.makedirs(UPLOAD_FOLDER)
+@app.before_request
+def start_timing():
+    g.metrics_token = metrics.begin_request()
+
+@app.before_request
+def watch_config():
+    # Config files edited on disk reach manager.JSON_MAP through the reload
+    # (checked at most every watch_interval), which routes reading the map
+    # directly would never trigger
+    config.reload_if_due()
+
+@app.after_request
+def finish_timing(response):
+    """Record the request's latency and send its phase breakdown as Server-Timing"""
+    token = g.pop('metrics_token', None)
+    if token is not None:
+        total, phases = metrics.end_request(token, route_label(), request.method, response.status_code)
+        response.headers['Server-Timing'] = metrics.server_timing(total, phases)
+    return response
+
+@app.teardown_request
+def abandon_timing(error=None):
+    # An unhandled exception skipped after_request: still count the request
+    token = g.pop('metrics_token', None)
+    if token is not None:
+        metrics.end_request(token, route_label(), request.method, 500)
+
+def route_label():
+    """Route pattern of the request (ids and query strings don't multiply series)"""
+    return request.url_rule.rule if request.url_rule else 'unmatched'
+
+# Background uploads (?async=1): persisted under the content root so pending
+# jobs survive a restart
+upload_config = config.get_upload_config()
+jobs = JobQueue(
+    config.content_root / '.upload-jobs',
+    workers=upload_config.get('jobWorkers', 2),
+    retries=upload_config.get('jobRetries', 3),
+    retry_delay=manager.RETRY_DELAY,
+)
+
+def wants_async():
+    """Whether the client asked for a job id instead of waiting for the upload"""
+    value = request.args.get('async') or request.form.get('async') or ''
+    return value.lower() in ('1', 'true', 'yes')
+
+def spool_to_job(job_dir, index, file):
+    """Copy an uploaded file into its job directory (the request spool is
+    gone once we answer) and return the path"""
+    path = job_dir / f"{index}_{secure_filename(file.filename) or 'upload'}"
+    file.save(str(path))
+    return str(path)
+
+def queued(job):
+    return jsonify({"success": True, "jobId": job["id"], "status": job["status"]}), 202
+
+# Read endpoints polled by the admin pages: built once per file version
+response_cache = ResponseCache()
+
+# lang/*.json, parsed once per file version, with the missing-key sets
+translations = TranslationCatalog(config.lang_dir, reference='en')
+
+def cached_json(key, version, build):
+    """JSON response for a payload that only changes with `version`.
+    Sends a strong ETag and Last-Modified, answers conditional requests
+    with 304, and serves gzip/br bodies compressed once per version."""
+    rep = response_cache.get(key, version, lambda: jsonify(build()).get_data())
+
+    encoding = None
+    if len(rep.body) >= MIN_COMPRESS_SIZE:
+        accepted = [e for e in encodings() if request.accept_encodings[e]]
+        encoding = accepted[0] if accepted else None
+    # Strong ETags are per representation, so encoded bodies get their own
+    etag = f"{rep.etag}-{encoding}" if encoding else rep.etag
+
+    if request.if_none_match:
+        fresh = request.if_none_match.is_strong(rep.etag) or any(
+            request.if_none_match.is_strong(f"{rep.etag}-{e}") for e in encodings()
+        ) or request.if_none_match.star_tag
+    else:
+        since = request.if_modified_since
+        fresh = since is not None and rep.last_modified <= since.timestamp()
+
+    if fresh:
+        response = app.response_class(status=304)
+    else:
+        response = app.response_class(rep.encode(encoding), mimetype='application/json')
+        if encoding:
+            response.headers['Content-Encoding'] = encoding
+    response.set_etag(etag)
+    response.last_modified = rep.last_modified
+    response.headers['Cache-Control'] = 'no-cache'
+    response.vary.add('Accept-Encoding')
+    return response
+
+@app.errorhandler(DuplicateIdError)
+def handle_duplicate_id(e):
+    """Several items share the requested id: refuse to guess which one"""
+    return jsonify({"error": str(e), "duplicateId": e.item_id}), 409
 
 @app.route('/api/upload', methods=['POST'])
 def upload_file():
@@ -38,75 +166,93 @@ def upload_file():
     if not title or not category:
         return jsonify({"error": "Title and Category are required"}), 400
 
-    # Save file temporarily
-    temp_path = os.path.join(UPLOAD_FOLDER, file.filename)
-    file.save(temp_path)
+    metadata = {
+        "medium": medium,
+        "genre": genre,
+        "description": description,
+        "created": created,
+        "filename": file.filename,
+    }
+    if wants_async():
+        job_id, job_dir = jobs.reserve()
+        path = spool_to_job(job_dir, 0, file)
+        return queued(jobs.submit('upload', {
+            "file_path": path, "title": title, "category": category, **metadata
+        }, job_id=job_id))
 
     try:
-        # Use manager logic to upload to Cloudinary and update JSON
-        result = manager.upload_and_save(
-            temp_path,
-            title,
-            category,
-            medium=medium,
-            genre=genre,
-            description=description,
-            created=created
-        )
+        # Use manager logic to upload to Cloudinary and update JSON,
+        # streaming straight from the request's file spool
+        result = manager.upload_and_save(file.stream, title, category, **metadata)
         return jsonify({"success": True, "data": result})
     except Exception as e:
         return jsonify({"error": str(e)}), 500
-    finally:
-        # Cleanup temp file
-        if os.path.exists(temp_path):
-            os.remove(temp_path)
 
 @app.route('/api/upload-bulk', methods=['POST'])
 def upload_bulk():
     """Handle bulk file uploads. Each file is sent with per-file metadata
-    encoded as form fields: category_0, title_0, medium_0, etc."""
-    results = []
-    errors = []
+    encoded as form fields: category_0, title_0, medium_0, etc.
+    Files stream from the request to the remote host; uploads run
+    concurrently (uploads.concurrency in config/app.json) and new entries
+    are written once per category at the end.
+    With ?async=1 the files are queued as one job instead."""
+    job_id, job_dir = jobs.reserve() if wants_async() else (None, None)
     file_keys = [k for k in request.files if k.startswith('file_')]
     file_keys.sort(key=lambda k: int(k.split('_')[1]))
 
+    uploads = []
     for key in file_keys:
         idx = key.split('_')[1]
         file = request.files[key]
-        title = request.form.get(f'title_{idx}', file.filename)
         category = request.form.get(f'category_{idx}')
-        medium = request.form.get(f'medium_{idx}')
-        genre = request.form.get(f'genre_{idx}')
-        description = request.form.get(f'description_{idx}')
-        created = request.form.get(f'created_{idx}')
 
         if not category:
-            errors.append({"file": file.filename, "error": "Missing category"})
+            uploads.append({"file": file.filename, "error": "Missing category"})
             continue
 
-        temp_path = os.path.join(UPLOAD_FOLDER, file.filename)
-        file.save(temp_path)
-
-        try:
-            result = manager.upload_and_save(
-                temp_path, title, category,
-                medium=medium, genre=genre,
-                description=description, created=created
-            )
-            results.append({"file": file.filename, "success": True, "data": result})
-        except Exception as e:
-            errors.append({"file": file.filename, "error": str(e)})
-        finally:
-            if os.path.exists(temp_path):
-                os.remove(temp_path)
+        # Each file streams from its own request spool, no extra copy on disk
+        # (queued jobs need their own copy, the spool is gone after the response)
+        uploads.append({
+            "file": file.filename,
+            "spec": {
+                "file_path": spool_to_job(job_dir, idx, file) if job_id else file.stream,
+                "filename": file.filename,
+                "title": request.form.get(f'title_{idx}', file.filename),
+                "category": category,
+                "medium": request.form.get(f'medium_{idx}'),
+                "genre": request.form.get(f'genre_{idx}'),
+                "description": request.form.get(f'description_{idx}'),
+                "created": request.form.get(f'created_{idx}'),
+            }
+        })
+
+    if job_id:
+        return queued(jobs.submit('upload-bulk', {"uploads": uploads, "total": len(uploads)}, job_id=job_id))
+
+    specs = [u["spec"] for u in uploads if "spec" in u]
+    outcomes = iter(manager.upload_many(specs))
+    done = {i: next(outcomes) for i, u in enumerate(uploads) if "spec" in u}
+    return jsonify(bulk_report(uploads, done))
+
+def bulk_report(uploads, outcomes):
+    """Summarise bulk uploads: outcomes maps an upload's position to its
+    entry or exception; uploads without one report their own error"""
+    results = []
+    errors = []
+    for i, upload in enumerate(uploads):
+        outcome = outcomes.get(i, upload.get("error"))
+        if isinstance(outcome, dict):
+            results.append({"file": upload["file"], "success": True, "data": outcome})
+        else:
+            errors.append({"file": upload["file"], "error": str(outcome)})
 
-    return jsonify({
+    return {
         "success": len(errors) == 0,
         "uploaded": len(results),
         "failed": len(errors),
         "results": results,
         "errors": errors
-    })
+    }
 
 @app.route('/api/upload-url', methods=['POST'])
 def upload_from_url():
@@ -124,30 +270,63 @@ def upload_from_url():
     if not url or not title or not category:
         return jsonify({"error": "URL, Title, and Category are required"}), 400
 
+    metadata = {"medium": medium, "genre": genre, "description": description, "created": created}
+    if wants_async() or data.get('async'):
+        return queued(jobs.submit('upload-url', {"url": url, "title": title, "category": category, **metadata}))
+
     try:
-        result = manager.save_from_url(
-            url, title, category,
-            medium=medium,
-            genre=genre,
-            description=description,
-            created=created
-        )
+        result = manager.save_from_url(url, title, category, **metadata)
         return jsonify({"success": True, "data": result})
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
+def run_upload_job(job):
+    params = dict(job["params"])
+    return manager.upload_and_save(params.pop("file_path"), params.pop("title"), params.pop("category"), **params)
+
+def run_url_job(job):
+    params = dict(job["params"])
+    return manager.save_from_url(params.pop("url"), params.pop("title"), params.pop("category"), **params)
+
+def run_bulk_job(job):
+    """Upload the files not done yet; a retry only re-sends the failures"""
+    uploads = job["params"]["uploads"]
+    done = {int(i): entry for i, entry in job["state"].get("done", {}).items()}
+    pending = [i for i, u in enumerate(uploads) if "spec" in u and i not in done]
+
+    outcomes = dict(zip(pending, manager.upload_many([uploads[i]["spec"] for i in pending])))
+    done.update((i, entry) for i, entry in outcomes.items() if not isinstance(entry, Exception))
+    report = bulk_report(uploads, {**outcomes, **done})
+    jobs.checkpoint(
+        job,
+        state={"done": {str(i): entry for i, entry in done.items()}},
+        progress={"done": len(done), "total": len(uploads)},
+        result=report,
+    )
+    if any(isinstance(entry, Exception) for entry in outcomes.values()):
+        raise RuntimeError(f"{report['failed']} of {len(uploads)} uploads failed")
+    return report
+
+jobs.register('upload', run_upload_job)
+jobs.register('upload-url', run_url_job)
+jobs.register('upload-bulk', run_bulk_job)
+
+@app.route('/api/jobs', methods=['GET'])
+def list_jobs():
+    """Recent upload jobs, newest first"""
+    return jsonify(jobs.list())
+
+@app.route('/api/jobs/<job_id>', methods=['GET'])
+def get_job(job_id):
+    """Status, progress and result (or error) of an upload job"""
+    job = jobs.get(job_id)
+    if job is None:
+        return jsonify({"error": f"Job '{job_id}' not found"}), 404
+    return jsonify(job)
+
 @app.route('/api/translations', methods=['GET'])
 def get_translations():
-    translations = {}
-    if not config.lang_dir.exists():
-        return jsonify(translations)
-        
-    for filename in os.listdir(config.lang_dir):
-        if filename.endswith('.json'):
-            lang_code = filename.split('.')[0]
-            with open(config.lang_dir / filename, 'r', encoding='utf-8') as f:
-                translations[lang_code] = json.load(f)
-    return jsonify(translations)
+    return cached_json('translations', translations.version(), translations.all)
 
 @app.route('/api/translations/update', methods=['POST'])
 def update_translations():
@@ -159,58 +338,67 @@ def update_translations():
     if not lang_code or not key or not value:
         return jsonify({"error": "Lang, Key, and Value are required"}), 400
 
-    file_path = config.lang_dir / f'{lang_code}.json'
-    if not file_path.exists():
+    try:
+        translations.set(lang_code, key, value)
+    except FileNotFoundError:
         return jsonify({"error": f"Language file {lang_code}.json not found"}), 404
 
-    with open(file_path, 'r', encoding='utf-8') as f:
-        translations = json.load(f)
+    return jsonify({"success": True})
 
-    translations[key] = value
+@app.route('/api/translations/batch', methods=['POST'])
+def update_translations_batch():
+    """Write many keys at once: {"updates": [{"lang", "key", "value"}, ...]}.
+    Each language file is rewritten once; results are reported per key."""
+    data = request.json or {}
+    updates = data.get('updates')
+    if not isinstance(updates, list) or not updates:
+        return jsonify({"error": "updates must be a non-empty list"}), 400
+
+    results = [None] * len(updates)
+    valid = []
+    for i, update in enumerate(updates):
+        update = update if isinstance(update, dict) else {}
+        lang_code, key, value = update.get('lang'), update.get('key'), update.get('value')
+        if not lang_code or not key or not value:
+            results[i] = {"lang": lang_code, "key": key, "success": False,
+                          "error": "Lang, Key, and Value are required"}
+        else:
+            valid.append((i, (lang_code, key, value)))
 
-    with open(file_path, 'w', encoding='utf-8') as f:
-        json.dump(translations, f, indent=4, ensure_ascii=False)
+    for (i, _), result in zip(valid, translations.set_many([u for _, u in valid])):
+        results[i] = result
+
+    failed = sum(1 for r in results if not r["success"])
+    return jsonify({
+        "success": failed == 0,
+        "updated": len(results) - failed,
+        "failed": failed,
+        "results": results
+    })
 
-    return jsonify({"success": True})
 @app.route('/api/translations/missing', methods=['GET'])
 def get_missing_translations():
-    en_file = config.lang_dir / 'en.json'
-    if not en_file.exists():
-         return jsonify({})
-         
-    with open(en_file, 'r', encoding='utf-8') as f:
-        en_keys = set(json.load(f).keys())
-    
-    missing = {}
-    if config.lang_dir.exists():
-        for filename in os.listdir(config.lang_dir):
-            if filename.endswith('.json') and filename != 'en.json':
-                lang_code = filename.split('.')[0]
-                with open(config.lang_dir / filename, 'r', encoding='utf-8') as f:
-                    lang_keys = set(json.load(f).keys())
-                
-                diff = en_keys - lang_keys
-                if diff:
-                    missing[lang_code] = list(diff)
-    
-    return jsonify(missing)
+    """Keys of lang/en.json each other language lacks"""
+    return jsonify(translations.missing())
+
+@app.route('/api/translations/coverage', methods=['GET'])
+def get_translation_coverage():
+    """Per language: en keys in total, translated and missing"""
+    return jsonify(translations.coverage())
 
 @app.route('/api/github/sync', methods=['POST'])
 def sync_github():
-    token = os.getenv('GITHUB_TOKEN')
+    token = manager.github.token
     username = config.get_github_config().get('username', 'yourusername')
-    headers = {'Accept': 'application/vnd.github.v3+json'}
-    if token:
-        headers['Authorization'] = f'token {token}'
-    
+
     try:
-        url = f'https://api.github.com/users/{username}/repos?sort=updated&per_page=100'
+        url = f'/users/{username}/repos?sort=updated&per_page=100'
         # If token is provided, we use the authenticated user's repos endpoint to get private ones
         if token:
-            url = f'https://api.github.com/user/repos?sort=updated&per_page=100'
-            
-        import requests
-        response = requests.get(url, headers=headers)
+            url = '/user/repos?sort=updated&per_page=100'
+
+        # Shared keep-alive session (see github_client.py)
+        response = manager.github.request('GET', url)
         response.raise_for_status()
         repos = response.json()
         
@@ -233,27 +421,138 @@ def sync_github():
         # Ensure data directory exists
         if not config.data_dir.exists():
             os.makedirs(config.data_dir)
-            
-        with open(config.data_dir / 'projects.json', 'w', encoding='utf-8') as f:
-            json.dump(projects, f, indent=4)
-            
+
+        if 'projects' in manager.JSON_MAP:
+            # Full replace: also discards any journaled project edits
+            manager.store.save('projects', projects)
+        else:
+            with open(config.data_dir / 'projects.json', 'w', encoding='utf-8') as f:
+                json.dump(projects, f, indent=4)
+
         return jsonify({"success": True, "count": len(projects)})
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
+@app.route('/api/github/stats', methods=['GET'])
+def get_github_stats():
+    """Report GitHub request counters (requests made and saved by caching)"""
+    return jsonify(manager.github.stats())
+
+# Upper bound for ?limit= on paginated /api/content
+MAX_PAGE_SIZE = 500
+
 @app.route('/api/content', methods=['GET'])
 def get_all_content():
-    content = {}
-    for cat, path in manager.JSON_MAP.items():
-        if os.path.exists(path):
-            with open(path, 'r', encoding='utf-8') as f:
-                try:
-                    content[cat] = json.load(f)
-                except json.JSONDecodeError:
-                    content[cat] = []
-        else:
-            content[cat] = []
-    return jsonify(content)
+    """All categories at once, or with ?category= one page of a category:
+    limit (default pagination.pageSize), cursor (nextCursor of the previous
+    page), sort (date, created, -date, -created) and fields (comma list)"""
+    if request.args:
+        return get_content_page()
+    categories = list(manager.JSON_MAP)
+    version = [(cat, manager.store.version(cat)) for cat in categories]
+    return cached_json('content', version, lambda: {cat: manager.store.load(cat) for cat in categories})
+
+def get_content_page():
+    category = request.args.get('category')
+    if not category:
+        return jsonify({"error": "category is required for paginated queries"}), 400
+    if category not in manager.JSON_MAP:
+        return jsonify({"error": f"Category '{category}' is invalid."}), 400
+
+    try:
+        limit = int(request.args.get('limit', config.get_setting('pagination.pageSize') or 24))
+    except ValueError:
+        return jsonify({"error": "limit must be an integer"}), 400
+    limit = max(1, min(limit, MAX_PAGE_SIZE))
+    fields = [f for f in request.args.get('fields', '').split(',') if f]
+
+    try:
+        items, next_cursor, total = manager.store.page(
+            category,
+            sort=request.args.get('sort'),
+            cursor=request.args.get('cursor'),
+            limit=limit,
+        )
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
+    if fields:
+        items = [{f: item[f] for f in fields if f in item} for item in items]
+    return jsonify({
+        "category": category,
+        "items": items,
+        "total": total,
+        "nextCursor": next_cursor
+    })
+
+@app.route('/api/search', methods=['GET'])
+def search_content():
+    """Items whose title, description, medium or genre contain every word
+    of ?q= (words match as prefixes, accents are ignored for fr/ht/mx).
+    Optional lang, category and limit (default pagination.pageSize)"""
+    query = request.args.get('q', '').strip()
+    if not query:
+        return jsonify({"error": "q is required"}), 400
+    category = request.args.get('category')
+    if category and category not in manager.JSON_MAP:
+        return jsonify({"error": f"Category '{category}' is invalid."}), 400
+    lang = request.args.get('lang') or None
+
+    try:
+        limit = int(request.args.get('limit', config.get_setting('pagination.pageSize') or 24))
+    except ValueError:
+        return jsonify({"error": "limit must be an integer"}), 400
+    limit = max(1, min(limit, MAX_PAGE_SIZE))
+
+    hits = manager.search.search(query, lang=lang, categories=[category] if category else None)
+    return jsonify({
+        "query": query,
+        "total": len(hits),
+        "results": [{"category": cat, "item": item} for cat, item in hits[:limit]]
+    })
+
+@app.route('/api/search/rebuild', methods=['POST'])
+def rebuild_search():
+    """Rebuild the search index from the stored content"""
+    return jsonify({"success": True, "indexed": manager.search.rebuild()})
+
+@app.route('/api/search/stats', methods=['GET'])
+def get_search_stats():
+    """Report search index sizes"""
+    return jsonify(manager.search.stats())
+
+@app.route('/api/content/stats', methods=['GET'])
+def get_content_stats():
+    """Report content store cache hit/miss counters"""
+    return jsonify(manager.store.stats())
+
+@app.route('/api/metrics', methods=['GET'])
+def get_metrics():
+    """Request counters, per-route latency and per-phase histograms
+    in the Prometheus text format"""
+    return app.response_class(metrics.render(), mimetype='text/plain; version=0.0.4')
+
+@app.route('/api/content/compact', methods=['POST'])
+def compact_content():
+    """Fold journal storage back into the data/*.json files the site reads"""
+    data = request.json or {}
+    category = data.get('category')
+    if category and category not in manager.JSON_MAP:
+        return jsonify({"error": f"Invalid category: {category}"}), 404
+
+    folded = manager.compact_journals([category] if category else None)
+    return jsonify({"success": True, "compacted": folded})
+
+@app.route('/api/content/export', methods=['POST'])
+def export_content():
+    """Write the data/*.json files the static site reads from the active storage"""
+    data = request.json or {}
+    category = data.get('category')
+    if category and category not in manager.JSON_MAP:
+        return jsonify({"error": f"Invalid category: {category}"}), 404
+
+    exported = manager.export_static([category] if category else None)
+    return jsonify({"success": True, "exported": exported})
 
 @app.route('/api/content/item', methods=['GET'])
 def get_single_item():
@@ -263,148 +562,143 @@ def get_single_item():
     if not category or not item_id:
         return jsonify({"error": "Category and ID are required"}), 400
 
-    json_path = manager.JSON_MAP.get(category)
-    if not json_path or not os.path.exists(json_path):
+    if not manager.store.exists(category):
         return jsonify({"error": f"Invalid category or file not found: {category}"}), 404
 
-    with open(json_path, 'r', encoding='utf-8') as f:
-        data_list = json.load(f)
+    item = manager.store.get(category, item_id, match_title=(category == 'projects'))
+    if item is None:
+        return jsonify({"error": "Item not found"}), 404
 
-    for item in data_list:
-        if item.get('id') == item_id or (category == 'projects' and item.get('title') == item_id):
-            return jsonify({"success": True, "item": item, "category": category})
+    return jsonify({"success": True, "item": item, "category": category})
 
-    return jsonify({"error": "Item not found"}), 404
+class OperationError(Exception):
+    """A content operation that can't be applied: message and HTTP status"""
 
-@app.route('/api/content/delete', methods=['POST'])
-def delete_content():
-    data = request.json
+    def __init__(self, message, status=400):
+        super().__init__(message)
+        self.status = status
+
+@app.errorhandler(OperationError)
+def handle_operation_error(e):
+    return jsonify({"error": str(e)}), e.status
+
+class PendingChanges:
+    """Items changed and removed by content operations, per category,
+    saved with one write per category by commit()"""
+
+    def __init__(self):
+        self.categories = {}  # category -> ({id(item): item}, [removed items])
+
+    def _category(self, category):
+        return self.categories.setdefault(category, ({}, []))
+
+    def touch(self, category):
+        """Mark a category as modified without any searchable change"""
+        self._category(category)
+
+    def changed(self, category, item):
+        self._category(category)[0][id(item)] = item
+
+    def removed(self, category, item):
+        changed, removed = self._category(category)
+        changed.pop(id(item), None)
+        removed.append(item)
+
+    def commit(self):
+        """Write every touched category, all or none (store.save_many())"""
+        if self.categories:
+            manager.save_categories({
+                category: (list(changed.values()), removed)
+                for category, (changed, removed) in self.categories.items()
+            })
+
+def require_category(category):
+    if not manager.store.exists(category):
+        raise OperationError(f"Invalid category: {category}", 404)
+
+def delete_item(data, changes):
     category = data.get('category')
     item_id = data.get('id')
-    
+
     if not category or not item_id:
-        return jsonify({"error": "Category and ID are required"}), 400
-        
-    json_path = manager.JSON_MAP.get(category)
-    if not json_path or not os.path.exists(json_path):
-        return jsonify({"error": f"Invalid category or file not found: {category}"}), 404
-        
-    with open(json_path, 'r', encoding='utf-8') as f:
-        data_list = json.load(f)
-    
-    # Filter out the item. For projects, we might match by title if id is missing
-    original_len = len(data_list)
-    if category == 'projects':
-        data_list = [item for item in data_list if item.get('id') != item_id and item.get('title') != item_id]
-    else:
-        data_list = [item for item in data_list if item.get('id') != item_id]
-        
-    if len(data_list) == original_len:
-        return jsonify({"error": "Item not found"}), 404
-        
-    with open(json_path, 'w', encoding='utf-8') as f:
-        json.dump(data_list, f, indent=4, ensure_ascii=False)
-        
-    manager.update_site_timestamp()
-    return jsonify({"success": True})
+        raise OperationError("Category and ID are required")
 
-@app.route('/api/content/update', methods=['POST'])
-def update_content():
-    data = request.json
+    if not manager.store.exists(category):
+        raise OperationError(f"Invalid category or file not found: {category}", 404)
+
+    # For projects, we might match by title if id is missing
+    position = manager.store.find(category, item_id, match_title=(category == 'projects'))
+    if position is None:
+        raise OperationError("Item not found", 404)
+
+    changes.removed(category, manager.store.remove(category, position))
+    return {}
+
+def update_item(data, changes):
     category = data.get('category')
     item_id = data.get('id')
     updates = data.get('updates')
-    
+
     if not category or not item_id or not updates:
-        return jsonify({"error": "Category, ID, and Updates are required"}), 400
-        
-    json_path = manager.JSON_MAP.get(category)
-    if not json_path or not os.path.exists(json_path):
-        return jsonify({"error": f"Invalid category or file not found: {category}"}), 404
-        
-    with open(json_path, 'r', encoding='utf-8') as f:
-        data_list = json.load(f)
-        
-    updated = False
-    for item in data_list:
-        # Match by ID or Title for projects
-        if item.get('id') == item_id or (category == 'projects' and item.get('title') == item_id):
-            item.update(updates)
-            updated = True
-            break
-            
-    if not updated:
-        return jsonify({"error": "Item not found"}), 404
-        
-    with open(json_path, 'w', encoding='utf-8') as f:
-        json.dump(data_list, f, indent=4, ensure_ascii=False)
-        
-    manager.update_site_timestamp()
-    return jsonify({"success": True})
+        raise OperationError("Category, ID, and Updates are required")
 
-@app.route('/api/content/move-to-pile', methods=['POST'])
-def move_to_pile():
+    if not manager.store.exists(category):
+        raise OperationError(f"Invalid category or file not found: {category}", 404)
+
+    # Match by ID or Title for projects
+    position = manager.store.find(category, item_id, match_title=(category == 'projects'))
+    if position is None:
+        raise OperationError("Item not found", 404)
+
+    # Copy of the old version: a new id or title must leave the search index
+    changes.removed(category, dict(manager.store.load(category)[position]))
+    changes.changed(category, manager.store.update(category, position, updates))
+    return {}
+
+def move_item_to_pile(data, changes):
     """Move a source item's image into a target item's gallery array,
     then delete the source item."""
-    data = request.json
     category = data.get('category')
     source_id = data.get('sourceId')
     target_id = data.get('targetId')
 
     if not category or not source_id or not target_id:
-        return jsonify({"error": "category, sourceId, and targetId are required"}), 400
+        raise OperationError("category, sourceId, and targetId are required")
 
     if source_id == target_id:
-        return jsonify({"error": "Source and target cannot be the same item"}), 400
+        raise OperationError("Source and target cannot be the same item")
 
-    json_path = manager.JSON_MAP.get(category)
-    if not json_path or not os.path.exists(json_path):
-        return jsonify({"error": f"Invalid category: {category}"}), 404
+    require_category(category)
 
-    with open(json_path, 'r', encoding='utf-8') as f:
-        data_list = json.load(f)
+    data_list = manager.store.load(category)
+    source_pos = manager.store.find(category, source_id)
+    target_pos = manager.store.find(category, target_id)
 
-    source_item = None
-    target_item = None
-    for item in data_list:
-        if item.get('id') == source_id:
-            source_item = item
-        if item.get('id') == target_id:
-            target_item = item
+    if source_pos is None:
+        raise OperationError("Source item not found", 404)
+    if target_pos is None:
+        raise OperationError("Target item not found", 404)
 
-    if not source_item:
-        return jsonify({"error": "Source item not found"}), 404
-    if not target_item:
-        return jsonify({"error": "Target item not found"}), 404
+    source_item = data_list[source_pos]
+    target_item = data_list[target_pos]
 
     source_url = source_item.get('url')
     if not source_url:
-        return jsonify({"error": "Source item has no URL"}), 400
+        raise OperationError("Source item has no URL")
 
     # Append source URL (and its own gallery images) into target's gallery
-    if 'gallery' not in target_item:
-        target_item['gallery'] = []
-    target_item['gallery'].append(source_url)
+    gallery = target_item.get('gallery', []) + [source_url]
     # Also move any gallery images the source already had
-    for img in source_item.get('gallery', []):
-        target_item['gallery'].append(img)
+    gallery.extend(source_item.get('gallery', []))
+    manager.store.update(category, target_pos, {'gallery': gallery})
 
     # Remove source item
-    data_list = [item for item in data_list if item.get('id') != source_id]
-
-    with open(json_path, 'w', encoding='utf-8') as f:
-        json.dump(data_list, f, indent=4, ensure_ascii=False)
+    changes.removed(category, manager.store.remove(category, source_pos))
 
-    manager.update_site_timestamp()
-    return jsonify({
-        "success": True,
-        "targetGalleryCount": len(target_item.get('gallery', []))
-    })
+    return {"targetGalleryCount": len(gallery)}
 
-@app.route('/api/content/extract-from-pile', methods=['POST'])
-def extract_from_pile():
+def extract_item_from_pile(data, changes):
     """Extract a single image from a pile's gallery and create a new standalone item."""
-    data = request.json
     category = data.get('category')
     source_id = data.get('sourceId')
     image_url = data.get('imageUrl')
@@ -413,37 +707,34 @@ def extract_from_pile():
     custom_description = data.get('customDescription', '')
 
     if not category or not source_id or image_url is None or image_index is None:
-        return jsonify({"error": "category, sourceId, imageUrl, and imageIndex are required"}), 400
-
-    json_path = manager.JSON_MAP.get(category)
-    if not json_path or not os.path.exists(json_path):
-        return jsonify({"error": f"Invalid category: {category}"}), 404
+        raise OperationError("category, sourceId, imageUrl, and imageIndex are required")
 
-    with open(json_path, 'r', encoding='utf-8') as f:
-        data_list = json.load(f)
+    require_category(category)
 
-    source_item = None
-    for item in data_list:
-        if item.get('id') == source_id:
-            source_item = item
-            break
+    source_pos = manager.store.find(category, source_id)
+    if source_pos is None:
+        raise OperationError("Source item not found", 404)
 
-    if not source_item:
-        return jsonify({"error": "Source item not found"}), 404
+    source_item = manager.store.load(category)[source_pos]
 
     if 'gallery' not in source_item or image_index >= len(source_item['gallery']):
-        return jsonify({"error": "Invalid image index"}), 400
+        raise OperationError("Invalid image index")
 
     # Remove the image from the gallery
-    extracted_url = source_item['gallery'].pop(image_index)
+    gallery = list(source_item['gallery'])
+    extracted_url = gallery.pop(image_index)
+    source_updates = {'gallery': gallery}
 
     # Remove metadata for this image if it exists
     if 'galleryMetadata' in source_item and extracted_url in source_item['galleryMetadata']:
-        del source_item['galleryMetadata'][extracted_url]
+        metadata = dict(source_item['galleryMetadata'])
+        del metadata[extracted_url]
+        source_updates['galleryMetadata'] = metadata
+
+    manager.store.update(category, source_pos, source_updates)
 
     # Create a new item with the extracted image
-    import time
-    new_id = f"{category}_extracted_{int(time.time())}"
+    new_id = manager.store.unique_id(category, f"{category}_extracted_{int(time.time())}")
 
     # Use custom title if provided, otherwise generate default
     if custom_title:
@@ -477,23 +768,15 @@ def extract_from_pile():
     }
 
     # Add the new item to the list
-    data_list.append(new_item)
-
-    # Save the updated list
-    with open(json_path, 'w', encoding='utf-8') as f:
-        json.dump(data_list, f, indent=4, ensure_ascii=False)
+    changes.changed(category, manager.store.append(category, new_item))
 
-    manager.update_site_timestamp()
-    return jsonify({
-        "success": True,
+    return {
         "newTitle": new_title,
         "newId": new_id
-    })
+    }
 
-@app.route('/api/content/add-to-pile', methods=['POST'])
-def add_to_pile():
+def add_item_to_pile(data, changes):
     """Move a single image from one pile's gallery to another pile's gallery."""
-    data = request.json
     category = data.get('category')
     source_id = data.get('sourceId')
     target_id = data.get('targetId')
@@ -501,57 +784,121 @@ def add_to_pile():
     image_index = data.get('imageIndex')
 
     if not category or not source_id or not target_id or image_url is None or image_index is None:
-        return jsonify({"error": "category, sourceId, targetId, imageUrl, and imageIndex are required"}), 400
-
-    json_path = manager.JSON_MAP.get(category)
-    if not json_path or not os.path.exists(json_path):
-        return jsonify({"error": f"Invalid category: {category}"}), 404
+        raise OperationError("category, sourceId, targetId, imageUrl, and imageIndex are required")
 
-    with open(json_path, 'r', encoding='utf-8') as f:
-        data_list = json.load(f)
+    require_category(category)
 
-    source_item = None
-    target_item = None
-    for item in data_list:
-        if item.get('id') == source_id:
-            source_item = item
-        if item.get('id') == target_id:
-            target_item = item
+    data_list = manager.store.load(category)
+    source_pos = manager.store.find(category, source_id)
+    target_pos = manager.store.find(category, target_id)
 
-    if not source_item:
-        return jsonify({"error": "Source item not found"}), 404
-    if not target_item:
-        return jsonify({"error": "Target item not found"}), 404
+    if source_pos is None:
+        raise OperationError("Source item not found", 404)
+    if target_pos is None:
+        raise OperationError("Target item not found", 404)
 
+    source_item = data_list[source_pos]
     if 'gallery' not in source_item or image_index >= len(source_item['gallery']):
-        return jsonify({"error": "Invalid image index"}), 400
+        raise OperationError("Invalid image index")
 
     # Remove the image from source gallery
-    extracted_url = source_item['gallery'].pop(image_index)
+    source_gallery = list(source_item['gallery'])
+    extracted_url = source_gallery.pop(image_index)
+    manager.store.update(category, source_pos, {'gallery': source_gallery})
+
+    # Add to target gallery (galleries aren't searched)
+    target_gallery = data_list[target_pos].get('gallery', []) + [extracted_url]
+    manager.store.update(category, target_pos, {'gallery': target_gallery})
+    changes.touch(category)
+
+    return {"targetGalleryCount": len(target_gallery)}
+
+# Operations accepted by /api/content/batch, also behind the single-item endpoints
+CONTENT_OPERATIONS = {
+    'update': update_item,
+    'delete': delete_item,
+    'move-to-pile': move_item_to_pile,
+    'extract-from-pile': extract_item_from_pile,
+    'add-to-pile': add_item_to_pile,
+}
+
+def run_operation(operation):
+    """Apply one operation from the request body and save it"""
+    with manager.store.transaction():
+        changes = PendingChanges()
+        result = operation(request.json or {}, changes)
+        changes.commit()
+    manager.update_site_timestamp()
+    return jsonify({"success": True, **result})
 
-    # Add to target gallery
-    if 'gallery' not in target_item:
-        target_item['gallery'] = []
-    target_item['gallery'].append(extracted_url)
+@app.route('/api/content/delete', methods=['POST'])
+def delete_content():
+    return run_operation(delete_item)
 
-    # Save the updated list
-    with open(json_path, 'w', encoding='utf-8') as f:
-        json.dump(data_list, f, indent=4, ensure_ascii=False)
+@app.route('/api/content/update', methods=['POST'])
+def update_content():
+    return run_operation(update_item)
+
+@app.route('/api/content/move-to-pile', methods=['POST'])
+def move_to_pile():
+    """Move a source item's image into a target item's gallery array,
+    then delete the source item."""
+    return run_operation(move_item_to_pile)
+
+@app.route('/api/content/extract-from-pile', methods=['POST'])
+def extract_from_pile():
+    """Extract a single image from a pile's gallery and create a new standalone item."""
+    return run_operation(extract_item_from_pile)
+
+@app.route('/api/content/add-to-pile', methods=['POST'])
+def add_to_pile():
+    """Move a single image from one pile's gallery to another pile's gallery."""
+    return run_operation(add_item_to_pile)
+
+@app.route('/api/content/batch', methods=['POST'])
+def batch_content():
+    """Apply {"operations": [{"op": "update" | "delete" | "move-to-pile" |
+    "extract-from-pile" | "add-to-pile", ...fields of that endpoint}]} in
+    order, all or nothing: they run on the cached category data, and the
+    touched categories are written together (store.save_many()) once every
+    operation succeeded."""
+    data = request.json or {}
+    operations = data.get('operations')
+    if not isinstance(operations, list) or not operations:
+        return jsonify({"error": "operations must be a non-empty list"}), 400
+
+    results = []
+    try:
+        with manager.store.transaction():
+            changes = PendingChanges()
+            for index, op in enumerate(operations):
+                op = op if isinstance(op, dict) else {}
+                operation = CONTENT_OPERATIONS.get(op.get('op'))
+                if operation is None:
+                    raise OperationError(f"Unknown operation '{op.get('op')}'")
+                results.append({"op": op['op'], "success": True, **operation(op, changes)})
+            changes.commit()
+    except (OperationError, DuplicateIdError) as e:
+        # Nothing was written: the transaction dropped the unsaved edits
+        results.append({"op": op.get('op'), "success": False, "error": str(e)})
+        status = e.status if isinstance(e, OperationError) else 409
+        return jsonify({"success": False, "failedAt": index, "error": str(e), "results": results}), status
 
     manager.update_site_timestamp()
-    return jsonify({
-        "success": True,
-        "targetGalleryCount": len(target_item.get('gallery', []))
-    })
+    return jsonify({"success": True, "results": results})
 
 @app.route('/api/config', methods=['GET'])
 def get_config():
     """Get application configuration"""
-    return jsonify({
-        "app": config.app_config,
-        "languages": config.languages_config,
-        "categories": config.categories_config,
-        "mediaTypes": config.media_types_config
+    # One snapshot, so a reload can't mix old and new files in the response.
+    # Its signature is the version: a fresh stat() could be ahead of a
+    # snapshot still waiting for its next watch check.
+    snapshot = config.snapshot()
+    return cached_json('config', snapshot.signature, lambda: {
+        "app": snapshot.app,
+        "languages": snapshot.languages,
+        "categories": snapshot.categories,
+        "mediaTypes": snapshot.media_types
     })
 
 @app.route('/api/config/save-media-types', methods=['POST'])
@@ -594,4 +941,9 @@ if __name__ == '__main__':
     host = config.get_host()
     port = config.get_port()
     print(f"Admin API running on http://{host}:{port}")
+    # The debug reloader runs this file twice: a watcher that only restarts
+    # the server, and the serving child (WERKZEUG_RUN_MAIN set). Resume the
+    # uploads still pending from the last run in the child only.
+    if os.environ.get('WERKZEUG_RUN_MAIN') == 'true':
+        jobs.start()
     app.run(host=host, port=port, debug=True)
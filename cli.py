@@ -1,10 +1,13 @@
-import http.server
-import socketserver
 import os
 import argparse
 import sys
 
-class RetroHandler(http.server.SimpleHTTPRequestHandler):
+# Build helpers live in scripts/ alongside the admin tools
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'scripts'))
+
+from static_server import CachingHandler, make_server
+
+class RetroHandler(CachingHandler):
     """Custom handler to serve engine files while mapping data requests"""
     
     engine_dir = "."
@@ -25,11 +28,25 @@ class RetroHandler(http.server.SimpleHTTPRequestHandler):
             # Route to engine directory
             return os.path.join(self.engine_dir, *parts)
 
+def check_bundles(data_dir):
+    """Warn when data bundles were built from other data files"""
+    from config_loader import ConfigLoader
+    import bundle
+
+    config = ConfigLoader(data_dir)
+    if not config.load_all():
+        return
+    changed = bundle.stale(config)
+    if changed:
+        print(f"⚠️  Data bundles are out of date ({', '.join(changed)}): run `python3 cli.py build`")
+
 def run(engine_dir, data_dir, port=8000):
     RetroHandler.engine_dir = os.path.abspath(engine_dir)
     RetroHandler.data_dir = os.path.abspath(data_dir)
+    check_bundles(data_dir)
     
-    with socketserver.TCPServer(("", port), RetroHandler) as httpd:
+    # One thread per connection: a slow client doesn't block the others
+    with make_server(RetroHandler, port) as httpd:
         print(f"🚀 Retro Portfolio Engine running!")
         print(f"📁 Engine: {RetroHandler.engine_dir}")
         print(f"📁 Data:   {RetroHandler.data_dir}")
@@ -40,12 +57,32 @@ def run(engine_dir, data_dir, port=8000):
             print("\n👋 Stopping engine...")
             sys.exit(0)
 
+def build(data_dir, page_size=None):
+    """Write sharded, precompressed data bundles into <data>/data/bundles"""
+    from config_loader import ConfigLoader
+    import bundle
+
+    config = ConfigLoader(data_dir)
+    if not config.load_all():
+        sys.exit(1)
+    manifest = bundle.build(config, page_size=page_size)
+    print(f"📦 {manifest['total']} items in {len(manifest['shards'])} shards "
+          f"({manifest['pageSize']} per page)")
+    for category, count in manifest['counts'].items():
+        print(f"   {category}: {count}")
+
 if __name__ == "__main__":
     parser = argparse.ArgumentParser(description="Retro Portfolio Engine CLI")
+    parser.add_argument("command", nargs="?", default="serve", choices=["serve", "build"],
+                        help="serve the site (default) or build static data bundles")
     parser.add_argument("--data", default=".", help="Path to your content directory (config/, data/, lang/)")
     parser.add_argument("--port", type=int, default=8000, help="Port to run on")
+    parser.add_argument("--page-size", type=int, help="Items per bundle shard (default: pagination.pageSize)")
     
     args = parser.parse_args()
     
-    # Engine is always where this script is or the current CWD
-    run(".", args.data, args.port)
+    if args.command == "build":
+        build(args.data, args.page_size)
+    else:
+        # Engine is always where this script is or the current CWD
+        run(".", args.data, args.port)
@@ -53,8 +53,8 @@ const renderer = {
         await this.loadCategoryConfig();
 
         // Skip re-fetch if data is already loaded (returning from detail view)
-        if (this.allItems.length === 0) {
-            const dataDir = window.AppConfig?.getSetting('paths.dataDir') || 'data';
+        const dataDir = window.AppConfig?.getSetting('paths.dataDir') || 'data';
+        if (this.allItems.length === 0 && !(await this.loadBundles(dataDir))) {
             const entries = Object.entries(this.categories);
             const fetches = entries.map(async ([category, info]) => {
                 try {
@@ -79,6 +79,66 @@ const renderer = {
         if (window.i18n) window.i18n.updateDOM();
     },
 
+    // Prebuilt bundles (`cli.py build`): first paint needs only the manifest
+    // and the first shard, the other shards load in the background. The
+    // admin removes the manifest when it saves (until it has rebuilt the
+    // bundles), so one that exists matches the data files.
+    async loadBundles(dataDir) {
+        let manifest;
+        try {
+            const res = await fetch(`${dataDir}/bundles/manifest.json`, { cache: 'no-cache' });
+            if (!res.ok) return false;
+            manifest = await res.json();
+        } catch (e) {
+            return false;
+        }
+        if (!manifest.shards || manifest.shards.length === 0) return false;
+
+        const fetchShard = async shard => {
+            try {
+                const res = await fetch(`${dataDir}/${shard.url}`);
+                const items = await res.json();
+                return items.map(item => ({ ...item, _from: item._category }));
+            } catch (e) {
+                return [];
+            }
+        };
+
+        // Shards are already sorted newest first
+        this.allItems = await fetchShard(manifest.shards[0]);
+        if (this.sortOrder !== 'desc') this.sortItems();
+
+        Promise.all(manifest.shards.slice(1).map(fetchShard)).then(rest => {
+            this.allItems = this.allItems.concat(rest.flat());
+            this.sortItems();
+            this.refreshItems();
+        });
+        return true;
+    },
+
+    filterItems() {
+        return this.activeFilter === 'all'
+            ? [...this.allItems]
+            : this.allItems.filter(i => i._category === this.activeFilter);
+    },
+
+    // More items arrived: keep the cards already shown if they are still
+    // the start of the list, only the "Show More" button changes
+    refreshItems() {
+        const container = document.getElementById('gallery-container');
+        if (!container) return;
+
+        const filtered = this.filterItems();
+        const shown = this.filteredItems.slice(0, this.visibleCount);
+        if (shown.length === 0 || !shown.every((item, i) => filtered[i] === item)) {
+            this.renderGrid();
+            if (window.i18n) window.i18n.updateDOM();
+            return;
+        }
+        this.filteredItems = filtered;
+        this.updateLoadMoreButton(container);
+    },
+
     sortItems() {
         const dir = this.sortOrder === 'desc' ? -1 : 1;
         this.allItems.sort((a, b) => {
@@ -97,9 +157,7 @@ const renderer = {
         if (oldGrid) oldGrid.remove();
 
         // Build filtered list
-        this.filteredItems = this.activeFilter === 'all'
-            ? [...this.allItems]
-            : this.allItems.filter(i => i._category === this.activeFilter);
+        this.filteredItems = this.filterItems();
 
         this.visibleCount = 0;
 
@@ -128,16 +186,20 @@ const renderer = {
         const frag = document.createDocumentFragment();
         batch.forEach(item => frag.appendChild(this.createGalleryItem(item)));
 
-        // Remove old load-more button before appending
+        container.appendChild(frag);
+        this.visibleCount += batch.length;
+
+        this.updateLoadMoreButton(container);
+    },
+
+    updateLoadMoreButton(container) {
+        // Remove old load-more button, the new one goes after the last card
         const oldBtn = document.getElementById('load-more-btn');
         if (oldBtn) {
             if (this._loadMoreObserver) this._loadMoreObserver.unobserve(oldBtn);
             oldBtn.remove();
         }
 
-        container.appendChild(frag);
-        this.visibleCount += batch.length;
-
         // Add "Load More" if more items remain
         if (this.visibleCount < this.filteredItems.length) {
             const remaining = this.filteredItems.length - this.visibleCount;
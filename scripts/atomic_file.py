@@ -0,0 +1,51 @@
+"""
+Atomic file replacement shared by the stores.
+The new content goes to a temp file next to the target, which is then
+renamed over it: readers (the static site, another admin process) see
+either the old file or the new one, never half of it.
+"""
+
+import os
+import tempfile
+
+
+def file_mode(path, default=0o644):
+    """Permission bits of path, or default when it doesn't exist"""
+    try:
+        return os.stat(path).st_mode & 0o777
+    except OSError:
+        return default
+
+
+def write_temp(path, text, encoding='utf-8'):
+    """Write text to a new temp file next to path, with path's mode (0644
+    when new: mkstemp creates 0600 files, which the web server couldn't
+    read). Returns the temp path, to os.replace() over path."""
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, temp_path = tempfile.mkstemp(dir=directory, suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'w', encoding=encoding) as f:
+            f.write(text)
+        os.chmod(temp_path, file_mode(path))
+    except BaseException:
+        discard(temp_path)
+        raise
+    return temp_path
+
+
+def discard(temp_path):
+    """Remove a temp file that won't be renamed"""
+    try:
+        os.remove(temp_path)
+    except FileNotFoundError:
+        pass
+
+
+def atomic_write(path, text, encoding='utf-8'):
+    """Replace path with text (temp file + rename), keeping its mode"""
+    temp_path = write_temp(path, text, encoding)
+    try:
+        os.replace(temp_path, path)
+    except BaseException:
+        discard(temp_path)
+        raise
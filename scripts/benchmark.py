@@ -0,0 +1,377 @@
+"""
+Benchmarks of the admin API and manager hot paths on synthetic content.
+For each size, a dataset with that many items per category (plus lang
+files and config) is generated under a temporary PORTFOLIO_CONTENT_ROOT
+and the benchmarks run in a fresh interpreter pointed at it, through the
+Flask test client. Results go to stdout and, with --output, to a JSON
+file; --baseline compares against an earlier one and fails on regressions.
+
+    python3 scripts/benchmark.py
+    python3 scripts/benchmark.py --sizes 1000 10000 100000 --output bench.json
+    python3 scripts/benchmark.py --baseline bench.json --tolerance 0.25
+"""
+
+import argparse
+import io
+import json
+import os
+import platform
+import random
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Items per category
+SIZES = (1000, 10000)
+# Timed runs of each benchmark (the median is compared)
+REPEAT = 5
+# Slower than the baseline by more than this fraction is a regression...
+TOLERANCE = 0.25
+# ...unless it is less than this many milliseconds slower (timer noise)
+NOISE_MS = 1.0
+
+# Languages of the generated content and lang files
+LANGUAGES = ('en', 'fr', 'mx', 'ht')
+# Every PILE_EVERY-th item is a pile (has a gallery of PILE_SIZE images)
+PILE_EVERY = 10
+PILE_SIZE = 5
+# Category the benchmarks read and write
+CATEGORY = 'painting'
+
+WORDS = ('sunset', 'harbor', 'portrait', 'forest', 'study', 'blue', 'night', 'garden', 'city', 'storm',
+         'river', 'market', 'mountain', 'window', 'dancer', 'winter', 'été', 'fenêtre', 'lumière', 'rêve')
+MEDIUMS = ('Oil on canvas', 'Acrylic', 'Watercolor', 'Charcoal', 'Ink', 'Digital')
+
+
+def _text(rng, words):
+    return ' '.join(rng.choice(WORDS) for _ in range(words)).capitalize()
+
+
+def _multilingual(text):
+    return {lang: text for lang in LANGUAGES}
+
+
+def make_item(rng, category, index):
+    """One content item shaped like the admin creates them"""
+    day = f"20{10 + index % 15:02d}-{1 + index % 12:02d}-{1 + index % 28:02d}"
+    item = {
+        "id": f"{category}_{index}",
+        "title": _multilingual(_text(rng, 3)),
+        "url": f"https://res.cloudinary.com/demo/image/upload/v1/portfolio/{category}/{index}.jpg",
+        "date": day,
+        "created": day,
+        "medium": _multilingual(rng.choice(MEDIUMS)),
+        "description": _multilingual(_text(rng, 12)),
+    }
+    if index % PILE_EVERY == 0:
+        item["gallery"] = [f"{item['url'][:-4]}_{n}.jpg" for n in range(PILE_SIZE)]
+    return item
+
+
+def generate_dataset(root, items, keys=None, seed=0):
+    """Write config/, data/ (items per category), lang/ and index.html
+    under root. keys defaults to items // 10 translation keys (at least
+    100); languages other than en lack every fifth key."""
+    rng = random.Random(seed)
+    keys = keys if keys is not None else max(100, items // 10)
+
+    shutil.copytree(os.path.join(ROOT, 'config'), os.path.join(root, 'config'), dirs_exist_ok=True)
+    with open(os.path.join(root, 'config', 'languages.json'), 'w', encoding='utf-8') as f:
+        json.dump({
+            "defaultLanguage": "en",
+            "supportedLanguages": [{"code": lang, "name": lang} for lang in LANGUAGES]
+        }, f, indent=4)
+    with open(os.path.join(root, 'config', 'categories.json'), encoding='utf-8') as f:
+        categories = [ct['id'] for ct in json.load(f).get('contentTypes', [])]
+
+    os.makedirs(os.path.join(root, 'data'), exist_ok=True)
+    for category in categories:
+        with open(os.path.join(root, 'data', f'{category}.json'), 'w', encoding='utf-8') as f:
+            json.dump([make_item(rng, category, i) for i in range(items)], f, indent=4, ensure_ascii=False)
+
+    os.makedirs(os.path.join(root, 'lang'), exist_ok=True)
+    for lang in LANGUAGES:
+        translations = {f"key_{k}": f"{_text(rng, 4)} ({lang})" for k in range(keys)
+                        if lang == 'en' or k % 5}
+        with open(os.path.join(root, 'lang', f'{lang}.json'), 'w', encoding='utf-8') as f:
+            json.dump(translations, f, indent=4, ensure_ascii=False)
+
+    with open(os.path.join(root, 'index.html'), 'w', encoding='utf-8') as f:
+        f.write('<footer><span>Last Updated:</span> 1 Jan 2020</footer>\n')
+    return {"items": items, "categories": categories, "keys": keys}
+
+
+class _StubUploader:
+    """Stands in for cloudinary.uploader: reads the file, returns a URL"""
+
+    def __init__(self):
+        self.count = 0
+
+    def upload(self, file, **options):
+        if hasattr(file, 'read'):
+            file.read()
+        self.count += 1
+        return {"secure_url": f"https://res.cloudinary.com/demo/bench/{self.count}.jpg"}
+
+    upload_large = upload
+
+
+class Context:
+    """State shared by the benchmarks of one run: the test client and
+    pools of item ids, so every mutating run hits a different item"""
+
+    def __init__(self, client, items):
+        self.client = client
+        self.items = items
+        ids = range(items // 2, items)  # leave the front for the readers
+        self.piles = [f"{CATEGORY}_{i}" for i in ids if i % PILE_EVERY == 0]
+        self.plain = [f"{CATEGORY}_{i}" for i in ids if i % PILE_EVERY]
+        self.runs = 0
+
+    def take(self, pool):
+        ids = getattr(self, pool)
+        if not ids:
+            raise RuntimeError(f"Dataset too small: no {pool} items left")
+        return ids.pop()
+
+    def post(self, url, body):
+        response = self.client.post(url, json=body)
+        if response.status_code != 200:
+            raise RuntimeError(f"POST {url} -> {response.status_code}: {response.get_data(as_text=True)}")
+        return response
+
+    def get(self, url):
+        response = self.client.get(url)
+        if response.status_code != 200:
+            raise RuntimeError(f"GET {url} -> {response.status_code}: {response.get_data(as_text=True)}")
+        return response
+
+
+def _cold():
+    import admin_api
+    import manager
+    manager.store.invalidate()
+    manager.search.invalidate()
+    admin_api.response_cache.clear()
+    admin_api.translations.invalidate()
+
+
+def bench_get_all_content(ctx):
+    ctx.get('/api/content')
+
+
+def bench_get_content_page(ctx):
+    ctx.get(f'/api/content?category={CATEGORY}&limit=24&sort=-date')
+
+
+def bench_get_single_item(ctx):
+    ctx.get(f'/api/content/item?category={CATEGORY}&id={CATEGORY}_{ctx.items // 3}')
+
+
+def bench_search(ctx):
+    ctx.get('/api/search?q=sunset+har')
+
+
+def bench_update_content(ctx):
+    ctx.post('/api/content/update', {"category": CATEGORY, "id": ctx.take('plain'),
+                                     "updates": {"medium": _multilingual("Gouache")}})
+
+
+def bench_delete_content(ctx):
+    ctx.post('/api/content/delete', {"category": CATEGORY, "id": ctx.take('plain')})
+
+
+def bench_move_to_pile(ctx):
+    ctx.post('/api/content/move-to-pile', {"category": CATEGORY, "sourceId": ctx.take('plain'),
+                                           "targetId": ctx.piles[0]})
+
+
+def bench_extract_from_pile(ctx):
+    ctx.post('/api/content/extract-from-pile', {"category": CATEGORY, "sourceId": ctx.take('piles'),
+                                                "imageUrl": "", "imageIndex": 0})
+
+
+def bench_add_to_pile(ctx):
+    ctx.post('/api/content/add-to-pile', {"category": CATEGORY, "sourceId": ctx.take('piles'),
+                                          "targetId": ctx.piles[0], "imageUrl": "", "imageIndex": 0})
+
+
+def bench_upload_and_save(ctx):
+    import manager
+    ctx.runs += 1
+    file = io.BytesIO(b'\x89PNG bench %d' % ctx.runs + os.urandom(4096))
+    manager.upload_and_save(file, f"Bench upload {ctx.runs}", CATEGORY, medium="Digital", filename='bench.png')
+
+
+def bench_get_translations(ctx):
+    ctx.get('/api/translations')
+
+
+def bench_update_translation(ctx):
+    ctx.runs += 1
+    ctx.post('/api/translations/update', {"lang": "fr", "key": "key_1", "value": f"Valeur {ctx.runs}"})
+
+
+def bench_update_translations_batch(ctx):
+    ctx.runs += 1
+    ctx.post('/api/translations/batch', {"updates": [
+        {"lang": lang, "key": f"key_{k}", "value": f"{lang} {ctx.runs}"}
+        for lang in LANGUAGES for k in range(25)
+    ]})
+
+
+def bench_translations_missing(ctx):
+    ctx.get('/api/translations/missing')
+
+
+# name -> (benchmark, whether the caches are emptied before each run)
+BENCHMARKS = {
+    "get_all_content": (bench_get_all_content, True),
+    "get_all_content_cached": (bench_get_all_content, False),
+    "get_content_page": (bench_get_content_page, False),
+    "get_single_item": (bench_get_single_item, False),
+    "search": (bench_search, False),
+    "update_content": (bench_update_content, False),
+    "delete_content": (bench_delete_content, False),
+    "move_to_pile": (bench_move_to_pile, False),
+    "extract_from_pile": (bench_extract_from_pile, False),
+    "add_to_pile": (bench_add_to_pile, False),
+    "upload_and_save": (bench_upload_and_save, False),
+    "get_translations": (bench_get_translations, True),
+    "update_translation": (bench_update_translation, False),
+    "update_translations_batch": (bench_update_translations_batch, False),
+    "translations_missing": (bench_translations_missing, False),
+}
+
+
+def run_benchmarks(items, repeat, names=None):
+    """Time the benchmarks in this process (PORTFOLIO_CONTENT_ROOT must
+    point at a generated dataset before admin_api is imported).
+    Returns {name: {"median_ms", "min_ms", "max_ms"}}."""
+    import admin_api
+    import manager
+
+    uploader = _StubUploader()
+    manager.cloudinary_uploader = lambda: uploader
+    manager.GITHUB_TOKEN = None
+    admin_api.app.config['TESTING'] = True
+
+    results = {}
+    with admin_api.app.test_client() as client:
+        # One context: items deleted by a benchmark are never reused by the next
+        ctx = Context(client, items)
+        for name in names or BENCHMARKS:
+            benchmark, cold = BENCHMARKS[name]
+            # One untimed run warms the caches the benchmark relies on
+            benchmark(ctx)
+            timings = []
+            for _ in range(repeat):
+                if cold:
+                    _cold()
+                start = time.perf_counter()
+                benchmark(ctx)
+                timings.append((time.perf_counter() - start) * 1000)
+            results[name] = {
+                "median_ms": round(statistics.median(timings), 3),
+                "min_ms": round(min(timings), 3),
+                "max_ms": round(max(timings), 3),
+            }
+    return results
+
+
+def measure(items, repeat=REPEAT, names=None):
+    """Generate a dataset of items per category and benchmark it in a
+    fresh interpreter. Returns run_benchmarks()' results."""
+    with tempfile.TemporaryDirectory(prefix='portfolio-bench-') as root:
+        generate_dataset(root, items)
+        result_path = os.path.join(root, 'results.json')
+        env = dict(
+            os.environ,
+            PORTFOLIO_CONTENT_ROOT=root,
+            PYTHONPATH=os.pathsep.join([ROOT, os.path.join(ROOT, 'scripts')]),
+            GITHUB_TOKEN='',
+        )
+        command = [sys.executable, os.path.abspath(__file__), '--worker', result_path,
+                   '--sizes', str(items), '--repeat', str(repeat)]
+        for name in names or []:
+            command += ['--only', name]
+        # cwd=root: the site timestamp is written to the generated index.html
+        result = subprocess.run(command, capture_output=True, text=True, cwd=root, env=env)
+        if result.returncode != 0:
+            raise RuntimeError(f"Benchmark of {items} items failed:\n{result.stderr[-2000:]}")
+        with open(result_path, encoding='utf-8') as f:
+            return json.load(f)
+
+
+def compare(results, baseline, tolerance=TOLERANCE, noise_ms=NOISE_MS):
+    """Benchmarks slower than in baseline: [(size, name, baseline_ms, ms)]
+    comparing medians. Sizes or benchmarks missing on either side are skipped."""
+    regressions = []
+    for size, benchmarks in results.get('sizes', {}).items():
+        previous = baseline.get('sizes', {}).get(size, {})
+        for name, timing in benchmarks.items():
+            if name not in previous:
+                continue
+            before, now = previous[name]['median_ms'], timing['median_ms']
+            if now > before * (1 + tolerance) and now - before > noise_ms:
+                regressions.append((size, name, before, now))
+    return regressions
+
+
+def report(size, benchmarks):
+    print(f"📊 {int(size):,} items per category")
+    for name, timing in benchmarks.items():
+        print(f"   {timing['median_ms']:10.2f} ms  {name}  (min {timing['min_ms']:.2f}, max {timing['max_ms']:.2f})")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the admin API and manager on synthetic data")
+    parser.add_argument("--sizes", type=int, nargs="+", default=list(SIZES),
+                        help=f"Items per category to benchmark (default: {' '.join(map(str, SIZES))})")
+    parser.add_argument("--repeat", type=int, default=REPEAT, help=f"Timed runs per benchmark (default: {REPEAT})")
+    parser.add_argument("--only", action="append", default=[], metavar="NAME", help="Run only these benchmarks")
+    parser.add_argument("--output", help="Write the results as JSON to this file")
+    parser.add_argument("--baseline", help="Earlier --output file: fail when a benchmark got slower")
+    parser.add_argument("--tolerance", type=float, default=TOLERANCE,
+                        help=f"Allowed slowdown against the baseline (default: {TOLERANCE})")
+    parser.add_argument("--worker", metavar="RESULT", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    unknown = [n for n in args.only if n not in BENCHMARKS]
+    if unknown:
+        parser.error(f"Unknown benchmark(s): {', '.join(unknown)} (choose from {', '.join(BENCHMARKS)})")
+
+    if args.worker:
+        # Inside measure(): benchmark the dataset PORTFOLIO_CONTENT_ROOT points at
+        results = run_benchmarks(args.sizes[0], max(1, args.repeat), args.only)
+        with open(args.worker, 'w', encoding='utf-8') as f:
+            json.dump(results, f)
+        sys.exit(0)
+
+    results = {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "repeat": args.repeat,
+        "sizes": {},
+    }
+    for size in args.sizes:
+        results["sizes"][str(size)] = measure(size, max(1, args.repeat), args.only)
+        report(size, results["sizes"][str(size)])
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2)
+
+    if args.baseline:
+        with open(args.baseline, encoding='utf-8') as f:
+            regressions = compare(results, json.load(f), args.tolerance)
+        for size, name, before, now in regressions:
+            print(f"❌ {name} at {int(size):,} items: {before:.2f} ms -> {now:.2f} ms")
+        if regressions:
+            sys.exit(1)
+        print("✅ No regressions against the baseline")
@@ -0,0 +1,165 @@
+"""
+Static data bundles for the public site.
+`cli.py build` merges every category into the feed the home grid shows
+(newest first, in the order renderer.sortItems() produces), cuts it into
+page-sized shards of minified JSON and describes them in
+data/bundles/manifest.json. Every file gets a precompressed .gz sibling
+(and .br when the brotli module is installed).
+
+The site's first paint then needs the manifest plus the first shard; the
+remaining shards are fetched in the background. Shard names carry a hash
+of their content so they can be cached forever; only the manifest needs
+revalidating.
+
+The manifest records the SHA-256 of every data file it was built from.
+Writers keep the bundles in step with the data: the admin drops the
+manifest as soon as it saves a category (the site then reads the data
+files directly) and builds the bundles again once the edits settle;
+stale() tells whether files changed behind a build's back (hand edits,
+a git pull), which `cli.py` reports on start.
+"""
+
+import gzip
+import hashlib
+import json
+import os
+from datetime import datetime
+from pathlib import Path
+
+from content_store import ContentStore
+
+try:
+    import brotli
+except ImportError:  # optional: .gz only
+    brotli = None
+
+BUNDLE_DIR = 'bundles'
+MANIFEST = 'manifest.json'
+
+
+def sort_key(item):
+    """Same key as the site's renderer: created date, else upload date"""
+    return str(item.get('created') or item.get('date') or '')
+
+
+def file_hash(path):
+    """SHA-256 of a data file, or None when it doesn't exist"""
+    try:
+        with open(path, 'rb') as f:
+            return hashlib.sha256(f.read()).hexdigest()
+    except OSError:
+        return None
+
+
+def minify(payload):
+    return json.dumps(payload, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+
+def write_precompressed(path, data):
+    """Write a file plus its .gz (and .br) siblings; returns the paths written"""
+    variants = {path: data, f"{path}.gz": gzip.compress(data, compresslevel=9, mtime=0)}
+    if brotli:
+        variants[f"{path}.br"] = brotli.compress(data)
+    for variant, body in variants.items():
+        with open(variant, 'wb') as f:
+            f.write(body)
+    return list(variants)
+
+
+def build(config, page_size=None, store=None, out_dir=None):
+    """Build data/bundles (or out_dir) for every category of
+    config.get_category_map(). Returns the manifest.
+
+    Items are read through a ContentStore, so pending journal records are
+    included in journal mode. With the sqlite backend run
+    `manager.py --export` first so the data files are current."""
+    category_map = config.get_category_map()
+    if store is None:
+        journal = config.get_storage_config().get('mode') == 'journal'
+        store = ContentStore(category_map.get, journal=journal)
+    page_size = page_size or config.get_setting('pagination.pageSize') or 24
+
+    feed = []
+    counts = {}
+    sources = {}
+    for category, path in category_map.items():
+        items = store.load(category)
+        counts[category] = len(items)
+        sources[category] = {"file": os.path.basename(path), "sha256": file_hash(path)}
+        feed.extend({**item, "_category": category} for item in items)
+    # Stable, so ties keep category order like the browser's sort does
+    feed.sort(key=sort_key, reverse=True)
+
+    out_dir = Path(out_dir or Path(config.data_dir) / BUNDLE_DIR)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    written = set()
+    shards = []
+    for number, start in enumerate(range(0, len(feed), page_size)):
+        items = feed[start:start + page_size]
+        data = minify(items)
+        name = f"feed-{number:03d}-{hashlib.sha256(data).hexdigest()[:10]}.json"
+        written.update(write_precompressed(str(out_dir / name), data))
+        shards.append({
+            "url": f"{BUNDLE_DIR}/{name}",
+            "count": len(items),
+            "bytes": len(data),
+            "newest": sort_key(items[0]),
+            "oldest": sort_key(items[-1]),
+        })
+
+    manifest = {
+        "version": hashlib.sha256(''.join(s["url"] for s in shards).encode()).hexdigest()[:12],
+        "generated": datetime.now().isoformat(timespec='seconds'),
+        "pageSize": page_size,
+        "sort": "desc",
+        "total": len(feed),
+        "counts": counts,
+        "sources": sources,
+        "shards": shards,
+    }
+    written.update(write_precompressed(str(out_dir / MANIFEST), minify(manifest)))
+
+    # Drop shards left over from previous builds
+    for name in os.listdir(out_dir):
+        path = str(out_dir / name)
+        if path not in written and name.startswith(('feed-', MANIFEST)):
+            os.remove(path)
+    return manifest
+
+
+def read_manifest(out_dir):
+    """The manifest in out_dir, or None when there is none (or it's unreadable)"""
+    try:
+        with open(Path(out_dir) / MANIFEST, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def stale(config):
+    """Categories whose data file differs from the one the current bundles
+    were built from (added and removed categories included). None when
+    there are no bundles."""
+    manifest = read_manifest(Path(config.data_dir) / BUNDLE_DIR)
+    if manifest is None:
+        return None
+    sources = manifest.get("sources", {})
+    category_map = config.get_category_map()
+    changed = [category for category, path in category_map.items()
+               if sources.get(category, {}).get("sha256", False) != file_hash(path)]
+    return changed + [category for category in sources if category not in category_map]
+
+
+def invalidate(out_dir):
+    """Remove the manifest (and its compressed siblings), so the site stops
+    using bundles built from older data. Shards stay until the next build
+    (pages still holding the old manifest can finish loading).
+    Returns whether there was a manifest."""
+    removed = False
+    for suffix in ('', '.gz', '.br'):
+        try:
+            os.remove(Path(out_dir) / f"{MANIFEST}{suffix}")
+            removed = removed or not suffix
+        except FileNotFoundError:
+            pass
+    return removed
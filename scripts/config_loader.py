@@ -1,32 +1,104 @@
 """
 Configuration Loader for Backend
 Loads all configuration files and makes them available to Python scripts
+
+Each load builds a ConfigSnapshot: the parsed files plus lookup indexes
+(content and media types by id, gallery categories, category -> data
+file). A reload swaps in a new snapshot in one assignment, so readers see
+either the old or the new config, never a mix. The config files are
+watched by mtime (checked at most every WATCH_INTERVAL seconds) and
+subscribers are told about every new snapshot.
 """
 
 import json
 import os
+import threading
+import time
 from pathlib import Path
 
+# Files under config/ that make up a snapshot
+CONFIG_FILES = ('app.json', 'languages.json', 'categories.json', 'media-types.json')
+
+# Seconds between two mtime checks of the config files
+WATCH_INTERVAL = 1.0
+
+
+class ConfigSnapshot:
+    """One consistent version of the config files with lookup indexes.
+    Never mutated once built: treat every attribute as read-only."""
+
+    def __init__(self, data_dir, app=None, languages=None, categories=None, media_types=None, signature=None):
+        self.app = app or {}
+        self.languages = languages or {}
+        self.categories = categories or {}
+        self.media_types = media_types or {}
+        # (mtime_ns, size) of each config file this was loaded from
+        self.signature = signature
+
+        self.content_types = tuple(self.categories.get('contentTypes', self.categories.get('categories', [])))
+        self.media_type_list = tuple(self.media_types.get('mediaTypes', []))
+
+        # First definition wins, as the old linear scans did
+        self.content_types_by_id = {}
+        for ct in self.content_types:
+            self.content_types_by_id.setdefault(ct['id'], ct)
+        self.media_types_by_id = {}
+        for mt in self.media_type_list:
+            self.media_types_by_id.setdefault(mt['id'], mt)
+
+        self.content_types_by_media = {}
+        for ct in self.content_types:
+            self.content_types_by_media.setdefault(ct.get('mediaType'), []).append(ct)
+
+        self.gallery_categories = [
+            ct['id'] for ct in self.content_types
+            if self.media_types_by_id.get(ct.get('mediaType'), {}).get('supportsGallery', False)
+        ]
+        self.category_map = {ct['id']: self._data_file(data_dir, ct) for ct in self.content_types}
+        self.language_codes = [lang['code'] for lang in self.languages.get('supportedLanguages', [])]
+
+    @staticmethod
+    def _data_file(data_dir, content_type):
+        if content_type and 'dataFile' in content_type:
+            # If dataFile is specified, ensure it's relative to data_dir
+            # We strip 'data/' prefix if it was hardcoded in the config
+            return str(data_dir / content_type['dataFile'].replace('data/', ''))
+        return str(data_dir / f"{content_type['id']}.json")
+
 
 class ConfigLoader:
     """Centralized configuration loader"""
 
-    def __init__(self, content_root=None):
+    def __init__(self, content_root=None, watch_interval=WATCH_INTERVAL):
         if content_root is None:
             content_root = os.environ.get('PORTFOLIO_CONTENT_ROOT', '.')
-        
+
         self.content_root = Path(content_root).resolve()
         self.config_dir = self.content_root / 'config'
         self.data_dir = self.content_root / 'data'
         self.lang_dir = self.content_root / 'lang'
-        
-        self.app_config = None
-        self.languages_config = None
-        self.categories_config = None
-        self.media_types_config = None
+
+        self.watch_interval = watch_interval
+        self._snapshot = ConfigSnapshot(self.data_dir)
+        self._checked = 0.0
+        self._lock = threading.Lock()
+        self._subscribers = []
+
+    def _file_signature(self):
+        signature = []
+        for name in CONFIG_FILES:
+            try:
+                st = os.stat(self.config_dir / name)
+                signature.append((st.st_mtime_ns, st.st_size))
+            except OSError:
+                signature.append(None)
+        return tuple(signature)
 
     def load_all(self):
-        """Load all configuration files"""
+        """Load all configuration files.
+        Idempotent: files unchanged since the last load aren't parsed again."""
+        if self._snapshot.signature is not None and self._snapshot.signature == self._file_signature():
+            return True
         try:
             # Ensure directories exist
             for d in [self.config_dir, self.data_dir, self.lang_dir]:
@@ -36,35 +108,70 @@ class ConfigLoader:
                     except OSError:
                         pass # Might be read-only or we just can't create it
 
-            with open(self.config_dir / 'app.json', 'r', encoding='utf-8') as f:
-                self.app_config = json.load(f)
-
-            with open(self.config_dir / 'languages.json', 'r', encoding='utf-8') as f:
-                self.languages_config = json.load(f)
-
-            with open(self.config_dir / 'categories.json', 'r', encoding='utf-8') as f:
-                self.categories_config = json.load(f)
-
-            with open(self.config_dir / 'media-types.json', 'r', encoding='utf-8') as f:
-                self.media_types_config = json.load(f)
+            signature = self._file_signature()
+            parsed = []
+            for name in CONFIG_FILES:
+                with open(self.config_dir / name, 'r', encoding='utf-8') as f:
+                    parsed.append(json.load(f))
+            snapshot = ConfigSnapshot(self.data_dir, *parsed, signature=signature)
 
             print(f'✅ Configuration loaded from {self.content_root}')
-            return True
         except Exception as e:
             print(f'❌ Failed to load configuration from {self.content_root}: {e}')
             return False
 
-    # ... (getters) ...
+        with self._lock:
+            self._snapshot = snapshot
+            self._checked = time.monotonic()
+            subscribers = list(self._subscribers)
+        for callback in subscribers:
+            callback(snapshot)
+        return True
+
+    def reload_if_changed(self):
+        """Reload when a config file changed since the last load.
+        Returns whether a new snapshot was loaded."""
+        with self._lock:
+            loaded = self._snapshot.signature
+            self._checked = time.monotonic()
+        if loaded is None or self._file_signature() == loaded:
+            return False
+        return self.load_all()
 
-    def get_category_data_file(self, category_id):
-        """Get absolute data file path for a category"""
-        cat = self.get_content_type(category_id)
-        filename = f'{category_id}.json'
-        if cat and 'dataFile' in cat:
-            # If dataFile is specified, use it (removing data/ prefix if present to avoid doubling)
-            filename = cat['dataFile'].replace('data/', '')
-        
-        return str(self.data_dir / filename)
+    def reload_if_due(self):
+        """reload_if_changed(), at most once every watch_interval seconds"""
+        if self.watch_interval is not None and time.monotonic() - self._checked >= self.watch_interval:
+            return self.reload_if_changed()
+        return False
+
+    def snapshot(self):
+        """Current config snapshot (reloaded first if the files changed).
+        Read several values from one snapshot to get a consistent view."""
+        self.reload_if_due()
+        return self._snapshot
+
+    def subscribe(self, callback):
+        """Call callback(snapshot) after every (re)load"""
+        with self._lock:
+            self._subscribers.append(callback)
+
+    @property
+    def app_config(self):
+        return self.snapshot().app
+
+    @property
+    def languages_config(self):
+        return self.snapshot().languages
+
+    @property
+    def categories_config(self):
+        return self.snapshot().categories
+
+    @property
+    def media_types_config(self):
+        return self.snapshot().media_types
+
+    # ... (getters) ...
 
     def get_port(self):
         """Get API port"""
@@ -76,7 +183,7 @@ class ConfigLoader:
 
     def get_language_codes(self):
         """Get list of supported language codes"""
-        return [lang['code'] for lang in self.languages_config.get('supportedLanguages', [])]
+        return list(self.snapshot().language_codes)
 
     def get_default_language(self):
         """Get default language code"""
@@ -84,7 +191,7 @@ class ConfigLoader:
 
     def get_content_types(self):
         """Get all content type configurations (new name for categories)"""
-        return self.categories_config.get('contentTypes', self.categories_config.get('categories', []))
+        return list(self.snapshot().content_types)
 
     def get_categories(self):
         """Get all category configurations (legacy method, now returns content types)"""
@@ -92,10 +199,7 @@ class ConfigLoader:
 
     def get_content_type(self, content_type_id):
         """Get specific content type configuration"""
-        for ct in self.get_content_types():
-            if ct['id'] == content_type_id:
-                return ct
-        return None
+        return self.snapshot().content_types_by_id.get(content_type_id)
 
     def get_category(self, category_id):
         """Get specific category configuration (legacy method)"""
@@ -103,44 +207,28 @@ class ConfigLoader:
 
     def get_category_data_file(self, category_id):
         """Get absolute data file path for a category"""
-        cat = self.get_content_type(category_id)
-        filename = f'{category_id}.json'
-        if cat and 'dataFile' in cat:
-            # If dataFile is specified, ensure it's relative to data_dir
-            # We strip 'data/' prefix if it was hardcoded in the config
-            clean_name = cat['dataFile'].replace('data/', '')
-            return str(self.data_dir / clean_name)
-        return str(self.data_dir / filename)
+        path = self.snapshot().category_map.get(category_id)
+        return path or str(self.data_dir / f'{category_id}.json')
 
     def get_category_map(self):
         """Get mapping of category ID to absolute data file path"""
-        return {cat['id']: self.get_category_data_file(cat['id']) for cat in self.get_content_types()}
+        return dict(self.snapshot().category_map)
 
     def get_gallery_categories(self):
         """Get list of categories that support galleries (based on media type)"""
-        gallery_types = []
-        for ct in self.get_content_types():
-            media_type = self.get_media_type(ct.get('mediaType'))
-            if media_type and media_type.get('supportsGallery', False):
-                gallery_types.append(ct['id'])
-        return gallery_types
+        return list(self.snapshot().gallery_categories)
 
     def get_media_types(self):
         """Get all media type configurations"""
-        if self.media_types_config is None:
-            return []
-        return self.media_types_config.get('mediaTypes', [])
+        return list(self.snapshot().media_type_list)
 
     def get_media_type(self, media_type_id):
         """Get specific media type configuration"""
-        for mt in self.get_media_types():
-            if mt['id'] == media_type_id:
-                return mt
-        return None
+        return self.snapshot().media_types_by_id.get(media_type_id)
 
     def get_content_types_by_media(self, media_type_id):
         """Get all content types that use a specific media type"""
-        return [ct for ct in self.get_content_types() if ct.get('mediaType') == media_type_id]
+        return list(self.snapshot().content_types_by_media.get(media_type_id, []))
 
     def get_github_config(self):
         """Get GitHub configuration"""
@@ -156,6 +244,14 @@ class ConfigLoader:
         # Fallback to old 'repo' key if it exists
         return github.get('repo', 'yourusername/retro-portfolio')
 
+    def get_storage_config(self):
+        """Get content storage configuration (mode: json | journal | sqlite)"""
+        return self.app_config.get('storage', {})
+
+    def get_upload_config(self):
+        """Get upload configuration (concurrency, ...)"""
+        return self.app_config.get('uploads', {})
+
     def get_path(self, path_key):
         """Get configured path (dataDir, langDir, etc.)"""
         return self.app_config.get('paths', {}).get(path_key, path_key)
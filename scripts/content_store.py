@@ -0,0 +1,577 @@
+"""
+In-memory content store for category data files.
+Keeps each category's parsed list in memory and revalidates it with a
+cheap stat() (mtime + size), so the JSON is only parsed again when the
+file actually changed on disk.
+
+Each cached category also carries an index from item id (and string
+title, used to match GitHub projects) to list position, so lookups and
+in-place updates don't scan the list, plus lazily built sort orders used
+to page through it.
+
+In journal mode, saves append one JSON line per mutation to
+data/<category>.journal.jsonl instead of rewriting data/<category>.json.
+Reads replay the journal over the snapshot, and compact() folds it back
+into the canonical file the static site reads.
+"""
+
+import base64
+import bisect
+import contextlib
+import json
+import os
+import threading
+
+from atomic_file import discard, write_temp
+from request_metrics import phase
+
+# Fields page() can sort by ("-field" for descending)
+SORT_FIELDS = ('date', 'created')
+
+
+class DuplicateIdError(LookupError):
+    """Raised when a lookup hits an id shared by several items"""
+
+    def __init__(self, category, item_id, count):
+        self.category = category
+        self.item_id = item_id
+        self.count = count
+        super().__init__(f"Duplicate id '{item_id}' in {category} ({count} items)")
+
+
+def journal_path(path):
+    """Journal file that sits next to a category data file"""
+    return os.path.splitext(path)[0] + '.journal.jsonl'
+
+
+def encode_cursor(sort, value, key):
+    """Opaque page cursor: the sort it was made for, plus the sort value
+    (list position in file order) and key of the last item served"""
+    raw = json.dumps([sort or '', value, key], ensure_ascii=False).encode('utf-8')
+    return base64.urlsafe_b64encode(raw).decode('ascii').rstrip('=')
+
+
+def decode_cursor(cursor, sort=None):
+    """Inverse of encode_cursor(): (value, key). ValueError for malformed
+    cursors and cursors made for another sort."""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4))
+        cursor_sort, value, key = json.loads(raw)
+    except (ValueError, TypeError):
+        raise ValueError(f"Invalid cursor '{cursor}'")
+    if cursor_sort != (sort or ''):
+        raise ValueError(f"Cursor '{cursor}' was made for another sort order")
+    # File order pages by position, sorted pages by the field's text
+    value_ok = (isinstance(value, int) and not isinstance(value, bool)) if not sort else isinstance(value, str)
+    if not value_ok or not isinstance(key, str):
+        raise ValueError(f"Invalid cursor '{cursor}'")
+    return value, key
+
+
+def _item_key(item):
+    """Stable key used by journal records: id, or title for GitHub projects"""
+    item_id = item.get('id')
+    if item_id is not None:
+        return item_id
+    title = item.get('title')
+    return title if isinstance(title, str) else None
+
+
+class _Reversed:
+    """Reversed read-only view of a list (slicing copies only the slice)"""
+
+    def __init__(self, items):
+        self.items = items
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            start, stop, _ = index.indices(len(self.items))
+            return self.items[len(self.items) - stop:len(self.items) - start][::-1]
+        return self.items[len(self.items) - 1 - index]
+
+
+class _Entry:
+    """Parsed items of one data file plus their id/title index"""
+
+    def __init__(self, path, signature, items):
+        self.path = path
+        self.signature = signature
+        self.items = items
+        # Mutation records not yet written to disk
+        self.pending = []
+        # Records currently in the journal file
+        self.journaled = 0
+        self.reindex()
+
+    def reindex(self):
+        """Rebuild the whole index from the item list"""
+        self.orders = {}
+        self.ids = {}
+        self.titles = {}
+        self.duplicates = {}
+        for position, item in enumerate(self.items):
+            self._index(position, item)
+
+    def _index(self, position, item):
+        item_id = item.get('id')
+        if item_id is not None:
+            if item_id in self.ids:
+                self.duplicates[item_id] = self.duplicates.get(item_id, 1) + 1
+            else:
+                self.ids[item_id] = position
+        title = item.get('title')
+        if isinstance(title, str) and title not in self.titles:
+            self.titles[title] = position
+
+    def _unindex(self, position, item):
+        """Drop an item's keys; returns False when a full reindex is needed
+        (duplicated id, or a string title another item may share)"""
+        item_id = item.get('id')
+        if item_id in self.duplicates or isinstance(item.get('title'), str):
+            return False
+        if self.ids.get(item_id) == position:
+            del self.ids[item_id]
+        return True
+
+    def find(self, category, item_id, match_title):
+        if item_id in self.duplicates:
+            raise DuplicateIdError(category, item_id, self.duplicates[item_id])
+        position = self.ids.get(item_id)
+        if position is None and match_title:
+            position = self.titles.get(item_id)
+        return position
+
+    def order(self, field):
+        """Positions sorted by (field value, key), built once per change.
+        Returns (sort keys, positions) as parallel lists for bisecting."""
+        if field not in self.orders:
+            keyed = sorted(
+                (str(item.get(field) or ''), str(_item_key(item) or ''), position)
+                for position, item in enumerate(self.items)
+            )
+            self.orders[field] = ([k[:2] for k in keyed], [k[2] for k in keyed])
+        return self.orders[field]
+
+    def append(self, item):
+        self.orders.clear()
+        self.items.append(item)
+        self._index(len(self.items) - 1, item)
+        self.pending.append({"op": "add", "item": item})
+
+    def update(self, position, updates):
+        self.orders.clear()
+        item = self.items[position]
+        self.pending.append({"op": "update", "pos": position, "key": _item_key(item), "fields": updates})
+        rekey = 'id' in updates or 'title' in updates
+        if rekey and not self._unindex(position, item):
+            item.update(updates)
+            self.reindex()
+            return item
+        item.update(updates)
+        if rekey:
+            self._index(position, item)
+        return item
+
+    def remove(self, position):
+        self.orders.clear()
+        item = self.items.pop(position)
+        self.pending.append({"op": "remove", "pos": position, "key": _item_key(item)})
+        if not self._unindex(position, item):
+            self.reindex()
+            return item
+        # Only the tail moved: shift its positions down by one
+        for i in range(position, len(self.items)):
+            moved = self.items[i]
+            moved_id = moved.get('id')
+            if self.ids.get(moved_id) == i + 1:
+                self.ids[moved_id] = i
+            title = moved.get('title')
+            if isinstance(title, str) and self.titles.get(title) == i + 1:
+                self.titles[title] = i
+        return item
+
+    def replay(self, record):
+        """Apply one journal record (records for vanished items are skipped)"""
+        op = record.get('op')
+        if op == 'add':
+            self.append(record['item'])
+            return
+
+        # The recorded position is right unless the snapshot was edited by hand
+        position = record.get('pos')
+        key = record.get('key')
+        if not (isinstance(position, int) and 0 <= position < len(self.items)
+                and _item_key(self.items[position]) == key):
+            position = self.ids.get(key, self.titles.get(key))
+            if position is None:
+                return
+
+        if op == 'update':
+            self.update(position, record.get('fields', {}))
+        elif op == 'remove':
+            self.remove(position)
+
+
+class ContentStore:
+    """Process-wide cache of parsed category data files"""
+
+    def __init__(self, resolve_path, journal=False, compact_threshold=500):
+        # resolve_path(category) -> data file path (or None for unknown categories)
+        self._resolve_path = resolve_path
+        self.journal = journal
+        self.compact_threshold = compact_threshold
+        self._entries = {}
+        self._lock = threading.RLock()
+        # Categories mutated inside the current transaction()
+        self._touched = None
+        self.hits = 0
+        self.misses = 0
+
+    def path_for(self, category):
+        """Get the data file path for a category (None if unknown)"""
+        return self._resolve_path(category)
+
+    def version(self, category):
+        """Opaque token that changes whenever a category's stored data does
+        (used for HTTP ETags)"""
+        path = self._resolve_path(category)
+        return self._signature(category, path) if path else None
+
+    @staticmethod
+    def _stat(path):
+        try:
+            st = os.stat(path)
+        except OSError:
+            return None
+        return (st.st_mtime_ns, st.st_size)
+
+    def _signature(self, category, path):
+        """Cheap version of the snapshot + journal: (mtime_ns, size) of each"""
+        return (self._stat(path), self._stat(journal_path(path)))
+
+    @staticmethod
+    def _read(path):
+        if not os.path.exists(path):
+            return []
+        with phase('io'):
+            with open(path, 'r', encoding='utf-8') as f:
+                content = f.read().strip()
+        try:
+            with phase('parse'):
+                return json.loads(content) if content else []
+        except json.JSONDecodeError:
+            return []
+
+    def _load_entry(self, category, path, signature):
+        entry = _Entry(path, signature, self._read(path))
+        if signature[1] is not None:
+            with phase('io'):
+                with open(journal_path(path), 'r', encoding='utf-8') as f:
+                    lines = f.readlines()
+            with phase('parse'):
+                for line in lines:
+                    line = line.strip()
+                    if not line:
+                        continue
+                    try:
+                        entry.replay(json.loads(line))
+                    except json.JSONDecodeError:
+                        # A torn final line from an interrupted write
+                        continue
+                    entry.journaled += 1
+            entry.pending = []
+        return entry
+
+    def _entry(self, category):
+        path = self._resolve_path(category)
+        if not path:
+            raise ValueError(f"Category '{category}' is invalid.")
+
+        signature = self._signature(category, path)
+        with self._lock:
+            entry = self._entries.get(category)
+            if entry and entry.path == path and entry.signature == signature:
+                self.hits += 1
+                return entry
+
+            self.misses += 1
+            entry = self._load_entry(category, path, signature)
+            self._entries[category] = entry
+            return entry
+
+    def load(self, category):
+        """Get the parsed item list for a category.
+        The returned list is shared: mutate it through append()/update()/remove()."""
+        return self._entry(category).items
+
+    def find(self, category, item_id, match_title=False):
+        """Get the list position of an item by id (or string title when
+        match_title is set). Returns None if not found and raises
+        DuplicateIdError if several items share the id."""
+        with self._lock:
+            return self._entry(category).find(category, item_id, match_title)
+
+    def get(self, category, item_id, match_title=False):
+        """Get an item by id (see find())"""
+        with self._lock:
+            entry = self._entry(category)
+            position = entry.find(category, item_id, match_title)
+            return None if position is None else entry.items[position]
+
+    def page(self, category, sort=None, cursor=None, limit=None):
+        """Get one page of a category: (items, next cursor or None, total).
+        sort is None for file order, or a SORT_FIELDS name ("-name" for
+        descending). Cursors name the last item served, so pages stay
+        stable while items are added or removed elsewhere in the list."""
+        field = sort.lstrip('-') if sort else None
+        if field is not None and field not in SORT_FIELDS:
+            raise ValueError(f"Can't sort by '{sort}' (use {', '.join(SORT_FIELDS)})")
+        after = decode_cursor(cursor, sort) if cursor else None
+
+        with self._lock:
+            entry = self._entry(category)
+            total = len(entry.items)
+            if field is None:
+                positions = range(total)
+                start = 0
+                if after is not None:
+                    # Resume after the cursor item, wherever it has moved to
+                    position, key = after
+                    if 0 <= position < total and str(_item_key(entry.items[position]) or '') == key:
+                        start = position + 1
+                    else:
+                        found = entry.ids.get(key, entry.titles.get(key))
+                        # Deleted: what followed it has moved up to its position
+                        start = position if found is None else found + 1
+                    start = min(max(start, 0), total)
+            else:
+                keys, positions = entry.order(field)
+                start = 0
+                if sort.startswith('-'):
+                    # Walk the ascending order backwards without copying it
+                    positions = _Reversed(positions)
+                    if after is not None:
+                        start = total - bisect.bisect_left(keys, tuple(after))
+                elif after is not None:
+                    start = bisect.bisect_right(keys, tuple(after))
+
+            end = total if limit is None else min(total, start + max(limit, 0))
+            page = [entry.items[p] for p in positions[start:end]]
+            next_cursor = None
+            if page and end < total:
+                last = positions[end - 1]
+                key = str(_item_key(entry.items[last]) or '')
+                value = last if field is None else str(entry.items[last].get(field) or '')
+                next_cursor = encode_cursor(sort, value, key)
+            return page, next_cursor, total
+
+    def unique_id(self, category, base_id):
+        """Return base_id, suffixed if an item already uses it"""
+        with self._lock:
+            ids = self._entry(category).ids
+            candidate, n = base_id, 2
+            while candidate in ids:
+                candidate = f"{base_id}_{n}"
+                n += 1
+            return candidate
+
+    def _touch(self, category):
+        if self._touched is not None:
+            self._touched.add(category)
+
+    def append(self, category, item):
+        """Append an item (in memory, call save() to persist)"""
+        with self._lock:
+            self._touch(category)
+            self._entry(category).append(item)
+        return item
+
+    def update(self, category, position, updates):
+        """Apply updates to the item at position (in memory)"""
+        with self._lock:
+            self._touch(category)
+            return self._entry(category).update(position, updates)
+
+    def remove(self, category, position):
+        """Remove and return the item at position (in memory)"""
+        with self._lock:
+            self._touch(category)
+            return self._entry(category).remove(position)
+
+    @contextlib.contextmanager
+    def transaction(self):
+        """Group mutations and their save()s: other threads wait until the
+        block is done, and if it raises, the unsaved changes to every
+        category it mutated are discarded (re-read on next use)."""
+        with self._lock:
+            if self._touched is not None:
+                # Nested: the outer transaction decides
+                yield
+                return
+            self._touched = set()
+            try:
+                yield
+            except BaseException:
+                for category in self._touched:
+                    self._entries.pop(category, None)
+                raise
+            finally:
+                self._touched = None
+
+    def _prepare_snapshot(self, path, items):
+        """Write the canonical data file's new content to a temp file
+        (see _install_snapshot())"""
+        with phase('serialize'):
+            text = json.dumps(items, indent=4, ensure_ascii=False)
+        with phase('io'):
+            return write_temp(path, text)
+
+    @staticmethod
+    def _install_snapshot(path, temp_path):
+        """Rename a prepared snapshot over the data file and drop the journal"""
+        with phase('io'):
+            try:
+                os.replace(temp_path, path)
+            except BaseException:
+                discard(temp_path)
+                raise
+            try:
+                os.remove(journal_path(path))
+            except FileNotFoundError:
+                pass
+
+    def _write_snapshot(self, category, path, items):
+        """Atomically rewrite the canonical data file (temp file + rename)
+        and drop the journal"""
+        try:
+            self._install_snapshot(path, self._prepare_snapshot(path, items))
+        except Exception:
+            # The in-memory list may hold unsaved edits; re-read next time
+            self._entries.pop(category, None)
+            raise
+
+    def _write_journal(self, category, entry):
+        """Append pending mutation records to the journal"""
+        try:
+            with phase('serialize'):
+                lines = ''.join(json.dumps(record, ensure_ascii=False) + '\n' for record in entry.pending)
+            with phase('io'):
+                with open(journal_path(entry.path), 'a', encoding='utf-8') as f:
+                    f.write(lines)
+        except Exception:
+            self._entries.pop(category, None)
+            raise
+        entry.journaled += len(entry.pending)
+
+    def save(self, category, items=None):
+        """Persist a category. Without items, the pending in-memory changes are
+        written (appended to the journal in journal mode); with items, the
+        whole list replaces the category."""
+        path = self._resolve_path(category)
+        if not path:
+            raise ValueError(f"Category '{category}' is invalid.")
+
+        with self._lock:
+            entry = self._entries.get(category)
+            if entry and entry.path != path:
+                entry = None
+
+            if items is not None and not (entry and entry.items is items):
+                self._write_snapshot(category, path, items)
+                entry = _Entry(path, self._signature(category, path), items)
+                self._entries[category] = entry
+                return
+
+            if entry is None:
+                entry = self._entry(category)
+            if self.journal and entry.journaled + len(entry.pending) < self.compact_threshold:
+                if entry.pending:
+                    self._write_journal(category, entry)
+            else:
+                self._write_snapshot(category, path, entry.items)
+                entry.journaled = 0
+            entry.pending = []
+            entry.signature = self._signature(category, path)
+
+    def save_many(self, categories):
+        """Persist the pending changes of several categories together. With
+        more than one, each is written as a full snapshot (even in journal
+        mode) and the data files are only replaced once every temp file has
+        been written, so a failure leaves them all as they were."""
+        categories = list(categories)
+        if len(categories) == 1:
+            return self.save(categories[0])
+
+        with self._lock:
+            prepared = []  # (category, entry, path, temp path)
+            try:
+                for category in categories:
+                    path = self._resolve_path(category)
+                    if not path:
+                        raise ValueError(f"Category '{category}' is invalid.")
+                    entry = self._entries.get(category)
+                    if entry is None or entry.path != path:
+                        entry = self._entry(category)
+                    prepared.append((category, entry, path, self._prepare_snapshot(path, entry.items)))
+                for category, entry, path, temp_path in prepared:
+                    self._install_snapshot(path, temp_path)
+                    entry.journaled = 0
+                    entry.pending = []
+                    entry.signature = self._signature(category, path)
+            except Exception:
+                for _, _, _, temp_path in prepared:
+                    discard(temp_path)
+                for category in categories:
+                    self._entries.pop(category, None)
+                raise
+
+    def compact(self, category):
+        """Fold a category's journal back into its data file.
+        Returns the number of journal records folded."""
+        with self._lock:
+            entry = self._entry(category)
+            if not entry.journaled and not entry.pending:
+                return 0
+            folded = entry.journaled + len(entry.pending)
+            self._write_snapshot(category, entry.path, entry.items)
+            entry.journaled = 0
+            entry.pending = []
+            entry.signature = self._signature(category, entry.path)
+            return folded
+
+    def export(self, category):
+        """Make sure data/<category>.json holds the current items (folding any
+        journal). Returns the number of items in the file."""
+        with self._lock:
+            self.compact(category)
+            return len(self._entry(category).items)
+
+    def exists(self, category):
+        """Whether a category is known and has stored data"""
+        path = self._resolve_path(category)
+        return bool(path) and os.path.exists(path)
+
+    def invalidate(self, category=None):
+        """Drop one category (or everything) from the cache"""
+        with self._lock:
+            if category is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(category, None)
+
+    def stats(self):
+        """Get hit/miss counters, journal sizes and any duplicate ids seen"""
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "cached": sorted(self._entries.keys()),
+                "journal": {
+                    cat: entry.journaled
+                    for cat, entry in self._entries.items() if entry.journaled
+                },
+                "duplicates": {
+                    cat: sorted(entry.duplicates)
+                    for cat, entry in self._entries.items() if entry.duplicates
+                },
+            }
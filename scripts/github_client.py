@@ -0,0 +1,123 @@
+"""
+Shared GitHub API client.
+One keep-alive requests.Session (connection pool sized for concurrent
+uploads) for every GitHub call made by manager.py and admin_api.py, plus
+a TTL cache of release metadata so uploading N assets doesn't cost N
+lookups of the same release.
+The session (and requests itself) is only set up on the first call, so
+importing manager stays cheap.
+"""
+
+import threading
+import time
+
+
+class GitHubClient:
+    """Pooled GitHub API session with cached release metadata"""
+
+    def __init__(self, token=None, api_url="https://api.github.com", release_ttl=300, pool_size=10):
+        self.token = token
+        self.api_url = api_url.rstrip('/')
+        self.release_ttl = release_ttl
+        self.pool_size = pool_size
+        self._session = None
+        self._releases = {}
+        self._release_locks = {}  # (repo, tag) -> lock held while looking it up
+        self._lock = threading.Lock()
+        self.requests_made = 0
+        self.requests_saved = 0
+
+    @property
+    def session(self):
+        """The pooled requests.Session, created on first use"""
+        if self._session is None:
+            import requests
+            from requests.adapters import HTTPAdapter
+
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=4, pool_maxsize=self.pool_size)
+            session.mount('https://', adapter)
+            session.mount('http://', adapter)
+            with self._lock:
+                if self._session is None:
+                    self._session = session
+        return self._session
+
+    def headers(self, **extra):
+        """Default GitHub API headers (with auth when a token is set)"""
+        headers = {"Accept": "application/vnd.github.v3+json"}
+        if self.token:
+            headers["Authorization"] = f"token {self.token}"
+        headers.update(extra)
+        return headers
+
+    def request(self, method, url, **kwargs):
+        """Send a request through the pooled session.
+        Relative URLs are resolved against the API root."""
+        if url.startswith('/'):
+            url = self.api_url + url
+        kwargs.setdefault('headers', self.headers())
+        with self._lock:
+            self.requests_made += 1
+        return self.session.request(method, url, **kwargs)
+
+    def _cached_release(self, key):
+        with self._lock:
+            cached = self._releases.get(key)
+            if cached and cached[0] > time.monotonic():
+                self.requests_saved += 1
+                return cached[1]
+        return None
+
+    def get_release(self, repo, tag, create=True):
+        """Get a release by tag (creating it if missing and create is set).
+        Served from cache for release_ttl seconds. Concurrent misses on the
+        same release wait for the first lookup instead of sending their
+        own (and creating the release twice)."""
+        key = (repo, tag)
+        release = self._cached_release(key)
+        if release is not None:
+            return release
+
+        with self._lock:
+            release_lock = self._release_locks.setdefault(key, threading.Lock())
+        with release_lock:
+            # Someone else may have fetched it while we waited
+            release = self._cached_release(key)
+            if release is not None:
+                return release
+
+            r = self.request('GET', f"/repos/{repo}/releases/tags/{tag}")
+            if r.status_code == 200:
+                release = r.json()
+            elif create:
+                print(f"Creating GitHub Release '{tag}'...")
+                r = self.request('POST', f"/repos/{repo}/releases", json={
+                    "tag_name": tag,
+                    "name": "Media Assets",
+                    "body": "Audio and video files for the portfolio.",
+                    "draft": False,
+                    "prerelease": False,
+                })
+                r.raise_for_status()
+                release = r.json()
+            else:
+                r.raise_for_status()
+
+            with self._lock:
+                self._releases[key] = (time.monotonic() + self.release_ttl, release)
+            return release
+
+    def forget_release(self, repo, tag):
+        """Drop cached metadata (e.g. after the release was deleted)"""
+        with self._lock:
+            self._releases.pop((repo, tag), None)
+
+    def stats(self):
+        """Get request counters"""
+        with self._lock:
+            return {
+                "requests": self.requests_made,
+                "requestsSaved": self.requests_saved,
+                "cachedReleases": len(self._releases),
+            }
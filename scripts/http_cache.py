@@ -0,0 +1,93 @@
+"""
+Versioned response cache for the admin read endpoints.
+A response body is built once per version of the files behind it (and
+compressed at most once per encoding), so polling /api/content and
+friends costs a stat() per file instead of re-reading and re-encoding
+everything. Versions also give the strong ETag used for 304 replies.
+"""
+
+import gzip
+import hashlib
+import threading
+import time
+
+try:
+    import brotli
+except ImportError:  # optional: gzip only
+    brotli = None
+
+# Bodies smaller than this aren't worth compressing
+MIN_COMPRESS_SIZE = 1024
+
+
+def encodings():
+    """Content encodings we can produce, preferred first"""
+    return ('br', 'gzip') if brotli else ('gzip',)
+
+
+class Representation:
+    """One version of a response body and its compressed variants"""
+
+    def __init__(self, version, body, last_modified):
+        self.version = version
+        self.body = body
+        self.etag = hashlib.sha1(repr(version).encode('utf-8')).hexdigest()[:20]
+        self.last_modified = last_modified
+        self._encoded = {}
+        self._lock = threading.Lock()
+
+    def encode(self, encoding=None):
+        """Get the body in an encoding (None for identity), compressing once"""
+        if encoding is None:
+            return self.body
+        with self._lock:
+            if encoding not in self._encoded:
+                if encoding == 'br':
+                    self._encoded[encoding] = brotli.compress(self.body)
+                elif encoding == 'gzip':
+                    self._encoded[encoding] = gzip.compress(self.body, compresslevel=6, mtime=0)
+                else:
+                    raise ValueError(f"Unsupported encoding '{encoding}'")
+            return self._encoded[encoding]
+
+
+class ResponseCache:
+    """Latest representation of each cached response"""
+
+    def __init__(self):
+        self._entries = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key, version, build):
+        """Get the representation of `key` at `version`; build() returns
+        the body bytes and is only called when the version changed.
+        Last-Modified is when a version was first built, kept strictly
+        increasing (in whole seconds) per key."""
+        with self._lock:
+            cached = self._entries.get(key)
+            if cached and cached.version == version:
+                self.hits += 1
+                return cached
+
+        body = build()
+        last_modified = int(time.time())
+        with self._lock:
+            self.misses += 1
+            cached = self._entries.get(key)
+            if cached and cached.version == version:
+                return cached
+            if cached:
+                last_modified = max(last_modified, cached.last_modified + 1)
+            representation = Representation(version, body, last_modified)
+            self._entries[key] = representation
+            return representation
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses, "cached": sorted(self._entries)}
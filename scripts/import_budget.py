@@ -0,0 +1,111 @@
+"""
+Import-time budget for the CLI, the manager and the admin API.
+Imports each entry point in a fresh interpreter with `python -X importtime`,
+reports the total and the slowest modules, and fails when a total goes
+over its budget, so slow imports creeping back into startup get noticed.
+
+    python3 scripts/import_budget.py
+    python3 scripts/import_budget.py --budget api=600 --top 15
+"""
+
+import argparse
+import os
+import re
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Entry point -> module imported
+TARGETS = {
+    "cli": "cli",
+    "manager": "manager",
+    "api": "admin_api",
+}
+
+# Milliseconds allowed for each import (best of --runs), interpreter
+# startup (site, encodings) not included
+BUDGETS_MS = {
+    "cli": 100,
+    "manager": 150,
+    "api": 500,
+}
+
+LINE_PATTERN = re.compile(r'^import time:\s+(\d+) \|\s+(\d+) \|(\s*)(\S+)')
+
+
+def parse_importtime(output):
+    """Parse `-X importtime` stderr into (module, self_us, cumulative_us, depth)"""
+    modules = []
+    for line in output.splitlines():
+        match = LINE_PATTERN.match(line)
+        if match:
+            self_us, cumulative_us, indent, name = match.groups()
+            modules.append((name, int(self_us), int(cumulative_us), (len(indent) - 1) // 2))
+    return modules
+
+
+def import_tree(modules, target):
+    """Cumulative microseconds of a top-level import and its direct
+    imports as [(module, cumulative_us)]. -X importtime lists children
+    before their parent."""
+    children = []
+    for name, _, cumulative_us, depth in modules:
+        if depth == 1:
+            children.append((name, cumulative_us))
+        elif depth == 0:
+            if name == target:
+                return cumulative_us, children
+            children = []
+    raise ValueError(f"'{target}' was not imported")
+
+
+def measure(module):
+    """Import timings of a module imported in a fresh interpreter"""
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join([ROOT, os.path.join(ROOT, 'scripts')]))
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+        capture_output=True, text=True, cwd=ROOT, env=env
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"import {module} failed:\n{result.stderr[-2000:]}")
+    return import_tree(parse_importtime(result.stderr), module)
+
+
+def report(name, total_us, children, budget_ms, top):
+    """Print one target's import time and its slowest direct imports.
+    Returns whether it is within budget."""
+    total_ms = total_us / 1000
+    ok = total_ms <= budget_ms
+    print(f"{'✅' if ok else '❌'} {name}: {total_ms:.0f} ms (budget {budget_ms} ms)")
+    for module, cumulative_us in sorted(children, key=lambda c: c[1], reverse=True)[:top]:
+        print(f"   {cumulative_us / 1000:8.1f} ms  {module}")
+    return ok
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Check import time of the CLI, manager and admin API")
+    parser.add_argument("targets", nargs="*", help=f"Targets to measure: {', '.join(TARGETS)} (default: all)")
+    parser.add_argument("--budget", action="append", default=[], metavar="TARGET=MS", help="Override a budget")
+    parser.add_argument("--runs", type=int, default=3, help="Runs per target, the fastest counts (default: 3)")
+    parser.add_argument("--top", type=int, default=10, help="Slowest imports to list (default: 10)")
+    args = parser.parse_args()
+
+    unknown = [t for t in args.targets if t not in TARGETS]
+    if unknown:
+        parser.error(f"Unknown target(s): {', '.join(unknown)}")
+
+    budgets = dict(BUDGETS_MS)
+    for override in args.budget:
+        target, _, ms = override.partition('=')
+        if target not in TARGETS or not ms.isdigit():
+            parser.error(f"Invalid budget '{override}' (expected TARGET=MS)")
+        budgets[target] = int(ms)
+
+    success = True
+    for name in args.targets or list(TARGETS):
+        runs = [measure(TARGETS[name]) for _ in range(max(1, args.runs))]
+        total_us, children = min(runs, key=lambda run: run[0])
+        success = report(name, total_us, children, budgets[name], args.top) and success
+
+    sys.exit(0 if success else 1)
@@ -1,18 +1,24 @@
 import os
+import atexit
+import contextvars
 import glob
-import json
 from pathlib import Path
 import argparse
 import re
 import time
+import threading
 import mimetypes
 from pathlib import Path
 from datetime import datetime
-import cloudinary
-import cloudinary.uploader
-import requests
+from concurrent.futures import ThreadPoolExecutor
 from dotenv import load_dotenv
+import bundle
 from config_loader import config
+from content_store import ContentStore
+from github_client import GitHubClient
+from media_index import MediaIndex, file_digest, find_duplicate_urls
+from request_metrics import timed
+from search_index import SearchIndex
 
 # Load environment variables
 load_dotenv()
@@ -20,17 +26,61 @@ load_dotenv()
 # Load configuration
 config.load_all()
 
-# Cloudinary Configuration
-cloudinary.config(
-    cloud_name=os.getenv("CLOUDINARY_CLOUD_NAME"),
-    api_key=os.getenv("CLOUDINARY_API_KEY"),
-    api_secret=os.getenv("CLOUDINARY_API_SECRET"),
-    secure=True
-)
+_cloudinary_lock = threading.Lock()
+_cloudinary_configured = False
+
+def cloudinary_uploader():
+    """cloudinary.uploader, imported and configured on the first upload
+    (the SDK is slow to import and most commands never upload)"""
+    global _cloudinary_configured
+    import cloudinary
+    import cloudinary.uploader
+    with _cloudinary_lock:
+        if not _cloudinary_configured:
+            # Cloudinary Configuration
+            cloudinary.config(
+                cloud_name=os.getenv("CLOUDINARY_CLOUD_NAME"),
+                api_key=os.getenv("CLOUDINARY_API_KEY"),
+                api_secret=os.getenv("CLOUDINARY_API_SECRET"),
+                secure=True
+            )
+            _cloudinary_configured = True
+    return cloudinary.uploader
 
 # Load JSON_MAP from configuration
 JSON_MAP = config.get_category_map()
 
+def _apply_config(snapshot):
+    """Config reloaded (edited on disk or saved by the admin): swap in the
+    new category map, readers see the old or the new one, never a mix"""
+    global JSON_MAP
+    JSON_MAP = dict(snapshot.category_map)
+
+config.subscribe(_apply_config)
+
+# Shared content store (used by admin_api too): cached JSON files by default,
+# or a SQLite database when storage.mode is "sqlite"
+storage_config = config.get_storage_config()
+if storage_config.get('mode') == 'sqlite':
+    from sqlite_store import SqliteStore
+    store = SqliteStore(
+        lambda category: JSON_MAP.get(category),
+        config.content_root / storage_config.get('database', 'content.db')
+    )
+else:
+    store = ContentStore(
+        lambda category: JSON_MAP.get(category),
+        journal=storage_config.get('mode') == 'journal',
+        compact_threshold=storage_config.get('compactThreshold', 500)
+    )
+
+# Static data bundles (`cli.py build`), kept in step with saves
+BUNDLES_DIR = Path(config.data_dir) / bundle.BUNDLE_DIR
+_rebuild_bundles = False
+
+# Full-text index over titles, descriptions, medium and genre (/api/search)
+search = SearchIndex(store, lambda: list(JSON_MAP), config.get_language_codes())
+
 # GitHub Releases Configuration (for audio/video that Cloudinary free plan rejects)
 GITHUB_TOKEN = os.getenv("GITHUB_TOKEN")
 GITHUB_REPO = config.get_github_repo()  # Returns "username/repoName"
@@ -38,6 +88,27 @@ github_config = config.get_github_config()
 RELEASE_TAG = github_config.get('mediaReleaseTag', 'media')
 GITHUB_UPLOAD_CATEGORIES = set(github_config.get('uploadCategories', ['music']))
 
+# How many remote uploads may run at once (bulk uploads, pile mode)
+upload_config = config.get_upload_config()
+UPLOAD_CONCURRENCY = upload_config.get('concurrency', 4)
+# Extra attempts for a failed pile image, with exponential backoff from RETRY_DELAY seconds
+UPLOAD_RETRIES = upload_config.get('retries', 2)
+RETRY_DELAY = 1.0
+# Files above this size go to Cloudinary in chunks of this size (bounded memory)
+UPLOAD_CHUNK_SIZE = upload_config.get('chunkSize', 20 * 1024 * 1024)
+
+# Content hash -> URL of everything uploaded, so identical files upload once
+DEDUP_UPLOADS = upload_config.get('dedup', True)
+media_index = MediaIndex(config.content_root / 'media-index.json')
+
+# Shared keep-alive session for every GitHub call (admin_api uses it too)
+github = GitHubClient(
+    GITHUB_TOKEN,
+    api_url=github_config.get('apiUrl', 'https://api.github.com'),
+    release_ttl=github_config.get('releaseCacheTtl', 300),
+    pool_size=max(10, UPLOAD_CONCURRENCY)
+)
+
 MEDIA_CONTENT_TYPES = {
     ".mp3": "audio/mpeg",
     ".wav": "audio/wav",
@@ -51,38 +122,48 @@ MEDIA_CONTENT_TYPES = {
 
 
 def get_or_create_release():
-    """Get existing 'media' release or create one for hosting audio/video assets."""
-    headers = {
-        "Authorization": f"token {GITHUB_TOKEN}",
-        "Accept": "application/vnd.github.v3+json",
-    }
-    # Try to get existing release by tag
-    r = requests.get(
-        f"https://api.github.com/repos/{GITHUB_REPO}/releases/tags/{RELEASE_TAG}",
-        headers=headers,
-    )
-    if r.status_code == 200:
-        return r.json()
-
-    # Create a new release
-    print(f"Creating GitHub Release '{RELEASE_TAG}'...")
-    r = requests.post(
-        f"https://api.github.com/repos/{GITHUB_REPO}/releases",
-        headers=headers,
-        json={
-            "tag_name": RELEASE_TAG,
-            "name": "Media Assets",
-            "body": "Audio and video files for the portfolio.",
-            "draft": False,
-            "prerelease": False,
-        },
-    )
-    r.raise_for_status()
-    return r.json()
+    """Get existing 'media' release or create one for hosting audio/video assets.
+    Cached by the shared GitHub client for github.releaseCacheTtl seconds."""
+    return github.get_release(GITHUB_REPO, RELEASE_TAG)
+
+
+class _SizedStream:
+    """Read-only file wrapper with a known length, so requests streams the
+    body with a Content-Length header instead of loading it in memory."""
+
+    def __init__(self, stream, size):
+        self._stream = stream
+        self._size = size
+
+    def read(self, size=-1):
+        return self._stream.read(size)
+
+    def __len__(self):
+        return self._size
+
+
+def _source_size(source):
+    """Remaining size of a path or seekable file object"""
+    if isinstance(source, (str, os.PathLike)):
+        return os.path.getsize(source)
+    position = source.tell()
+    size = source.seek(0, os.SEEK_END) - position
+    source.seek(position)
+    return size
+
+
+def _large_upload(source):
+    """Whether a source should go to Cloudinary as a chunked upload.
+    Unreadable paths go through the normal upload, which reports the error."""
+    try:
+        return _source_size(source) > UPLOAD_CHUNK_SIZE
+    except OSError:
+        return False
 
 
 def upload_to_github_release(file_path, filename):
-    """Upload a file as an asset to the 'media' GitHub Release.
+    """Upload a file (path or binary file object) as an asset to the 'media'
+    GitHub Release. The body is streamed from disk or the request spool.
     Returns the browser_download_url for the uploaded asset."""
     release = get_or_create_release()
     upload_url = release["upload_url"].replace("{?name,label}", "")
@@ -98,52 +179,120 @@ def upload_to_github_release(file_path, filename):
     # Prepend timestamp to avoid duplicate filename collisions
     unique_filename = f"{int(time.time())}_{filename}"
 
-    headers = {
-        "Authorization": f"token {GITHUB_TOKEN}",
-        "Content-Type": content_type,
-        "Accept": "application/vnd.github.v3+json",
-    }
+    headers = github.headers(**{"Content-Type": content_type})
 
     print(f"Uploading asset '{unique_filename}' ({content_type})...")
-    with open(file_path, "rb") as f:
-        r = requests.post(
+    if isinstance(file_path, (str, os.PathLike)):
+        with open(file_path, "rb") as f:
+            r = github.request("POST", f"{upload_url}?name={unique_filename}", headers=headers, data=f)
+    else:
+        r = github.request(
+            "POST",
             f"{upload_url}?name={unique_filename}",
             headers=headers,
-            data=f,
+            data=_SizedStream(file_path, _source_size(file_path)),
         )
+    if r.status_code == 404:
+        # Cached release was deleted on GitHub: look it up again next time
+        github.forget_release(GITHUB_REPO, RELEASE_TAG)
     r.raise_for_status()
     return r.json()["browser_download_url"]
 
-def upload_single(file_path, category):
-    """Upload a single file to the appropriate service and return its URL."""
+@timed('upload')
+def upload_single(file_path, category, filename=None):
+    """Upload a single file to the appropriate service and return its URL.
+    file_path may also be a binary file object (e.g. an uploaded request
+    file), in which case filename names it."""
+    original_filename = filename or os.path.basename(file_path)
+
+    # Known content: reuse the existing remote asset
+    digest = file_digest(file_path) if DEDUP_UPLOADS else None
+    if digest:
+        known_url = media_index.lookup(digest)
+        if known_url:
+            print(f"Already uploaded (same content): {known_url}")
+            return known_url
+
     if category in GITHUB_UPLOAD_CATEGORIES and GITHUB_TOKEN:
-        print(f"Uploading {file_path} to GitHub Releases...")
-        original_filename = os.path.basename(file_path)
+        print(f"Uploading {original_filename} to GitHub Releases...")
         url = upload_to_github_release(file_path, original_filename)
     else:
         resource_type = "auto"
         if category == "video":
             resource_type = "video"
-        print(f"Uploading {file_path} to Cloudinary...")
-        upload_result = cloudinary.uploader.upload(
-            file_path,
-            folder=f"portfolio/{category}",
-            resource_type=resource_type
-        )
+        print(f"Uploading {original_filename} to Cloudinary...")
+        uploader = cloudinary_uploader()
+        options = {"folder": f"portfolio/{category}", "resource_type": resource_type}
+        if _large_upload(file_path):
+            # Large audio/video: chunked upload, one chunk in memory at a time
+            upload_result = uploader.upload_large(
+                file_path, chunk_size=UPLOAD_CHUNK_SIZE, filename=original_filename, **options)
+        else:
+            upload_result = uploader.upload(file_path, **options)
         url = upload_result.get("secure_url")
     print(f"Success! URL: {url}")
+    if digest and url:
+        media_index.record(digest, url, original_filename)
     return url
 
 
-def upload_and_save(file_path, title, category, medium=None, genre=None, description=None, created=None, pile=False):
-    """Core logic to upload file(s) and update JSON database.
-    When pile=True and file_path is a directory, all images inside are uploaded
-    as a single gallery item (first image = cover, rest = gallery array)."""
-    print(f"--- Processing: {title} ({category}) ---")
+class PileUploadError(RuntimeError):
+    """Raised when pile images still fail after their retries"""
 
-    gallery_urls = []
+    def __init__(self, failures):
+        # {file_path: exception}
+        self.failures = failures
+        names = ", ".join(os.path.basename(f) for f in failures)
+        super().__init__(f"{len(failures)} pile image(s) failed to upload: {names}")
 
-    if pile and os.path.isdir(file_path):
+
+def upload_with_retry(file_path, category, retries=None):
+    """upload_single() with exponential backoff between attempts."""
+    retries = UPLOAD_RETRIES if retries is None else retries
+    for attempt in range(retries + 1):
+        try:
+            return upload_single(file_path, category)
+        except Exception as e:
+            if attempt == retries:
+                raise
+            delay = RETRY_DELAY * (2 ** attempt)
+            print(f"Upload of {file_path} failed ({e}), retrying in {delay:.1f}s...")
+            time.sleep(delay)
+
+
+def upload_pile(files, category, workers=None, retries=None, skip_failed=False):
+    """Upload pile images concurrently and return their URLs in the order of
+    files. Images that still fail after retries raise PileUploadError, or
+    with skip_failed=True are left out and reported."""
+    workers = workers or UPLOAD_CONCURRENCY
+    with ThreadPoolExecutor(max_workers=max(1, min(workers, len(files)))) as pool:
+        # Each upload runs in a copy of our context, so it's timed as part of
+        # the request that started it (request_metrics)
+        futures = [pool.submit(contextvars.copy_context().run, upload_with_retry, f, category, retries)
+                   for f in files]
+
+    urls = []
+    failures = {}
+    for f, future in zip(files, futures):
+        try:
+            urls.append(future.result())
+        except Exception as e:
+            failures[f] = e
+
+    if failures:
+        if not skip_failed or not urls:
+            raise PileUploadError(failures)
+        print(f"Skipped {len(failures)} of {len(files)} pile images:")
+        for f, e in failures.items():
+            print(f"  - {f}: {e}")
+    return urls
+
+
+def upload_media(file_path, category, pile=False, workers=None, retries=None, skip_failed=False, filename=None):
+    """Upload a file (or, with pile=True, a directory of images) and return
+    (media_url, gallery_urls): first image = cover, rest = gallery array.
+    Pile images are uploaded concurrently (see upload_pile)."""
+    if pile and isinstance(file_path, (str, os.PathLike)) and os.path.isdir(file_path):
         # Pile mode: upload all images in the directory
         IMAGE_EXTS = ("*.jpg", "*.jpeg", "*.png", "*.webp", "*.gif", "*.tiff", "*.bmp")
         files = []
@@ -156,33 +305,17 @@ def upload_and_save(file_path, title, category, medium=None, genre=None, descrip
             raise ValueError(f"No image files found in '{file_path}'")
 
         print(f"Pile mode: found {len(files)} images")
-        urls = []
-        for f in files:
-            urls.append(upload_single(f, category))
+        urls = upload_pile(files, category, workers=workers, retries=retries, skip_failed=skip_failed)
 
-        media_url = urls[0]  # first image is the cover
-        gallery_urls = urls[1:]  # rest go into gallery
-    else:
-        # Single file upload
-        media_url = upload_single(file_path, category)
+        return urls[0], urls[1:]
 
-    # Determine JSON file
-    json_path = JSON_MAP.get(category)
-    if not json_path:
-        raise ValueError(f"Category '{category}' is invalid.")
+    # Single file upload
+    return upload_single(file_path, category, filename=filename), []
 
-    # Load existing data
-    if os.path.exists(json_path):
-        try:
-            with open(json_path, "r", encoding="utf-8") as f:
-                content = f.read().strip()
-                data = json.loads(content) if content else []
-        except json.JSONDecodeError:
-            data = []
-    else:
-        data = []
 
-    # Create new entry with multilingual fields
+def make_entry(category, media_url, title, medium=None, genre=None, description=None, created=None, gallery_urls=None):
+    """Build a new content entry with multilingual fields.
+    The id is made unique when the entry is saved (see save_entries)."""
     def make_multilingual(value):
         """Wrap a single-language value as a multilingual object."""
         if not value:
@@ -204,44 +337,213 @@ def upload_and_save(file_path, title, category, medium=None, genre=None, descrip
         new_entry["genre"] = make_multilingual(genre)
     if description:
         new_entry["description"] = make_multilingual(description)
+    return new_entry
+
+
+def save_entries(category, entries):
+    """Append entries to a category with a single write, suffixing ids that
+    are already taken (several uploads can share a timestamp)."""
+    json_path = JSON_MAP.get(category)
+    if not json_path:
+        raise ValueError(f"Category '{category}' is invalid.")
 
-    data.append(new_entry)
+    # One transaction: a concurrent save can't take an id between our
+    # unique_id() and append()
+    with store.transaction():
+        for entry in entries:
+            entry["id"] = store.unique_id(category, entry["id"])
+            store.append(category, entry)
 
-    # Save back to JSON
-    with open(json_path, "w", encoding="utf-8") as f:
-        json.dump(data, f, indent=4, ensure_ascii=False)
+        # Save back to JSON
+        save_category(category, changed=entries)
     print(f"Updated {json_path}")
+    return entries
+
+
+def save_category(category, changed=(), removed=()):
+    """Persist pending changes to a category (store.save()) and update the
+    search index: changed items are re-indexed, removed ones dropped."""
+    save_categories({category: (changed, removed)})
+
+
+def save_categories(changes):
+    """Persist several categories together (store.save_many(): all of them
+    or none) and update the search index.
+    changes maps category -> (changed items, removed items)."""
+    before = {category: store.version(category) for category in changes}
+    store.save_many(list(changes))
+    for category, (changed, removed) in changes.items():
+        search.apply(category, before[category], changed=changed, removed=removed)
+    if storage_config.get('mode') != 'sqlite':
+        # (in sqlite mode the site's data files only change on export)
+        invalidate_bundles()
+
+
+def invalidate_bundles():
+    """The site's data changed: drop the bundle manifest right away (the
+    site falls back to the data files) and rebuild the bundles with the
+    next timestamp flush. Nothing to do when no bundles were built."""
+    global _rebuild_bundles
+    if bundle.invalidate(BUNDLES_DIR):
+        _rebuild_bundles = True
+
+
+def rebuild_bundles():
+    """Build the bundles dropped by invalidate_bundles() again"""
+    global _rebuild_bundles
+    if not _rebuild_bundles:
+        return
+    _rebuild_bundles = False
+    try:
+        bundle.build(config, store=store, out_dir=BUNDLES_DIR)
+    except Exception as e:
+        print(f"Failed to rebuild data bundles: {e}")
+
+
+def upload_and_save(file_path, title, category, medium=None, genre=None, description=None, created=None, pile=False,
+                    jobs=None, retries=None, skip_failed=False, filename=None):
+    """Core logic to upload file(s) and update JSON database.
+    file_path may be a binary file object named by filename (see upload_single).
+    When pile=True and file_path is a directory, all images inside are uploaded
+    as a single gallery item (first image = cover, rest = gallery array),
+    using up to `jobs` concurrent uploads."""
+    print(f"--- Processing: {title} ({category}) ---")
+
+    # Check the category before spending an upload on it
+    if not JSON_MAP.get(category):
+        raise ValueError(f"Category '{category}' is invalid.")
+
+    media_url, gallery_urls = upload_media(file_path, category, pile=pile, workers=jobs,
+                                           retries=retries, skip_failed=skip_failed, filename=filename)
+    new_entry = make_entry(category, media_url, title, medium, genre, description, created, gallery_urls)
+    save_entries(category, [new_entry])
 
     # Update "Last Updated" globally
     update_site_timestamp()
     return new_entry
 
-def update_site_timestamp():
-    """Updates the 'Last Updated' string in all HTML files."""
-    now = datetime.now().strftime("%d %b %Y")
-    
-    # Check both current directory and content root for index.html
-    possible_files = [
-        "index.html",
-        config.content_root / "index.html"
-    ]
-    
-    for file_path in possible_files:
-        path = Path(file_path)
-        if path.exists():
+
+def upload_many(uploads, workers=None):
+    """Upload several files on a bounded worker pool, then append all new
+    entries with one write per category and a single timestamp update.
+    Each upload is a dict of upload_and_save() keyword arguments.
+    Returns, in input order, the new entry or the exception for each upload."""
+    workers = workers or UPLOAD_CONCURRENCY
+    results = [None] * len(uploads)
+    media = [None] * len(uploads)
+
+    def upload(spec):
+        print(f"--- Processing: {spec.get('title')} ({spec['category']}) ---")
+        if not JSON_MAP.get(spec["category"]):
+            raise ValueError(f"Category '{spec['category']}' is invalid.")
+        return upload_media(spec["file_path"], spec["category"], pile=spec.get("pile", False),
+                            filename=spec.get("filename"))
+
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+        futures = [pool.submit(contextvars.copy_context().run, upload, spec) for spec in uploads]
+        for i, future in enumerate(futures):
             try:
-                with open(path, "r", encoding="utf-8") as f:
-                    content = f.read()
-                
-                # Check if it has the timestamp span
-                if 'Last Updated:</span>' in content:
-                    new_content = re.sub(r'Last Updated:</span> \d{1,2} \w{3} \d{4}', f'Last Updated:</span> {now}', content)
-                    
-                    with open(path, "w", encoding="utf-8") as f:
-                        f.write(new_content)
-                    print(f"Updated timestamp in {path}")
+                media[i] = future.result()
             except Exception as e:
-                print(f"Failed to update timestamp in {path}: {e}")
+                results[i] = e
+
+    # Build entries in input order, grouped by category
+    batches = {}
+    for i, spec in enumerate(uploads):
+        if media[i] is None:
+            continue
+        media_url, gallery_urls = media[i]
+        entry = make_entry(
+            spec["category"], media_url, spec.get("title"),
+            spec.get("medium"), spec.get("genre"), spec.get("description"),
+            spec.get("created"), gallery_urls
+        )
+        batches.setdefault(spec["category"], []).append((i, entry))
+
+    saved = False
+    for category, batch in batches.items():
+        try:
+            save_entries(category, [entry for _, entry in batch])
+        except Exception as e:
+            for i, _ in batch:
+                results[i] = e
+            continue
+        saved = True
+        for i, entry in batch:
+            results[i] = entry
+
+    if saved:
+        update_site_timestamp()
+    return results
+
+# Mutations only mark the site as changed: the 'Last Updated' stamp is
+# written once things have been quiet for TIMESTAMP_DELAY seconds (and at exit)
+TIMESTAMP_DELAY = 2.0
+TIMESTAMP_PATTERN = re.compile(r'(Last Updated:</span> )\d{1,2} \w{3} \d{4}')
+_timestamp_lock = threading.Lock()
+_timestamp_timer = None
+_stamped = {}  # path -> (date, mtime_ns) when last written or found current
+
+def update_site_timestamp(delay=None):
+    """Mark the site as updated. The 'Last Updated' string is written by
+    flush_site_timestamp() once no update came for `delay` seconds, so a
+    batch of mutations costs one write."""
+    global _timestamp_timer
+    delay = TIMESTAMP_DELAY if delay is None else delay
+    with _timestamp_lock:
+        if _timestamp_timer is not None:
+            _timestamp_timer.cancel()
+        _timestamp_timer = threading.Timer(delay, flush_site_timestamp)
+        _timestamp_timer.daemon = True
+        _timestamp_timer.start()
+
+def flush_site_timestamp():
+    """Write a pending timestamp update (and bundle rebuild) now; no-op
+    when none is pending"""
+    global _timestamp_timer
+    with _timestamp_lock:
+        if _timestamp_timer is None:
+            return
+        _timestamp_timer.cancel()
+        _timestamp_timer = None
+    write_site_timestamp()
+    rebuild_bundles()
+
+atexit.register(flush_site_timestamp)
+
+@timed('timestamp')
+def write_site_timestamp():
+    """Updates the 'Last Updated' string in all HTML files.
+    Files already showing today's date are left untouched."""
+    now = datetime.now().strftime("%d %b %Y")
+
+    # Check both current directory and content root for index.html
+    # (often the same file)
+    possible_files = {
+        Path("index.html").resolve(),
+        (config.content_root / "index.html").resolve()
+    }
+
+    for path in possible_files:
+        try:
+            mtime = path.stat().st_mtime_ns
+        except OSError:
+            continue
+        if _stamped.get(path) == (now, mtime):
+            continue
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                content = f.read()
+
+            new_content = TIMESTAMP_PATTERN.sub(rf'\g<1>{now}', content)
+            if new_content != content:
+                with open(path, "w", encoding="utf-8") as f:
+                    f.write(new_content)
+                mtime = path.stat().st_mtime_ns
+                print(f"Updated timestamp in {path}")
+            _stamped[path] = (now, mtime)
+        except Exception as e:
+            print(f"Failed to update timestamp in {path}: {e}")
 
 def save_from_url(url, title, category, medium=None, genre=None, description=None, created=None):
     """Save a media entry using a direct URL (no Cloudinary upload).
@@ -252,17 +554,6 @@ def save_from_url(url, title, category, medium=None, genre=None, description=Non
     if not json_path:
         raise ValueError(f"Category '{category}' is invalid.")
 
-    # Load existing data
-    if os.path.exists(json_path):
-        try:
-            with open(json_path, "r", encoding="utf-8") as f:
-                content = f.read().strip()
-                data = json.loads(content) if content else []
-        except json.JSONDecodeError:
-            data = []
-    else:
-        data = []
-
     def make_multilingual(value):
         if not value:
             return None
@@ -282,27 +573,78 @@ def save_from_url(url, title, category, medium=None, genre=None, description=Non
     if description:
         new_entry["description"] = make_multilingual(description)
 
-    data.append(new_entry)
-
-    with open(json_path, "w", encoding="utf-8") as f:
-        json.dump(data, f, indent=4, ensure_ascii=False)
-    print(f"Updated {json_path}")
+    save_entries(category, [new_entry])
 
     update_site_timestamp()
     return new_entry
 
+def compact_journals(categories=None):
+    """Fold journaled changes back into data/<category>.json.
+    Returns {category: records folded} for categories that had a journal."""
+    folded = {}
+    for category in categories or list(JSON_MAP.keys()):
+        count = store.compact(category)
+        if count:
+            folded[category] = count
+            print(f"Compacted {count} journal records into {JSON_MAP[category]}")
+    return folded
+
+def report_duplicates():
+    """Print media URLs used by several items across data/*.json.
+    Returns {url: ["category/id", ...]}."""
+    duplicates = find_duplicate_urls(list(JSON_MAP.keys()), store.load)
+    if not duplicates:
+        print("No duplicate media URLs found.")
+    for url, uses in sorted(duplicates.items()):
+        print(f"{url} ({len(uses)} uses)")
+        for use in uses:
+            print(f"  - {use}")
+    return duplicates
+
+def export_static(categories=None):
+    """Write data/<category>.json for the public site from the active storage.
+    Returns {category: item count}."""
+    exported = {}
+    for category in categories or list(JSON_MAP.keys()):
+        exported[category] = store.export(category)
+        print(f"Exported {exported[category]} items to {JSON_MAP[category]}")
+    invalidate_bundles()
+    rebuild_bundles()
+    return exported
+
 if __name__ == "__main__":
     parser = argparse.ArgumentParser(description="Alex's Portfolio Content Manager")
-    parser.add_argument("--file", required=True, help="Path to the media file or directory (with --pile)")
-    parser.add_argument("--title", required=True, help="Title of the work")
-    parser.add_argument("--cat", required=True, choices=list(JSON_MAP.keys()), help="Category")
+    parser.add_argument("--file", help="Path to the media file or directory (with --pile)")
+    parser.add_argument("--title", help="Title of the work")
+    parser.add_argument("--cat", choices=list(JSON_MAP.keys()), help="Category")
     parser.add_argument("--medium", help="Medium (for art/sculpting)")
     parser.add_argument("--genre", help="Genre (for music/video)")
     parser.add_argument("--description", help="Description of the work")
     parser.add_argument("--pile", action="store_true", help="Pile mode: upload all images in a directory as one gallery item")
+    parser.add_argument("--jobs", type=int, default=UPLOAD_CONCURRENCY, help=f"Concurrent uploads in pile mode (default: {UPLOAD_CONCURRENCY})")
+    parser.add_argument("--retries", type=int, default=UPLOAD_RETRIES, help=f"Retries per failed pile image (default: {UPLOAD_RETRIES})")
+    parser.add_argument("--skip-failed", action="store_true", help="Pile mode: save the item without images that still fail after retries (reported) instead of aborting")
+
+    parser.add_argument("--compact", action="store_true", help="Fold journal storage back into data/*.json (all categories, or --cat)")
+
+    parser.add_argument("--export", action="store_true", help="Write data/*.json for the public site from the configured storage (all categories, or --cat)")
+
+    parser.add_argument("--duplicates", action="store_true", help="Report media URLs used more than once across data/*.json")
 
     args = parser.parse_args()
+    if args.duplicates:
+        report_duplicates()
+        raise SystemExit(0)
+    if args.compact:
+        compact_journals([args.cat] if args.cat else None)
+        raise SystemExit(0)
+    if args.export:
+        export_static([args.cat] if args.cat else None)
+        raise SystemExit(0)
+    if not args.file or not args.title or not args.cat:
+        parser.error("--file, --title and --cat are required")
     try:
-        upload_and_save(args.file, args.title, args.cat, args.medium, args.genre, args.description, pile=args.pile)
+        upload_and_save(args.file, args.title, args.cat, args.medium, args.genre, args.description, pile=args.pile,
+                        jobs=args.jobs, retries=args.retries, skip_failed=args.skip_failed)
     except Exception as e:
         print(f"Error: {e}")
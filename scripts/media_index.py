@@ -0,0 +1,95 @@
+"""
+Content-addressed media index.
+Maps the SHA-256 of every uploaded file to the URL it was uploaded to,
+stored as media-index.json in the content root, so uploading the same
+bytes again (a re-upload, or one scan in two piles) reuses the existing
+remote asset instead of creating a duplicate.
+"""
+
+import hashlib
+import json
+import os
+import threading
+from datetime import datetime
+
+from atomic_file import atomic_write
+
+HASH_CHUNK_SIZE = 1024 * 1024
+
+
+def file_digest(source):
+    """SHA-256 hex digest of a path or seekable binary file object, read in
+    chunks (never whole in memory). File objects are rewound to where they
+    were. Returns None for paths that can't be read."""
+    digest = hashlib.sha256()
+    if isinstance(source, (str, os.PathLike)):
+        try:
+            os.stat(source)
+            with open(source, 'rb') as f:
+                for chunk in iter(lambda: f.read(HASH_CHUNK_SIZE), b''):
+                    digest.update(chunk)
+        except OSError:
+            return None
+        return digest.hexdigest()
+
+    position = source.tell()
+    for chunk in iter(lambda: source.read(HASH_CHUNK_SIZE), b''):
+        digest.update(chunk)
+    source.seek(position)
+    return digest.hexdigest()
+
+
+class MediaIndex:
+    """hash -> URL index persisted as a JSON file"""
+
+    def __init__(self, path):
+        self.path = str(path)
+        self._entries = None
+        self._lock = threading.Lock()
+        self.hits = 0
+
+    def _load(self):
+        if self._entries is None:
+            try:
+                with open(self.path, 'r', encoding='utf-8') as f:
+                    entries = json.load(f)
+            except (OSError, json.JSONDecodeError):
+                entries = {}
+            self._entries = entries if isinstance(entries, dict) else {}
+        return self._entries
+
+    def lookup(self, digest):
+        """Get the URL already holding this content, or None"""
+        with self._lock:
+            entry = self._load().get(digest)
+            if entry:
+                self.hits += 1
+                return entry['url']
+            return None
+
+    def record(self, digest, url, filename=None):
+        """Remember where this content was uploaded (atomic rewrite of the index)"""
+        with self._lock:
+            entries = self._load()
+            entries[digest] = {
+                "url": url,
+                "name": filename,
+                "uploaded": datetime.now().strftime("%Y-%m-%d"),
+            }
+            atomic_write(self.path, json.dumps(entries, indent=2, ensure_ascii=False))
+
+
+def find_duplicate_urls(categories, load):
+    """Find media URLs used more than once across categories.
+    load(category) returns a category's items; both the cover url and the
+    gallery entries are checked.
+    Returns {url: ["category/id", ...]} for URLs with several uses."""
+    uses = {}
+    for category in categories:
+        for item in load(category):
+            label = f"{category}/{item.get('id') or item.get('title')}"
+            urls = [item.get('url')] + list(item.get('gallery', []))
+            for url in urls:
+                if url:
+                    uses.setdefault(url, []).append(label)
+    return {url: labels for url, labels in uses.items() if len(labels) > 1}
@@ -0,0 +1,205 @@
+"""
+Request timing for the admin API.
+Slow helpers run their work inside phase() blocks: JSON parsing and
+serializing, file I/O, remote uploads and the site timestamp update.
+Each block feeds a per-phase histogram and, when it runs during a request
+(begin_request() .. end_request()), that request's breakdown, which the
+admin sends back as a Server-Timing header. A phase nested in another
+only counts once: its time is taken off the enclosing phase.
+
+Request counters and per-route latency histograms sit in the same
+registry; render() writes everything in the Prometheus text format for
+/api/metrics.
+"""
+
+import bisect
+import contextvars
+import functools
+import threading
+import time
+from contextlib import contextmanager
+
+# Phase -> description used in Server-Timing
+PHASES = {
+    'parse': 'JSON parse',
+    'serialize': 'JSON serialize',
+    'io': 'File I/O',
+    'upload': 'Remote upload',
+    'timestamp': 'Timestamp update',
+}
+
+# Histogram bucket upper bounds, in seconds
+BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+
+class Histogram:
+    """Cumulative-bucket histogram of durations in seconds"""
+
+    def __init__(self, buckets=BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)  # last one is +Inf
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, seconds):
+        self.counts[bisect.bisect_left(self.buckets, seconds)] += 1
+        self.sum += seconds
+        self.count += 1
+
+    def cumulative(self):
+        """[(le, count)] with the +Inf bucket last"""
+        total = 0
+        result = []
+        for bound, count in zip(list(self.buckets) + ['+Inf'], self.counts):
+            total += count
+            result.append((bound, total))
+        return result
+
+
+class _RequestTimer:
+    """Phase times of one request. Its phases can run on several threads
+    at once (work handed to a pool in a contextvars.copy_context())."""
+
+    def __init__(self):
+        self.start = time.perf_counter()
+        self.phases = {}
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+    @property
+    def stack(self):
+        """Child time of each phase open on this thread"""
+        stack = getattr(self._local, 'stack', None)
+        if stack is None:
+            stack = self._local.stack = []
+        return stack
+
+    def add(self, name, seconds):
+        with self._lock:
+            self.phases[name] = self.phases.get(name, 0.0) + seconds
+
+    def snapshot(self):
+        with self._lock:
+            return dict(self.phases)
+
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _labels(**labels):
+    return '{' + ','.join(f'{name}="{_escape(value)}"' for name, value in labels.items()) + '}'
+
+
+class Metrics:
+    """Request counters and latency/phase histograms"""
+
+    def __init__(self, prefix='admin'):
+        self.prefix = prefix
+        self._lock = threading.Lock()
+        self._current = contextvars.ContextVar(f'{prefix}_request', default=None)
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.requests = {}  # (route, method, status) -> count
+            self.latency = {}  # route -> Histogram
+            self.phase_times = {}  # phase -> Histogram
+
+    def begin_request(self):
+        """Start timing a request in this context; returns a token for end_request()"""
+        return self._current.set(_RequestTimer())
+
+    def end_request(self, token, route, method, status):
+        """Count a finished request and record its latency.
+        Returns (total seconds, {phase: seconds})."""
+        timer = self._current.get()
+        self._current.reset(token)
+        elapsed = time.perf_counter() - timer.start
+        with self._lock:
+            key = (route, method, str(status))
+            self.requests[key] = self.requests.get(key, 0) + 1
+            self.latency.setdefault(route, Histogram()).observe(elapsed)
+        return elapsed, timer.snapshot()
+
+    def current_phases(self):
+        """{phase: seconds} of the request being handled, or None"""
+        timer = self._current.get()
+        return None if timer is None else timer.snapshot()
+
+    @contextmanager
+    def phase(self, name):
+        """Time a block as one phase"""
+        timer = self._current.get()
+        if timer is not None:
+            timer.stack.append(0.0)
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            own = elapsed
+            if timer is not None:
+                stack = timer.stack
+                own -= stack.pop()
+                timer.add(name, own)
+                if stack:
+                    stack[-1] += elapsed
+            with self._lock:
+                self.phase_times.setdefault(name, Histogram()).observe(own)
+
+    def timed(self, name):
+        """Decorator: every call of the function is one phase"""
+        def decorator(func):
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                with self.phase(name):
+                    return func(*args, **kwargs)
+            return wrapper
+        return decorator
+
+    def server_timing(self, total, phases):
+        """Server-Timing header value for a request's breakdown"""
+        parts = [f'{name};dur={seconds * 1000:.2f};desc="{PHASES.get(name, name)}"'
+                 for name, seconds in phases.items()]
+        parts.append(f'total;dur={total * 1000:.2f}')
+        return ', '.join(parts)
+
+    def _histogram_lines(self, name, label, histograms):
+        lines = []
+        for value, histogram in sorted(histograms.items()):
+            for bound, count in histogram.cumulative():
+                lines.append(f'{name}_bucket{_labels(**{label: value, "le": bound})} {count}')
+            lines.append(f'{name}_sum{_labels(**{label: value})} {histogram.sum:.6f}')
+            lines.append(f'{name}_count{_labels(**{label: value})} {histogram.count}')
+        return lines
+
+    def render(self):
+        """All metrics in the Prometheus text exposition format"""
+        requests_name = f'{self.prefix}_requests_total'
+        latency_name = f'{self.prefix}_request_duration_seconds'
+        phase_name = f'{self.prefix}_phase_duration_seconds'
+        with self._lock:
+            lines = [
+                f'# HELP {requests_name} Requests handled, by route, method and status',
+                f'# TYPE {requests_name} counter',
+            ]
+            for (route, method, status), count in sorted(self.requests.items()):
+                lines.append(f'{requests_name}{_labels(route=route, method=method, status=status)} {count}')
+            lines += [
+                f'# HELP {latency_name} Request latency by route',
+                f'# TYPE {latency_name} histogram',
+            ]
+            lines += self._histogram_lines(latency_name, 'route', self.latency)
+            lines += [
+                f'# HELP {phase_name} Time spent in each phase (JSON parse/serialize, file I/O, upload, timestamp)',
+                f'# TYPE {phase_name} histogram',
+            ]
+            lines += self._histogram_lines(phase_name, 'phase', self.phase_times)
+        return '\n'.join(lines) + '\n'
+
+
+# Shared registry: the stores, the manager and the admin API report here
+metrics = Metrics()
+phase = metrics.phase
+timed = metrics.timed
@@ -0,0 +1,219 @@
+"""
+Full-text search over content items.
+An inverted index maps every word of an item's title, description,
+medium and genre to the items using it, per language, so /api/search
+answers without scanning the data files. Words are casefolded, and for
+fr/ht/mx also stripped of accents ("Été" is found by "ete"). Every word
+of a query matches as a prefix.
+
+The index lives in memory next to the content store. Saves made through
+manager.save_category() update it incrementally; a category changed any
+other way (edited on disk, replaced, compacted) is re-indexed on the next
+search, and rebuild() starts over from scratch.
+"""
+
+import bisect
+import re
+import threading
+import unicodedata
+
+from content_store import DuplicateIdError, _item_key
+
+# Multilingual fields that are searched
+SEARCH_FIELDS = ('title', 'description', 'medium', 'genre')
+# Languages whose text is matched without accents
+FOLD_LANGUAGES = ('fr', 'ht', 'mx')
+
+WORD_PATTERN = re.compile(r'\w+')
+
+
+def fold_accents(text):
+    """Drop combining marks: "Été" -> "Ete" """
+    decomposed = unicodedata.normalize('NFKD', text)
+    return ''.join(c for c in decomposed if not unicodedata.combining(c))
+
+
+def tokenize(text, lang=None):
+    """Words of a text as the index stores them for a language"""
+    text = text.casefold()
+    if lang in FOLD_LANGUAGES:
+        text = fold_accents(text)
+    return WORD_PATTERN.findall(text)
+
+
+class SearchIndex:
+    """Per-language inverted index (word -> {(category, key)}) over a store"""
+
+    def __init__(self, store, categories, languages, fields=SEARCH_FIELDS):
+        # categories() -> ids of the categories to index
+        self.store = store
+        self._categories = categories
+        # Plain string fields (GitHub project titles, ...) count for every language
+        self.languages = list(languages)
+        self.fields = fields
+        # The store's own lock: hits are resolved through its index, and
+        # saves update this index while holding it (manager.save_entries),
+        # so a second lock would only risk taking the two in opposite orders
+        self._lock = getattr(store, '_lock', None) or threading.RLock()
+        self._postings = {}  # lang -> word -> {(category, key)}
+        self._docs = {}  # category -> key -> {lang: {word}}
+        self._versions = {}  # category -> store version the index reflects
+        self._vocabulary = {}  # lang -> sorted words, built on demand for prefix lookups
+        self.rebuilds = 0
+
+    def _words(self, item):
+        words = {}
+        for field in self.fields:
+            value = item.get(field)
+            if isinstance(value, dict):
+                texts = value.items()
+            elif isinstance(value, str):
+                texts = [(lang, value) for lang in self.languages]
+            else:
+                continue
+            for lang, text in texts:
+                if isinstance(text, str) and text:
+                    words.setdefault(lang, set()).update(tokenize(text, lang))
+        return words
+
+    def _add(self, category, item):
+        key = _item_key(item)
+        if key is None:
+            return
+        doc = (category, key)
+        indexed = self._docs.setdefault(category, {}).setdefault(key, {})
+        for lang, words in self._words(item).items():
+            indexed.setdefault(lang, set()).update(words)
+            postings = self._postings.setdefault(lang, {})
+            for word in words:
+                if word not in postings:
+                    postings[word] = set()
+                    self._vocabulary.pop(lang, None)
+                postings[word].add(doc)
+
+    def _drop(self, category, key):
+        indexed = self._docs.get(category, {}).pop(key, None)
+        if not indexed:
+            return
+        doc = (category, key)
+        for lang, words in indexed.items():
+            postings = self._postings.get(lang, {})
+            for word in words:
+                docs = postings.get(word)
+                if docs is None:
+                    continue
+                docs.discard(doc)
+                if not docs:
+                    del postings[word]
+                    self._vocabulary.pop(lang, None)
+
+    def _index_category(self, category):
+        for key in list(self._docs.get(category, {})):
+            self._drop(category, key)
+        # Version first: a change racing the load only causes another re-index
+        version = self.store.version(category)
+        for item in self.store.load(category):
+            self._add(category, item)
+        self._versions[category] = version
+
+    def _sync(self, category):
+        """Re-index a category whose stored data changed behind our back"""
+        if category not in self._versions or self._versions[category] != self.store.version(category):
+            self._index_category(category)
+
+    def rebuild(self, categories=None):
+        """Index categories (default: all of them) from scratch.
+        Returns {category: items indexed}."""
+        with self._lock:
+            if categories is None:
+                self.invalidate()
+                categories = list(self._categories())
+            for category in categories:
+                self._index_category(category)
+            self.rebuilds += 1
+            return {category: len(self._docs.get(category, {})) for category in categories}
+
+    def apply(self, category, before, changed=(), removed=()):
+        """Fold a saved mutation into the index: changed items are
+        re-indexed, removed items dropped. before is the store version the
+        change was made against; if the index wasn't synced to it, the
+        category is left for a full re-index on the next search."""
+        with self._lock:
+            if category not in self._versions or self._versions[category] != before:
+                return
+            for item in removed:
+                self._drop(category, _item_key(item))
+            for item in changed:
+                self._drop(category, _item_key(item))
+                self._add(category, item)
+            self._versions[category] = self.store.version(category)
+
+    def _prefixed(self, lang, prefix):
+        """Items with a word starting with prefix in one language"""
+        postings = self._postings.get(lang, {})
+        vocabulary = self._vocabulary.get(lang)
+        if vocabulary is None:
+            vocabulary = self._vocabulary[lang] = sorted(postings)
+        docs = set()
+        for i in range(bisect.bisect_left(vocabulary, prefix), len(vocabulary)):
+            if not vocabulary[i].startswith(prefix):
+                break
+            docs |= postings[vocabulary[i]]
+        return docs
+
+    def search(self, query, lang=None, categories=None):
+        """Items having every word of query (as a prefix) in one language,
+        or only in lang when given. Returns (category, item) pairs in
+        category and file order."""
+        categories = list(self._categories()) if categories is None else list(categories)
+        with self._lock:
+            for category in categories:
+                self._sync(category)
+
+            found = set()
+            for code in [lang] if lang else list(self._postings):
+                words = tokenize(query, code)
+                if not words:
+                    continue
+                docs = self._prefixed(code, words[0])
+                for word in words[1:]:
+                    if not docs:
+                        break
+                    docs &= self._prefixed(code, word)
+                found |= docs
+
+            results = []
+            for category in categories:
+                keys = {key for cat, key in found if cat == category}
+                if not keys:
+                    continue
+                items = self.store.load(category)
+                hits = {}  # position -> item
+                for key in keys:
+                    try:
+                        position = self.store.find(category, key, match_title=True)
+                    except DuplicateIdError:
+                        # Several items share the id: all of them match
+                        hits.update((p, item) for p, item in enumerate(items) if _item_key(item) == key)
+                        continue
+                    if position is not None:
+                        hits[position] = items[position]
+                results.extend((category, hits[p]) for p in sorted(hits))
+            return results
+
+    def invalidate(self):
+        """Forget everything: categories are re-indexed when next searched"""
+        with self._lock:
+            self._postings.clear()
+            self._docs.clear()
+            self._versions.clear()
+            self._vocabulary.clear()
+
+    def stats(self):
+        """Get indexed item and word counts"""
+        with self._lock:
+            return {
+                "rebuilds": self.rebuilds,
+                "items": {cat: len(docs) for cat, docs in self._docs.items()},
+                "words": {lang: len(postings) for lang, postings in self._postings.items()},
+            }
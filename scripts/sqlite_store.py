@@ -0,0 +1,228 @@
+"""
+SQLite storage backend for category content.
+Same interface as ContentStore, but items live in one SQLite database
+(one row per item, ordered by insertion) and every save is a single
+transaction. The public site still reads data/<category>.json, which
+export() writes in the exact format the JSON backend produces.
+
+A category missing from the database is imported from its JSON data file
+the first time it is used.
+"""
+
+import json
+import sqlite3
+import threading
+
+from atomic_file import atomic_write
+from content_store import ContentStore, _Entry, _item_key
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS items (
+    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+    category TEXT NOT NULL,
+    item_key TEXT,
+    body TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS items_by_category ON items (category, seq);
+CREATE INDEX IF NOT EXISTS items_by_key ON items (category, item_key);
+CREATE TABLE IF NOT EXISTS categories (
+    category TEXT PRIMARY KEY,
+    version INTEGER NOT NULL
+);
+"""
+
+
+class _SqliteEntry(_Entry):
+    """Cached items plus the row id backing each one (None until inserted)"""
+
+    def __init__(self, path, signature, items, rows):
+        super().__init__(path, signature, items)
+        self.rows = rows
+        self.dirty = {}
+        self.deleted = set()
+
+    def append(self, item):
+        super().append(item)
+        self.rows.append(None)
+
+    def update(self, position, updates):
+        item = super().update(position, updates)
+        rowid = self.rows[position]
+        if rowid is not None:
+            self.dirty[rowid] = item
+        return item
+
+    def remove(self, position):
+        item = super().remove(position)
+        rowid = self.rows.pop(position)
+        if rowid is not None:
+            self.deleted.add(rowid)
+            self.dirty.pop(rowid, None)
+        return item
+
+
+class SqliteStore(ContentStore):
+    """Content store backed by a SQLite database"""
+
+    def __init__(self, resolve_path, database):
+        super().__init__(resolve_path)
+        self.database = str(database)
+        self._local = threading.local()
+        self._connect().executescript(SCHEMA)
+
+    def _connect(self):
+        """One connection per thread (sqlite3 connections aren't shareable)"""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.database)
+            self._local.conn = conn
+        return conn
+
+    def _signature(self, category, path):
+        """Category version, bumped by every committed save"""
+        row = self._connect().execute(
+            "SELECT version FROM categories WHERE category = ?", (category,)
+        ).fetchone()
+        return row[0] if row else None
+
+    @staticmethod
+    def _bump(conn, category):
+        conn.execute(
+            "INSERT INTO categories (category, version) VALUES (?, 1) "
+            "ON CONFLICT (category) DO UPDATE SET version = version + 1",
+            (category,),
+        )
+
+    def _insert(self, conn, category, items):
+        rows = []
+        for item in items:
+            cur = conn.execute(
+                "INSERT INTO items (category, item_key, body) VALUES (?, ?, ?)",
+                (category, _item_key(item), json.dumps(item, ensure_ascii=False)),
+            )
+            rows.append(cur.lastrowid)
+        return rows
+
+    def _load_entry(self, category, path, signature):
+        conn = self._connect()
+        if signature is None:
+            # First use of this category: import the existing JSON data file
+            items = self._read(path)
+            with conn:
+                conn.execute("DELETE FROM items WHERE category = ?", (category,))
+                rows = self._insert(conn, category, items)
+                self._bump(conn, category)
+            return _SqliteEntry(path, self._signature(category, path), items, rows)
+
+        cur = conn.execute(
+            "SELECT seq, body FROM items WHERE category = ? ORDER BY seq", (category,)
+        )
+        rows, items = [], []
+        for seq, body in cur:
+            rows.append(seq)
+            items.append(json.loads(body))
+        return _SqliteEntry(path, signature, items, rows)
+
+    def save(self, category, items=None):
+        """Commit a category in one transaction. Without items, only the rows
+        touched since the last save are written; with items, the whole
+        category is replaced."""
+        path = self._resolve_path(category)
+        if not path:
+            raise ValueError(f"Category '{category}' is invalid.")
+
+        conn = self._connect()
+        with self._lock:
+            entry = self._entries.get(category)
+            try:
+                if items is not None and not (entry and entry.items is items):
+                    with conn:
+                        conn.execute("DELETE FROM items WHERE category = ?", (category,))
+                        rows = self._insert(conn, category, items)
+                        self._bump(conn, category)
+                    self._entries[category] = _SqliteEntry(
+                        path, self._signature(category, path), items, rows)
+                    return
+
+                if entry is None:
+                    entry = self._entry(category)
+                with conn:
+                    self._write_changes(conn, category, entry)
+            except Exception:
+                # The in-memory list may hold unsaved edits; re-read next time
+                self._entries.pop(category, None)
+                raise
+            self._saved(category, path, entry)
+
+    def save_many(self, categories):
+        """Commit several categories in one transaction"""
+        categories = list(categories)
+        paths = {}
+        for category in categories:
+            paths[category] = self._resolve_path(category)
+            if not paths[category]:
+                raise ValueError(f"Category '{category}' is invalid.")
+
+        conn = self._connect()
+        with self._lock:
+            try:
+                entries = {category: self._entries.get(category) or self._entry(category)
+                           for category in categories}
+                with conn:
+                    for category, entry in entries.items():
+                        self._write_changes(conn, category, entry)
+            except Exception:
+                for category in categories:
+                    self._entries.pop(category, None)
+                raise
+            for category, entry in entries.items():
+                self._saved(category, paths[category], entry)
+
+    def _write_changes(self, conn, category, entry):
+        """Write the rows touched since the last save (in conn's transaction)"""
+        # Unsaved items are always a suffix: items are only appended
+        start = len(entry.rows)
+        while start > 0 and entry.rows[start - 1] is None:
+            start -= 1
+
+        conn.executemany(
+            "DELETE FROM items WHERE seq = ?",
+            [(rowid,) for rowid in entry.deleted],
+        )
+        conn.executemany(
+            "UPDATE items SET item_key = ?, body = ? WHERE seq = ?",
+            [(_item_key(item), json.dumps(item, ensure_ascii=False), rowid)
+             for rowid, item in entry.dirty.items()],
+        )
+        entry.rows[start:] = self._insert(conn, category, entry.items[start:])
+        self._bump(conn, category)
+
+    def _saved(self, category, path, entry):
+        entry.dirty = {}
+        entry.deleted = set()
+        entry.pending = []
+        entry.signature = self._signature(category, path)
+
+    def compact(self, category):
+        """Nothing to fold: every save is already a committed transaction"""
+        return 0
+
+    def export(self, category):
+        """Write data/<category>.json for the static site.
+        Returns the number of items exported."""
+        with self._lock:
+            entry = self._entry(category)
+            atomic_write(entry.path, json.dumps(entry.items, indent=4, ensure_ascii=False))
+            return len(entry.items)
+
+    def exists(self, category):
+        """Whether a category is known (imported, or has a JSON file to import)"""
+        path = self._resolve_path(category)
+        if not path:
+            return False
+        return self._signature(category, path) is not None or super().exists(category)
+
+    def stats(self):
+        stats = super().stats()
+        stats["database"] = self.database
+        return stats
@@ -0,0 +1,323 @@
+"""
+Static file serving for the local servers (cli.py and scripts/server.py).
+CachingHandler is a SimpleHTTPRequestHandler that:
+- keeps small files in memory, revalidated with one stat() per request
+  (mtime + size), so the pages, scripts and data JSON are not re-read
+  from disk on every hit;
+- sends ETag, Last-Modified and Cache-Control, and answers conditional
+  requests with 304;
+- serves a precompressed .br/.gz sibling (as written by `cli.py build`)
+  when the client accepts that encoding;
+- answers Range requests (single and multipart/byteranges, If-Range) with
+  206, so seeking in a track doesn't download it again;
+- sends bodies too big for the cache with socket.sendfile(), which the
+  kernel copies straight from the file (os.sendfile) where supported.
+make_server() runs it on a ThreadingHTTPServer, so one slow download doesn't
+hold up every other request.
+"""
+
+import email.utils
+import http.server
+import os
+import secrets
+import stat
+import sys
+import threading
+from collections import OrderedDict
+from http import HTTPStatus
+from io import BytesIO
+
+# Files up to this size are kept in memory
+MAX_CACHED_FILE = 256 * 1024
+# Total bytes of file bodies kept in memory (least recently used go first)
+MAX_CACHE_BYTES = 32 * 1024 * 1024
+
+# Precompressed siblings, preferred first
+ENCODINGS = (('br', '.br'), ('gzip', '.gz'))
+
+# More ranges than this in one request and the whole file is sent instead
+MAX_RANGES = 32
+
+# Content-hashed files (bundle shards) never change under the same name
+IMMUTABLE_PREFIXES = ('feed-',)
+
+
+def _signature(st):
+    return (st.st_mtime_ns, st.st_size)
+
+
+def _weak(etag):
+    """Entity tag without its weakness indicator"""
+    return etag[2:] if etag.startswith('W/') else etag
+
+
+def parse_ranges(header, size):
+    """Byte ranges of a Range header as inclusive (start, end) pairs
+    within size. Returns [] when none is satisfiable (416), and None when
+    the header can't be honoured (malformed, other unit, too many ranges):
+    the whole file is then sent."""
+    unit, _, spec = header.partition('=')
+    if unit.strip().lower() != 'bytes' or not spec.strip():
+        return None
+    specs = spec.split(',')
+    if len(specs) > MAX_RANGES:
+        return None
+    ranges = []
+    for part in specs:
+        first, dash, last = part.strip().partition('-')
+        if not dash or not (first or last):
+            return None
+        if (first and not first.isdigit()) or (last and not last.isdigit()):
+            return None
+        if not first:
+            # Suffix range: the last N bytes
+            length = int(last)
+            if length and size:
+                ranges.append((max(0, size - length), size - 1))
+            continue
+        start = int(first)
+        if last and int(last) < start:
+            return None
+        end = int(last) if last else size - 1
+        if start < size:
+            ranges.append((start, min(end, size - 1)))
+    return ranges
+
+
+class FileCache:
+    """Bodies of small files, keyed by path and validated by (mtime, size)"""
+
+    def __init__(self, max_file=MAX_CACHED_FILE, max_bytes=MAX_CACHE_BYTES):
+        self.max_file = max_file
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()  # path -> (signature, body)
+        self._size = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, path, st):
+        """Body of a file whose current stat is st, or None when it's too
+        big to cache (read it from disk instead)"""
+        if st.st_size > self.max_file:
+            return None
+        signature = _signature(st)
+        with self._lock:
+            cached = self._entries.get(path)
+            if cached and cached[0] == signature:
+                self._entries.move_to_end(path)
+                self.hits += 1
+                return cached[1]
+
+        with open(path, 'rb') as f:
+            body = f.read()
+        with self._lock:
+            self.misses += 1
+            old = self._entries.pop(path, None)
+            if old:
+                self._size -= len(old[1])
+            # Written while we read it: serve what we got, cache nothing
+            if len(body) == st.st_size:
+                self._entries[path] = (signature, body)
+                self._size += len(body)
+                while self._size > self.max_bytes:
+                    _, (_, evicted) = self._entries.popitem(last=False)
+                    self._size -= len(evicted)
+        return body
+
+    def stats(self):
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses, "files": len(self._entries), "bytes": self._size}
+
+
+class CachingHandler(http.server.SimpleHTTPRequestHandler):
+    """SimpleHTTPRequestHandler with in-memory caching, validators,
+    precompressed siblings and byte ranges"""
+
+    file_cache = FileCache()
+
+    def missing(self, path):
+        """Hook for paths that don't exist on disk: return another
+        filesystem path to serve instead, or None for a 404"""
+        return None
+
+    def cache_control(self, path):
+        if os.path.basename(path).startswith(IMMUTABLE_PREFIXES):
+            return 'public, max-age=31536000, immutable'
+        # Always revalidate: cheap with the ETag, and edits show up at once
+        return 'no-cache'
+
+    def _stat(self, path):
+        try:
+            return os.stat(path)
+        except OSError:
+            return None
+
+    def _precompressed(self, path, st):
+        """(encoding, path, stat) of an up-to-date sibling the client accepts"""
+        accepted = self.headers.get('Accept-Encoding', '')
+        accepted = {e.split(';')[0].strip() for e in accepted.split(',')}
+        for encoding, suffix in ENCODINGS:
+            if encoding in accepted:
+                sibling = self._stat(path + suffix)
+                if sibling and sibling.st_mtime_ns >= st.st_mtime_ns:
+                    return encoding, path + suffix, sibling
+        return None, path, st
+
+    def _not_modified(self, etag, st):
+        if_none_match = self.headers.get('If-None-Match')
+        if if_none_match:
+            if if_none_match.strip() == '*':
+                return True
+            # Weak comparison (RFC 7232): W/"x" matches "x"
+            tags = [t.strip() for t in if_none_match.split(',')]
+            return _weak(etag) in [_weak(t) for t in tags]
+        since = self.headers.get('If-Modified-Since')
+        if since:
+            try:
+                return int(st.st_mtime) <= email.utils.parsedate_to_datetime(since).timestamp()
+            except (TypeError, ValueError, IndexError, OverflowError):
+                return False
+        return False
+
+    def _if_range_matches(self, etag, st):
+        """Whether an If-Range header (if any) still matches the file"""
+        if_range = self.headers.get('If-Range')
+        if not if_range:
+            return True
+        if_range = if_range.strip()
+        if if_range.startswith(('"', 'W/')):
+            # Strong comparison: a weak tag never matches
+            return if_range == etag
+        try:
+            return int(st.st_mtime) == email.utils.parsedate_to_datetime(if_range).timestamp()
+        except (TypeError, ValueError, IndexError, OverflowError):
+            return False
+
+    def send_head(self):
+        # (prefix, start, length) pieces copyfile() sends, plus a trailer
+        self._parts = None
+        self._trailer = b''
+        path = self.translate_path(self.path)
+        st = self._stat(path)
+        if st is None:
+            path = self.missing(path)
+            st = self._stat(path) if path else None
+            if st is None:
+                self.send_error(HTTPStatus.NOT_FOUND, "File not found")
+                return None
+        if stat.S_ISDIR(st.st_mode):
+            index = os.path.join(path, 'index.html')
+            index_st = self._stat(index)
+            if not self.path.split('?', 1)[0].endswith('/') or index_st is None:
+                # Trailing-slash redirects and listings: the stock behaviour
+                return super().send_head()
+            path, st = index, index_st
+
+        ctype = self.guess_type(path)
+        if 'Range' in self.headers:
+            # Ranges are served from the file itself, never a compressed sibling
+            encoding, body_path, body_st = None, path, st
+        else:
+            encoding, body_path, body_st = self._precompressed(path, st)
+        etag = '"%x-%x%s"' % (body_st.st_mtime_ns, body_st.st_size, f'-{encoding}' if encoding else '')
+
+        if self._not_modified(etag, body_st):
+            self.send_response(HTTPStatus.NOT_MODIFIED)
+            self._send_validators(path, etag, body_st)
+            self.end_headers()
+            return None
+
+        try:
+            body = self.file_cache.get(body_path, body_st)
+            f = BytesIO(body) if body is not None else open(body_path, 'rb')
+        except OSError:
+            self.send_error(HTTPStatus.NOT_FOUND, "File not found")
+            return None
+
+        size = body_st.st_size if body is None else len(body)
+        ranges = None
+        if 'Range' in self.headers and self._if_range_matches(etag, body_st):
+            ranges = parse_ranges(self.headers['Range'], size)
+
+        if ranges == []:
+            f.close()
+            self.send_response(HTTPStatus.REQUESTED_RANGE_NOT_SATISFIABLE)
+            self.send_header('Content-Range', f'bytes */{size}')
+            self.send_header('Content-Length', '0')
+            self._send_validators(path, etag, body_st)
+            self.end_headers()
+            return None
+
+        if ranges is None:
+            self.send_response(HTTPStatus.OK)
+            self.send_header('Content-Type', ctype)
+            self._parts = [(b'', 0, size)]
+        elif len(ranges) == 1:
+            start, end = ranges[0]
+            self.send_response(HTTPStatus.PARTIAL_CONTENT)
+            self.send_header('Content-Type', ctype)
+            self.send_header('Content-Range', f'bytes {start}-{end}/{size}')
+            self._parts = [(b'', start, end - start + 1)]
+        else:
+            boundary = secrets.token_hex(16)
+            self.send_response(HTTPStatus.PARTIAL_CONTENT)
+            self.send_header('Content-Type', f'multipart/byteranges; boundary={boundary}')
+            self._parts = [
+                (f'\r\n--{boundary}\r\nContent-Type: {ctype}\r\n'
+                 f'Content-Range: bytes {start}-{end}/{size}\r\n\r\n'.encode('latin-1'),
+                 start, end - start + 1)
+                for start, end in ranges
+            ]
+            self._trailer = f'\r\n--{boundary}--\r\n'.encode('latin-1')
+
+        length = sum(len(prefix) + count for prefix, _, count in self._parts) + len(self._trailer)
+        self.send_header('Content-Length', str(length))
+        self.send_header('Accept-Ranges', 'bytes')
+        if encoding:
+            self.send_header('Content-Encoding', encoding)
+        self._send_validators(path, etag, body_st)
+        self.end_headers()
+        return f
+
+    def copyfile(self, source, outputfile):
+        if self._parts is None:
+            # Directory listings
+            return super().copyfile(source, outputfile)
+        for prefix, start, count in self._parts:
+            if prefix:
+                outputfile.write(prefix)
+            if isinstance(source, BytesIO):
+                # getvalue() shares the cached bytes; a getbuffer() view left
+                # alive by a dropped connection would make close() fail
+                outputfile.write(source.getvalue()[start:start + count])
+            else:
+                # Zero-copy from the page cache; falls back to send() by itself
+                outputfile.flush()
+                self.connection.sendfile(source, start, count)
+        if self._trailer:
+            outputfile.write(self._trailer)
+
+    def _send_validators(self, path, etag, st):
+        self.send_header('ETag', etag)
+        self.send_header('Last-Modified', self.date_time_string(st.st_mtime))
+        self.send_header('Cache-Control', self.cache_control(path))
+        self.send_header('Vary', 'Accept-Encoding')
+
+
+class StaticServer(http.server.ThreadingHTTPServer):
+    """One thread per connection"""
+
+    daemon_threads = True
+
+    def handle_error(self, request, client_address):
+        # Browsers drop connections all the time (navigation, cancelled
+        # media loads): not worth a traceback
+        if isinstance(sys.exc_info()[1], ConnectionError):
+            return
+        super().handle_error(request, client_address)
+
+
+def make_server(handler, port, host=''):
+    """Threaded HTTP server for handler"""
+    return StaticServer((host, port), handler)
@@ -0,0 +1,219 @@
+"""
+Cached translation catalog for lang/*.json.
+Each language file is parsed once per version (mtime + size) and the
+directory is only listed again when its own mtime changes. Alongside the
+catalogs, the set of reference-language (en) keys each language lacks is
+kept up to date as keys are written, so the missing-key report and the
+per-language coverage counts never rebuild key sets from scratch.
+Writes go through set_many(): a batch of keys costs one atomic rewrite
+per language file.
+"""
+
+import json
+import os
+import threading
+from pathlib import Path
+
+from atomic_file import atomic_write
+from request_metrics import phase
+
+
+def _stat(path):
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return (st.st_mtime_ns, st.st_size)
+
+
+class TranslationCatalog:
+    """lang code -> {key: text}, cached per file version"""
+
+    def __init__(self, lang_dir, reference='en'):
+        self.lang_dir = Path(lang_dir)
+        self.reference = reference
+        self._lock = threading.RLock()
+        self._listing = (None, [])  # (directory signature, language codes)
+        self._files = {}  # lang -> (file signature, translations)
+        self._missing = {}  # lang -> reference keys it lacks
+        self._reference_keys = None
+        self.hits = 0
+        self.misses = 0
+
+    def path_for(self, lang):
+        return self.lang_dir / f'{lang}.json'
+
+    def languages(self):
+        """Language codes with a file in lang/, sorted"""
+        signature = _stat(self.lang_dir)
+        with self._lock:
+            if signature is None:
+                return []
+            if self._listing[0] != signature:
+                codes = sorted(name[:-len('.json')] for name in os.listdir(self.lang_dir)
+                               if name.endswith('.json'))
+                self._listing = (signature, codes)
+            return list(self._listing[1])
+
+    def version(self):
+        """Opaque token that changes whenever any language file does"""
+        return tuple((lang, _stat(self.path_for(lang))) for lang in self.languages())
+
+    def _read(self, lang):
+        with phase('io'):
+            with open(self.path_for(lang), 'r', encoding='utf-8') as f:
+                content = f.read()
+        with phase('parse'):
+            return json.loads(content)
+
+    def get(self, lang):
+        """Translations of one language (shared dict, don't mutate), or
+        None when the language has no file"""
+        signature = _stat(self.path_for(lang))
+        with self._lock:
+            if signature is None:
+                self._forget(lang)
+                return None
+            cached = self._files.get(lang)
+            if cached and cached[0] == signature:
+                self.hits += 1
+                return cached[1]
+
+            self.misses += 1
+            translations = self._read(lang)
+            self._files[lang] = (signature, translations)
+            if lang == self.reference:
+                self._reference_keys = None
+                self._missing.clear()
+            else:
+                self._missing.pop(lang, None)
+            return translations
+
+    def _forget(self, lang):
+        self._files.pop(lang, None)
+        self._missing.pop(lang, None)
+        if lang == self.reference:
+            self._reference_keys = None
+            self._missing.clear()
+
+    def all(self):
+        """{lang: translations} for every language file"""
+        with self._lock:
+            catalogs = {lang: self.get(lang) for lang in self.languages()}
+            return {lang: t for lang, t in catalogs.items() if t is not None}
+
+    def _missing_keys(self, lang):
+        """Reference keys lang lacks (call with the catalogs current)"""
+        if lang not in self._missing:
+            if self._reference_keys is None:
+                self._reference_keys = set(self.get(self.reference) or {})
+            self._missing[lang] = self._reference_keys - set(self._files[lang][1])
+        return self._missing[lang]
+
+    def missing(self):
+        """{lang: sorted missing keys} for languages lacking reference keys"""
+        with self._lock:
+            self.get(self.reference)
+            result = {}
+            for lang in self.languages():
+                if lang == self.reference or self.get(lang) is None:
+                    continue
+                keys = self._missing_keys(lang)
+                if keys:
+                    result[lang] = sorted(keys)
+            return result
+
+    def coverage(self):
+        """{lang: {"total", "translated", "missing"}} counted against the
+        reference language's keys"""
+        with self._lock:
+            total = len(self.get(self.reference) or {})
+            result = {}
+            for lang in self.languages():
+                if self.get(lang) is None:
+                    continue
+                missing = 0 if lang == self.reference else len(self._missing_keys(lang))
+                result[lang] = {"total": total, "translated": total - missing, "missing": missing}
+            return result
+
+    def _write(self, lang, translations):
+        """Atomically replace a language file (temp file + rename)"""
+        path = self.path_for(lang)
+        with phase('serialize'):
+            text = json.dumps(translations, indent=4, ensure_ascii=False)
+        with phase('io'):
+            atomic_write(path, text)
+        self._files[lang] = (_stat(path), translations)
+
+    def set(self, lang, key, value):
+        """Write one key to a language file (see set_many()).
+        Raises FileNotFoundError for languages without a file."""
+        result = self.set_many([(lang, key, value)])[0]
+        if not result["success"]:
+            if lang not in self.languages():
+                raise FileNotFoundError(result["error"])
+            raise OSError(result["error"])
+
+    def set_many(self, updates):
+        """Apply (lang, key, value) updates with one atomic write per
+        language file, and update the missing-key sets. Batches are
+        serialized, so concurrent ones never drop each other's keys.
+        Returns {"lang", "key", "success"[, "error"]} per update, in order."""
+        with self._lock:
+            results = [{"lang": lang, "key": key, "success": True} for lang, key, _ in updates]
+            by_lang = {}
+            for i, (lang, key, value) in enumerate(updates):
+                by_lang.setdefault(lang, []).append((i, key, value))
+
+            # Current missing sets (computed before the changes) stay valid below
+            # Only languages with a file in lang/ (never paths built from input)
+            catalogs = {lang: self.get(lang) for lang in self.languages()}
+            if catalogs.get(self.reference) is not None and self._reference_keys is None:
+                self._reference_keys = set(catalogs[self.reference])
+            for lang, translations in catalogs.items():
+                if lang != self.reference and translations is not None:
+                    self._missing_keys(lang)
+
+            written = {}
+            for lang, entries in by_lang.items():
+                translations = catalogs.get(lang)
+                if translations is None:
+                    for i, _, _ in entries:
+                        results[i].update(success=False, error=f"Language file {lang}.json not found")
+                    continue
+                for _, key, value in entries:
+                    translations[key] = value
+                try:
+                    self._write(lang, translations)
+                except Exception as e:
+                    # The cached dict holds the unsaved keys: re-read next time
+                    self._forget(lang)
+                    for i, _, _ in entries:
+                        results[i].update(success=False, error=str(e))
+                    continue
+                written[lang] = [key for _, key, _ in entries]
+
+            if self._reference_keys is not None:
+                for key in written.get(self.reference, []):
+                    if key in self._reference_keys:
+                        continue
+                    self._reference_keys.add(key)
+                    for other, missing in self._missing.items():
+                        if key not in self._files[other][1]:
+                            missing.add(key)
+            for lang, keys in written.items():
+                if lang in self._missing:
+                    self._missing[lang].difference_update(keys)
+            return results
+
+    def invalidate(self):
+        """Drop every cached catalog"""
+        with self._lock:
+            self._listing = (None, [])
+            self._files.clear()
+            self._missing.clear()
+            self._reference_keys = None
+
+    def stats(self):
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses, "cached": sorted(self._files)}
@@ -0,0 +1,262 @@
+"""
+Background job queue for uploads.
+Upload endpoints can hand their work to a JobQueue and answer with a job
+id right away; worker threads run the job with retries and exponential
+backoff, and /api/jobs/<id> reports progress, result or error.
+
+Jobs and their uploaded files are persisted under the queue directory
+(jobs.json + one folder per job), so jobs that were still pending when
+the admin stopped are picked up again on the next start. Before running a
+job, a queue claims it with a file under claims/ that only one queue can
+create, so two queues on the same directory (two admin processes) never
+run the same job; claims of a process that is gone are taken over.
+"""
+
+import json
+import os
+import queue
+import shutil
+import threading
+import time
+import uuid
+from datetime import datetime
+from pathlib import Path
+
+from atomic_file import atomic_write
+
+FINISHED = ("done", "failed")
+
+# Owner tokens of the queues alive in this process
+_owners = set()
+
+
+def _owner_alive(owner):
+    """Whether the queue that wrote a claim ("<pid> <token>") still runs"""
+    pid, _, token = owner.partition(' ')
+    try:
+        pid = int(pid)
+    except ValueError:
+        return False
+    if pid == os.getpid():
+        # Also covers a previous run that had our pid (containers)
+        return token in _owners
+    if os.name == 'nt':
+        # os.kill(pid, 0) would send Ctrl+C there: assume it's alive
+        return True
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except OSError:
+        return True
+    return True
+
+
+class JobQueue:
+    """Persistent queue of upload jobs run by background worker threads"""
+
+    def __init__(self, directory, workers=2, retries=3, retry_delay=1.0, keep_finished=200):
+        self.directory = Path(directory)
+        self.path = self.directory / 'jobs.json'
+        self.workers = workers
+        self.retries = retries
+        self.retry_delay = retry_delay
+        self.keep_finished = keep_finished
+        self._handlers = {}
+        self._jobs = {}
+        self._queue = queue.Queue()
+        self._lock = threading.RLock()
+        self._threads = []
+        self.owner = f"{os.getpid()} {uuid.uuid4().hex}"
+        _owners.add(self.owner.split(' ', 1)[1])
+
+    def register(self, kind, handler):
+        """handler(job) runs one attempt and returns the job result. Partial
+        progress (state, progress, result) is saved with checkpoint() and
+        seen by the next attempt. ValueError means the job can't succeed
+        and is not retried."""
+        self._handlers[kind] = handler
+
+    def reserve(self):
+        """Create a job id and its private directory (for uploaded files)"""
+        job_id = uuid.uuid4().hex[:12]
+        job_dir = self.directory / job_id
+        job_dir.mkdir(parents=True)
+        return job_id, job_dir
+
+    def submit(self, kind, params, job_id=None):
+        """Queue a job and return its public view"""
+        if kind not in self._handlers:
+            raise ValueError(f"Unknown job kind '{kind}'")
+        now = datetime.now().isoformat(timespec='seconds')
+        job = {
+            "id": job_id or uuid.uuid4().hex[:12],
+            "kind": kind,
+            "status": "queued",
+            "attempts": 0,
+            "progress": {"done": 0, "total": params.get("total", 1)},
+            "created": now,
+            "updated": now,
+            "params": params,
+            "state": {},
+            "result": None,
+            "error": None,
+        }
+        with self._lock:
+            self._jobs[job["id"]] = job
+            self._persist()
+        self.start()
+        self._queue.put(job["id"])
+        return self.get(job["id"])
+
+    def get(self, job_id):
+        """Public view of a job (None if unknown)"""
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is None:
+                return None
+            return {k: v for k, v in job.items() if k not in ("params", "state")}
+
+    def list(self):
+        """Public views of all known jobs, newest first"""
+        with self._lock:
+            jobs = sorted(self._jobs.values(), key=lambda j: j["created"], reverse=True)
+            return [self.get(job["id"]) for job in jobs]
+
+    def start(self):
+        """Load persisted jobs and start the workers (idempotent)"""
+        with self._lock:
+            if self._threads:
+                return
+            for job in self._load():
+                if job["id"] in self._jobs:
+                    continue
+                self._jobs[job["id"]] = job
+                if job["status"] not in FINISHED:
+                    # Interrupted by a restart: run it again
+                    job["status"] = "queued"
+                    self._queue.put(job["id"])
+            for i in range(self.workers):
+                thread = threading.Thread(target=self._work, name=f"upload-job-{i}", daemon=True)
+                thread.start()
+                self._threads.append(thread)
+
+    def _load(self):
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                jobs = json.load(f)
+        except (OSError, json.JSONDecodeError):
+            return []
+        return jobs if isinstance(jobs, list) else []
+
+    def _persist(self):
+        """Atomically rewrite jobs.json (caller holds the lock)"""
+        finished = sorted(
+            (j for j in self._jobs.values() if j["status"] in FINISHED),
+            key=lambda j: j["updated"],
+        )
+        for job in finished[:max(0, len(finished) - self.keep_finished)]:
+            del self._jobs[job["id"]]
+            self._claim_path(job["id"]).unlink(missing_ok=True)
+
+        self.directory.mkdir(parents=True, exist_ok=True)
+        atomic_write(self.path, json.dumps(list(self._jobs.values()), indent=2, ensure_ascii=False, default=str))
+
+    def _update(self, job, **changes):
+        with self._lock:
+            job.update(changes)
+            job["updated"] = datetime.now().isoformat(timespec='seconds')
+            self._persist()
+
+    def checkpoint(self, job, **changes):
+        """Persist progress a handler made during an attempt"""
+        self._update(job, **changes)
+
+    def _claim_path(self, job_id):
+        return self.directory / 'claims' / job_id
+
+    def _claim(self, job_id):
+        """Take a job for this queue. False when another live queue has it."""
+        path = self._claim_path(job_id)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        for _ in range(2):
+            try:
+                fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o644)
+            except FileExistsError:
+                try:
+                    owner = path.read_text(encoding='utf-8')
+                except FileNotFoundError:
+                    continue
+                if owner == self.owner:
+                    return True
+                if not owner or _owner_alive(owner):
+                    # Empty: being written by its owner right now
+                    return False
+                # Left by a process that is gone: move it aside and claim
+                # again (whoever loses the O_EXCL race leaves it alone)
+                stale = path.with_name(f"{job_id}.{uuid.uuid4().hex}.stale")
+                try:
+                    os.rename(path, stale)
+                except FileNotFoundError:
+                    return False
+                if stale.read_text(encoding='utf-8') != owner:
+                    # Another queue took it over first: put its claim back
+                    try:
+                        os.link(stale, path)
+                    except OSError:
+                        pass
+                    stale.unlink()
+                    return False
+                stale.unlink()
+                continue
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                f.write(self.owner)
+            return True
+        return False
+
+    def _work(self):
+        while True:
+            job_id = self._queue.get()
+            with self._lock:
+                job = self._jobs.get(job_id)
+            if job is None or job["status"] in FINISHED:
+                continue
+            if not self._claim(job_id):
+                continue
+            self._attempt(job)
+
+    def _attempt(self, job):
+        self._update(job, status="running", attempts=job["attempts"] + 1)
+        try:
+            result = self._handlers[job["kind"]](job)
+        except Exception as e:
+            permanent = isinstance(e, ValueError)
+            if permanent or job["attempts"] > self.retries:
+                self._update(job, status="failed", error=str(e))
+                self._cleanup(job)
+                return
+            delay = self.retry_delay * (2 ** (job["attempts"] - 1))
+            print(f"Job {job['id']} failed ({e}), retrying in {delay:.1f}s...")
+            self._update(job, status="retrying", error=str(e))
+            timer = threading.Timer(delay, self._queue.put, [job["id"]])
+            timer.daemon = True
+            timer.start()
+            return
+
+        self._update(job, status="done", result=result, error=None,
+                     progress={"done": job["progress"]["total"], "total": job["progress"]["total"]})
+        self._cleanup(job)
+
+    def _cleanup(self, job):
+        """Uploaded files are only needed until the job is finished"""
+        shutil.rmtree(self.directory / job["id"], ignore_errors=True)
+
+    def wait(self, job_id, timeout=10.0):
+        """Block until a job is finished (used by tests and scripts)"""
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            job = self.get(job_id)
+            if job is None or job["status"] in FINISHED:
+                return job
+            time.sleep(0.01)
+        return self.get(job_id)
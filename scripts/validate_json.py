@@ -1,58 +1,336 @@
+"""
+Validates the JSON files under data/, config/ and lang/.
+By default every file is parsed, one after the other, and syntax errors
+are reported. Options for CI and large portfolios:
+
+    --schema     also check data files against the fields of their content
+                 type in config/categories.json (required fields present,
+                 text fields as text or {lang: text}) and the language codes
+                 of config/languages.json; lang files must be flat strings
+    --jobs N     validate across N processes (0: one per CPU)
+    --cache FILE skip files whose content hash hasn't changed since they
+                 last passed with the same config
+    --top N      list the N slowest files
+
+    python3 scripts/validate_json.py --schema --jobs 0 --cache .validate-cache.json
+"""
+
+import argparse
+import hashlib
 import json
 import os
 import sys
 import glob
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from config_loader import ConfigSnapshot
+
+# Bump when the checks change, so cached results are thrown away
+VALIDATOR_VERSION = 1
+
+# Problems listed per file before the rest are only counted
+MAX_PROBLEMS = 10
+
+# Fields any item may carry besides its content type's own, with their type
+SYSTEM_FIELDS = {
+    'id': str,
+    'date': str,
+    'created': str,
+    'category': str,
+    'gallery': list,
+    'galleryMetadata': dict,
+}
+# Fields the admin always writes as text or {lang: text}
+TEXT_FIELDS = ('title', 'description', 'medium', 'genre')
+TEXT_TYPES = ('text', 'textarea')
+
+
+def _empty(value):
+    if isinstance(value, dict):
+        return not any(value.values())
+    return value is None or value == '' or value == []
+
+
+def compile_validator(content_type, language_codes):
+    """Checker for the items of one content type: item -> (errors, warnings).
+    Field lists and language sets are worked out once, here."""
+    fields = content_type.get('fields', {})
+    required = tuple(fields.get('required', []))
+    text_fields = set(TEXT_FIELDS) | set(required)
+    text_fields.update(f['name'] for f in fields.get('optional', [])
+                       if isinstance(f, dict) and f.get('type', 'text') in TEXT_TYPES)
+    text_fields = tuple(sorted(text_fields - set(SYSTEM_FIELDS)))
+    languages = frozenset(language_codes)
+
+    def validate(item):
+        if not isinstance(item, dict):
+            return ["is not an object"], []
+        errors, warnings = [], []
+        for field in required:
+            if _empty(item.get(field)):
+                errors.append(f"missing required field '{field}'")
+        for field in text_fields:
+            value = item.get(field)
+            if value is None or isinstance(value, str):
+                continue
+            if not isinstance(value, dict):
+                errors.append(f"'{field}' must be text or a {{lang: text}} object")
+                continue
+            not_text = sorted(code for code, text in value.items() if not isinstance(text, (str, type(None))))
+            if not_text:
+                errors.append(f"'{field}' has non-text values for {', '.join(not_text)}")
+            if languages:
+                unknown = sorted(set(value) - languages)
+                if unknown:
+                    warnings.append(f"'{field}' has unsupported languages {', '.join(unknown)}")
+                missing = sorted(languages - set(value))
+                if missing:
+                    warnings.append(f"'{field}' lacks {', '.join(missing)}")
+        for field, kind in SYSTEM_FIELDS.items():
+            if field in item and item[field] is not None and not isinstance(item[field], kind):
+                errors.append(f"'{field}' must be a {kind.__name__}")
+        return errors, warnings
+
+    return validate
+
+
+def load_schema(root='.'):
+    """What --schema checks, read from config/ under root: data file ->
+    content type, plus the language codes. None when the config can't be
+    read (its syntax errors are reported with the other files)."""
+    root = Path(root).resolve()
+    try:
+        with open(root / 'config' / 'categories.json', 'r', encoding='utf-8') as f:
+            categories = json.load(f)
+        with open(root / 'config' / 'languages.json', 'r', encoding='utf-8') as f:
+            languages = json.load(f)
+    except (OSError, ValueError):
+        return None
+    snapshot = ConfigSnapshot(root / 'data', languages=languages, categories=categories)
+    return {
+        "types": {ct['id']: ct for ct in snapshot.content_types},
+        "files": {os.path.realpath(path): category for category, path in snapshot.category_map.items()},
+        "languages": snapshot.language_codes,
+        "lang_dir": os.path.realpath(root / 'lang'),
+    }
+
+
+def schema_key(schema):
+    """Identifies the checks a cached result was made with"""
+    raw = json.dumps([VALIDATOR_VERSION, schema], sort_keys=True)
+    return hashlib.sha256(raw.encode('utf-8')).hexdigest()
+
+
+# Per process: the schema and its compiled validators (see _init_worker)
+_schema = None
+_validators = {}
+
+
+def _init_worker(schema):
+    global _schema, _validators
+    _schema = schema
+    _validators = {}
+    if schema:
+        _validators = {cid: compile_validator(ct, schema['languages']) for cid, ct in schema['types'].items()}
+
+
+def _check_data(items, validate):
+    errors, warnings = [], []
+    if not isinstance(items, list):
+        return ["a data file must hold a list of items"], []
+    seen = set()
+    for index, item in enumerate(items):
+        label = f"item {index}"
+        if isinstance(item, dict) and item.get('id') is not None:
+            label += f" ({item['id']})"
+            if item['id'] in seen:
+                errors.append(f"{label}: duplicate id")
+            seen.add(item['id'])
+        item_errors, item_warnings = validate(item)
+        errors.extend(f"{label}: {e}" for e in item_errors)
+        warnings.extend(f"{label}: {w}" for w in item_warnings)
+    return errors, warnings
+
+
+def _check_lang(path, translations, language_codes):
+    errors, warnings = [], []
+    if not isinstance(translations, dict):
+        return ["a lang file must hold a {key: text} object"], []
+    not_text = [key for key, text in translations.items() if not isinstance(text, str)]
+    if not_text:
+        errors.append(f"non-text values for {', '.join(not_text[:MAX_PROBLEMS])}"
+                      + (f" and {len(not_text) - MAX_PROBLEMS} more" if len(not_text) > MAX_PROBLEMS else ''))
+    code = os.path.splitext(os.path.basename(path))[0]
+    if language_codes and code not in language_codes:
+        warnings.append(f"'{code}' is not in config/languages.json")
+    return errors, warnings
+
+
+def check_file(task):
+    """Validate one file. task is (path, digest it had when it last
+    passed, or None). Returns {"path", "digest", "seconds", "cached",
+    "errors", "warnings"}."""
+    path, known_digest = task
+    start = time.perf_counter()
+    result = {"path": path, "digest": None, "cached": False, "errors": [], "warnings": []}
+    try:
+        with open(path, 'rb') as f:
+            raw = f.read()
+        result["digest"] = hashlib.sha256(raw).hexdigest()
+        if known_digest and known_digest == result["digest"]:
+            result["cached"] = True
+        else:
+            data = json.loads(raw.decode('utf-8'))
+            if _schema:
+                absolute = os.path.realpath(path)
+                category = _schema['files'].get(absolute)
+                if category is not None:
+                    result["errors"], result["warnings"] = _check_data(data, _validators[category])
+                elif os.path.dirname(absolute) == _schema['lang_dir']:
+                    result["errors"], result["warnings"] = _check_lang(path, data, _schema['languages'])
+    except json.JSONDecodeError as e:
+        result["syntax"] = f"Line {e.lineno}, Column {e.colno}: {e.msg}"
+    except Exception as e:
+        result["read_error"] = str(e)
+    result["seconds"] = time.perf_counter() - start
+    return result
+
+
+def find_files(directories):
+    files = []
+    for directory in directories:
+        if not os.path.isdir(directory):
+            print(f"⚠️ Directory not found: {directory}")
+            continue
+        # Use glob to find all json files recursively
+        files.extend(glob.glob(os.path.join(directory, "**/*.json"), recursive=True))
+    return files
+
+
+def load_cache(cache_path, key):
+    """{path: {"digest", "warnings"}} of files that passed with these checks"""
+    try:
+        with open(cache_path, 'r', encoding='utf-8') as f:
+            cache = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    return cache.get("files", {}) if cache.get("key") == key else {}
+
 
-def validate_json_files(directories):
+def save_cache(cache_path, key, files):
+    temp_path = f"{cache_path}.tmp"
+    with open(temp_path, 'w', encoding='utf-8') as f:
+        json.dump({"key": key, "files": files}, f, indent=1, sort_keys=True)
+    os.replace(temp_path, cache_path)
+
+
+def validate_files(files, schema=None, jobs=1, cache=None):
+    """check_file() results for files, in order. cache maps paths to the
+    digest they passed with; those files are only hashed."""
+    cache = cache or {}
+    tasks = [(path, cache.get(path, {}).get("digest")) for path in files]
+    if jobs == 0:
+        jobs = os.cpu_count() or 1
+    if jobs <= 1 or len(tasks) <= 1:
+        _init_worker(schema)
+        return [check_file(task) for task in tasks]
+    with ProcessPoolExecutor(max_workers=jobs, initializer=_init_worker, initargs=(schema,)) as pool:
+        return list(pool.map(check_file, tasks, chunksize=max(1, len(tasks) // (jobs * 4))))
+
+
+def _print_problems(problems):
+    for problem in problems[:MAX_PROBLEMS]:
+        print(f"   {problem}")
+    if len(problems) > MAX_PROBLEMS:
+        print(f"   ... and {len(problems) - MAX_PROBLEMS} more")
+
+
+def validate_json_files(directories, schema=False, jobs=1, cache_path=None, strict=False, top=0):
     """
     Recursively finds and validates all .json files in the given directories.
     Returns True if all files are valid, False otherwise.
     """
+    print("🔍 Starting JSON validation...")
+
+    spec = load_schema() if schema else None
+    if schema and spec is None:
+        print("⚠️ config/categories.json or config/languages.json unreadable: schema checks skipped")
+    key = schema_key(spec)
+    cache = load_cache(cache_path, key) if cache_path else {}
+
+    files = find_files(directories)
+    results = validate_files(files, spec, jobs, cache)
+
     has_errors = False
-    total_files = 0
     valid_files = 0
+    skipped = 0
+    passed = {}
+    for result in results:
+        path = result["path"]
+        if "syntax" in result:
+            print(f"❌ Syntax Error in {path}:")
+            print(f"   {result['syntax']}")
+            has_errors = True
+            continue
+        if "read_error" in result:
+            print(f"❌ Error reading {path}: {result['read_error']}")
+            has_errors = True
+            continue
 
-    print("🔍 Starting JSON validation...")
-
-    for directory in directories:
-        if not os.path.isdir(directory):
-            print(f"⚠️ Directory not found: {directory}")
+        if result["cached"]:
+            skipped += 1
+            result["warnings"] = cache[path].get("warnings", [])
+        if result["errors"] or (strict and result["warnings"]):
+            print(f"❌ Schema errors in {path}:")
+            _print_problems(result["errors"] + (result["warnings"] if strict else []))
+            has_errors = True
             continue
+        if result["warnings"]:
+            print(f"⚠️ Warnings in {path}:")
+            _print_problems(result["warnings"])
+        valid_files += 1
+        passed[path] = {"digest": result["digest"], "warnings": result["warnings"]}
 
-        # Use glob to find all json files recursively
-        files = glob.glob(os.path.join(directory, "**/*.json"), recursive=True)
-        
-        for file_path in files:
-            total_files += 1
-            try:
-                with open(file_path, 'r', encoding='utf-8') as f:
-                    json.load(f)
-                valid_files += 1
-                # print(f"✅ Valid: {file_path}") # Optional: Uncomment for verbose output
-            except json.JSONDecodeError as e:
-                print(f"❌ Syntax Error in {file_path}:")
-                print(f"   Line {e.lineno}, Column {e.colno}: {e.msg}")
-                has_errors = True
-            except Exception as e:
-                print(f"❌ Error reading {file_path}: {e}")
-                has_errors = True
+    if cache_path:
+        save_cache(cache_path, key, passed)
 
+    if top:
+        print("\n⏱️ Slowest files")
+        for result in sorted(results, key=lambda r: r["seconds"], reverse=True)[:top]:
+            print(f"   {result['seconds'] * 1000:8.1f} ms  {result['path']}{' (unchanged)' if result['cached'] else ''}")
+
+    total_files = len(results)
     print("\n📊 Validation Summary")
     print(f"   Total Files: {total_files}")
     print(f"   Valid Files: {valid_files}")
     print(f"   Invalid Files: {total_files - valid_files}")
+    if cache_path:
+        print(f"   Unchanged (cached): {skipped}")
 
     return not has_errors
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Validate the JSON files under data/, config/ and lang/")
+    parser.add_argument("--schema", action="store_true",
+                        help="Check data and lang files against config/categories.json and languages.json")
+    parser.add_argument("--jobs", type=int, default=1, help="Worker processes (0: one per CPU, default: 1)")
+    parser.add_argument("--cache", metavar="FILE", help="Content-hash cache: skip files unchanged since they passed")
+    parser.add_argument("--strict", action="store_true", help="Treat schema warnings as errors")
+    parser.add_argument("--top", type=int, default=0, help="List the N slowest files")
+    args = parser.parse_args()
+
     # Directories to validate
     dirs_to_check = ["data", "config", "lang"]
-    
+
     # Adjust paths if running from root or scripts dir
     if os.path.basename(os.getcwd()) == "scripts":
         os.chdir("..")
 
-    success = validate_json_files(dirs_to_check)
+    success = validate_json_files(dirs_to_check, schema=args.schema, jobs=args.jobs,
+                                  cache_path=args.cache, strict=args.strict, top=args.top)
 
     if success:
         print("\n✨ All JSON files are valid!")
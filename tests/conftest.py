@@ -23,3 +23,42 @@ def mock_fs(mocker):
     mocker.patch('os.makedirs')
     mocker.patch('os.path.exists', return_value=True)
     return mocker
+
+@pytest.fixture(autouse=True)
+def reset_content_store():
+    """Tests mock open(), so never let cached category data leak between them"""
+    import manager
+    import admin_api
+    manager.store.invalidate()
+    manager.search.invalidate()
+    admin_api.response_cache.clear()
+    yield
+    manager.store.invalidate()
+    manager.search.invalidate()
+    admin_api.response_cache.clear()
+
+@pytest.fixture(autouse=True)
+def isolated_media_index(tmp_path, monkeypatch):
+    """Keep upload dedup records out of the real content root"""
+    import manager
+    from media_index import MediaIndex
+    monkeypatch.setattr(manager, 'media_index', MediaIndex(tmp_path / 'media-index.json'))
+
+@pytest.fixture(autouse=True)
+def isolated_bundles(tmp_path, monkeypatch):
+    """Saves invalidate (and rebuild) bundles here, not in the real data dir"""
+    import manager
+    monkeypatch.setattr(manager, 'BUNDLES_DIR', tmp_path / 'site-bundles')
+    monkeypatch.setattr(manager, '_rebuild_bundles', False)
+    return tmp_path / 'site-bundles'
+
+@pytest.fixture
+def job_queue(tmp_path, monkeypatch):
+    """Fresh upload job queue in tmp_path, with the admin's handlers and no retry delay"""
+    import admin_api
+    from upload_jobs import JobQueue
+    queue = JobQueue(tmp_path / 'jobs', workers=1, retries=2, retry_delay=0)
+    for kind, handler in admin_api.jobs._handlers.items():
+        queue.register(kind, handler)
+    monkeypatch.setattr(admin_api, 'jobs', queue)
+    return queue
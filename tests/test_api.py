@@ -1,5 +1,6 @@
 import pytest
 from unittest.mock import MagicMock
+import io
 import json
 
 def test_get_config(client):
@@ -47,3 +48,305 @@ def test_upload_file_success(client, mocker):
     assert response.get_json()['success'] is True
     assert response.get_json()['data']['id'] == 'new_id'
     mock_upload.assert_called_once()
+    # The file is streamed from the request, not copied to a temp path
+    assert hasattr(mock_upload.call_args[0][0], 'read')
+    assert mock_upload.call_args[1]['filename'] == 'test_image.jpg'
+
+@pytest.fixture
+def painting_file(tmp_path, mocker):
+    """A real painting.json in a temp dir, wired into manager.JSON_MAP"""
+    path = tmp_path / 'painting.json'
+    path.write_text(json.dumps([
+        {"id": "p1", "url": "http://a.jpg", "gallery": ["http://a2.jpg"]},
+        {"id": "p2", "url": "http://b.jpg"},
+        {"id": "p3", "url": "http://c.jpg"},
+    ]))
+    mocker.patch.dict('manager.JSON_MAP', {'painting': str(path)})
+    mocker.patch('manager.update_site_timestamp')
+    return path
+
+def test_move_to_pile(client, painting_file):
+    """Source image and gallery move into the target, source is removed."""
+    response = client.post('/api/content/move-to-pile', json={
+        'category': 'painting', 'sourceId': 'p1', 'targetId': 'p3'})
+    assert response.status_code == 200
+    assert response.get_json()['targetGalleryCount'] == 2
+
+    items = json.loads(painting_file.read_text())
+    assert [i['id'] for i in items] == ['p2', 'p3']
+    assert items[1]['gallery'] == ['http://a.jpg', 'http://a2.jpg']
+
+    response = client.get('/api/content/item?category=painting&id=p3')
+    assert response.get_json()['item']['gallery'] == ['http://a.jpg', 'http://a2.jpg']
+
+def test_duplicate_id_conflict(client, painting_file):
+    """Lookups of an id shared by several items return 409."""
+    items = json.loads(painting_file.read_text())
+    items.append({"id": "p2", "url": "http://dup.jpg"})
+    painting_file.write_text(json.dumps(items))
+
+    response = client.post('/api/content/update', json={
+        'category': 'painting', 'id': 'p2', 'updates': {'url': 'http://x.jpg'}})
+    assert response.status_code == 409
+    assert response.get_json()['duplicateId'] == 'p2'
+
+def test_upload_bulk_preserves_order(client, mocker):
+    """Bulk upload reports per-file results in input order."""
+    upload_many = mocker.patch('manager.upload_many', return_value=[
+        {'id': 'painting_1'}, RuntimeError('boom')])
+
+    response = client.post('/api/upload-bulk', data={
+        'file_0': (io.BytesIO(b'a'), 'same.jpg'), 'category_0': 'painting',
+        'file_1': (io.BytesIO(b'b'), 'same.jpg'), 'category_1': 'painting',
+        'file_2': (io.BytesIO(b'c'), 'other.jpg'),
+    }, content_type='multipart/form-data')
+
+    body = response.get_json()
+    assert body['uploaded'] == 1
+    assert body['results'][0]['data']['id'] == 'painting_1'
+    assert [e['error'] for e in body['errors']] == ['boom', 'Missing category']
+    specs = upload_many.call_args[0][0]
+    assert len(specs) == 2
+    assert specs[0]['file_path'] != specs[1]['file_path']
+
+def test_upload_async_returns_job(client, mocker, job_queue):
+    """?async=1 answers 202 with a job id; the job runs upload_and_save."""
+    mock_upload = mocker.patch('manager.upload_and_save', return_value={'id': 'new_id'})
+
+    response = client.post('/api/upload?async=1', data={
+        'file': (io.BytesIO(b'jpeg bytes'), 'test_image.jpg'),
+        'title': 'Test Title',
+        'category': 'painting',
+    }, content_type='multipart/form-data')
+
+    assert response.status_code == 202
+    job_id = response.get_json()['jobId']
+    job_queue.wait(job_id)
+
+    status = client.get(f'/api/jobs/{job_id}').get_json()
+    assert status['status'] == 'done'
+    assert status['result'] == {'id': 'new_id'}
+    path, title, category = mock_upload.call_args[0]
+    assert (title, category) == ('Test Title', 'painting')
+    assert mock_upload.call_args[1]['filename'] == 'test_image.jpg'
+
+def test_bulk_async_retries_only_failures(client, mocker, job_queue):
+    """A retried bulk job re-sends only the uploads that failed."""
+    sent = []
+    def upload_many(specs):
+        sent.append([s['filename'] for s in specs])
+        if len(sent) == 1:
+            return [{'id': 'a'}, RuntimeError('timeout')]
+        return [{'id': 'b'}]
+    mocker.patch('manager.upload_many', side_effect=upload_many)
+
+    response = client.post('/api/upload-bulk?async=1', data={
+        'file_0': (io.BytesIO(b'one'), 'a.jpg'), 'category_0': 'painting',
+        'file_1': (io.BytesIO(b'two'), 'b.jpg'), 'category_1': 'painting',
+        'file_2': (io.BytesIO(b'three'), 'c.jpg'),
+    }, content_type='multipart/form-data')
+    assert response.status_code == 202
+
+    job = job_queue.wait(response.get_json()['jobId'])
+    assert sent == [['a.jpg', 'b.jpg'], ['b.jpg']]
+    assert job['status'] == 'done'
+    assert job['attempts'] == 2
+    assert [r['file'] for r in job['result']['results']] == ['a.jpg', 'b.jpg']
+    assert job['result']['errors'] == [{'file': 'c.jpg', 'error': 'Missing category'}]
+
+def test_get_unknown_job(client, job_queue):
+    """Unknown job ids are 404."""
+    response = client.get('/api/jobs/nope')
+    assert response.status_code == 404
+
+def test_config_conditional_get(client):
+    """A repeated poll with the ETag or date gets 304 and no body."""
+    first = client.get('/api/config')
+    etag = first.headers['ETag']
+    assert first.headers['Last-Modified']
+
+    again = client.get('/api/config', headers={'If-None-Match': etag})
+    assert again.status_code == 304
+    assert again.data == b''
+    assert again.headers['ETag'] == etag
+
+    since = client.get('/api/config', headers={'If-Modified-Since': first.headers['Last-Modified']})
+    assert since.status_code == 304
+
+def test_config_cached_by_snapshot_version(client, monkeypatch):
+    """The cached config body and its ETag follow the snapshot that was
+    served, not the files' current stat."""
+    from config_loader import config, ConfigSnapshot
+    current = ConfigSnapshot(config.data_dir, app={"site": "old"}, signature=((1, 1),))
+    monkeypatch.setattr(config, 'snapshot', lambda: current)
+
+    first = client.get('/api/config')
+    assert first.get_json()['app'] == {"site": "old"}
+
+    current = ConfigSnapshot(config.data_dir, app={"site": "new"}, signature=((2, 1),))
+    second = client.get('/api/config', headers={'If-None-Match': first.headers['ETag']})
+    assert second.status_code == 200
+    assert second.get_json()['app'] == {"site": "new"}
+
+def test_config_edit_reaches_content_routes(client, tmp_path, monkeypatch):
+    """A content type added on disk shows up in /api/content without any
+    request to /api/config."""
+    import shutil
+    from config_loader import config
+    config_dir = tmp_path / 'config'
+    shutil.copytree(config.config_dir, config_dir)
+    monkeypatch.setattr(config, 'config_dir', config_dir)
+    monkeypatch.setattr(config, 'watch_interval', 0)
+    try:
+        assert 'zines' not in client.get('/api/content').get_json()
+
+        path = config_dir / 'categories.json'
+        categories = json.loads(path.read_text(encoding='utf-8'))
+        categories['contentTypes'].append({"id": "zines", "name": "Zines", "mediaType": "image",
+                                           "dataFile": "data/zines.json"})
+        path.write_text(json.dumps(categories), encoding='utf-8')
+
+        assert client.get('/api/content').get_json()['zines'] == []
+    finally:
+        monkeypatch.undo()
+        config.load_all()
+
+def test_content_etag_follows_data(client, painting_file):
+    """Saving a category changes the ETag and the served content."""
+    first = client.get('/api/content')
+    assert [i['id'] for i in first.get_json()['painting']] == ['p1', 'p2', 'p3']
+
+    client.post('/api/content/delete', json={'category': 'painting', 'id': 'p2'})
+
+    second = client.get('/api/content', headers={'If-None-Match': first.headers['ETag']})
+    assert second.status_code == 200
+    assert second.headers['ETag'] != first.headers['ETag']
+    assert [i['id'] for i in second.get_json()['painting']] == ['p1', 'p3']
+
+def test_content_gzip_cached(client, painting_file):
+    """Large bodies are gzip encoded, once per version."""
+    import gzip
+    import admin_api
+    painting_file.write_text(json.dumps([{"id": f"p{i}", "title": "x" * 50} for i in range(100)]))
+
+    misses = admin_api.response_cache.stats()['misses']
+    first = client.get('/api/content', headers={'Accept-Encoding': 'gzip'})
+    second = client.get('/api/content', headers={'Accept-Encoding': 'gzip'})
+
+    assert first.headers['Content-Encoding'] == 'gzip'
+    assert 'Accept-Encoding' in first.headers['Vary']
+    assert len(json.loads(gzip.decompress(first.data))['painting']) == 100
+    assert second.data == first.data
+    assert admin_api.response_cache.stats()['misses'] == misses + 1
+
+    plain = client.get('/api/content', headers={'If-None-Match': first.headers['ETag']})
+    assert plain.status_code == 304
+
+def test_content_page(client, painting_file):
+    """?category= returns one page, a cursor to the next and projected fields."""
+    first = client.get('/api/content?category=painting&limit=2&fields=id,url').get_json()
+    assert first['items'] == [{'id': 'p1', 'url': 'http://a.jpg'}, {'id': 'p2', 'url': 'http://b.jpg'}]
+    assert first['total'] == 3
+
+    rest = client.get(f"/api/content?category=painting&limit=2&cursor={first['nextCursor']}").get_json()
+    assert [i['id'] for i in rest['items']] == ['p3']
+    assert rest['nextCursor'] is None
+
+def test_content_page_errors(client, painting_file):
+    assert client.get('/api/content?limit=2').status_code == 400
+    assert client.get('/api/content?category=nope').status_code == 400
+    assert client.get('/api/content?category=painting&sort=title').status_code == 400
+    cursor = client.get('/api/content?category=painting&limit=1').get_json()['nextCursor']
+    assert client.get(f'/api/content?category=painting&sort=date&cursor={cursor}').status_code == 400
+
+def test_search_follows_mutations(client, painting_file):
+    """/api/search sees updates and deletes made through the API."""
+    client.post('/api/content/update', json={
+        'category': 'painting', 'id': 'p2', 'updates': {'title': {'en': 'Blue Études', 'fr': 'Études bleues'}}})
+
+    body = client.get('/api/search?q=etu&lang=fr').get_json()
+    assert body['total'] == 1
+    assert body['results'][0]['category'] == 'painting'
+    assert body['results'][0]['item']['id'] == 'p2'
+
+    client.post('/api/content/delete', json={'category': 'painting', 'id': 'p2'})
+    assert client.get('/api/search?q=blue').get_json()['total'] == 0
+    assert client.get('/api/search').status_code == 400
+
+def test_translation_coverage(client, tmp_path, monkeypatch):
+    """Coverage counts follow keys written through the API."""
+    import admin_api
+    from translation_catalog import TranslationCatalog
+    (tmp_path / 'en.json').write_text(json.dumps({"a": "A", "b": "B"}))
+    (tmp_path / 'fr.json').write_text(json.dumps({"a": "A fr"}))
+    monkeypatch.setattr(admin_api, 'translations', TranslationCatalog(tmp_path))
+
+    assert client.get('/api/translations/missing').get_json() == {"fr": ["b"]}
+    client.post('/api/translations/update', json={'lang': 'fr', 'key': 'b', 'value': 'B fr'})
+    coverage = client.get('/api/translations/coverage').get_json()
+    assert coverage['fr'] == {"total": 2, "translated": 2, "missing": 0}
+    assert client.get('/api/translations').get_json()['fr']['b'] == 'B fr'
+
+def test_translation_batch(client, tmp_path, monkeypatch):
+    """Batch updates report per-key results, invalid entries included."""
+    import admin_api
+    from translation_catalog import TranslationCatalog
+    (tmp_path / 'en.json').write_text(json.dumps({"a": "A", "b": "B"}))
+    (tmp_path / 'fr.json').write_text(json.dumps({}))
+    monkeypatch.setattr(admin_api, 'translations', TranslationCatalog(tmp_path))
+
+    body = client.post('/api/translations/batch', json={'updates': [
+        {'lang': 'fr', 'key': 'a', 'value': 'A fr'},
+        {'lang': 'fr', 'key': 'b'},
+        {'lang': 'fr', 'key': 'b', 'value': 'B fr'},
+    ]}).get_json()
+    assert body['updated'] == 2
+    assert [r['success'] for r in body['results']] == [True, False, True]
+    assert json.loads((tmp_path / 'fr.json').read_text()) == {"a": "A fr", "b": "B fr"}
+    assert client.post('/api/translations/batch', json={}).status_code == 400
+
+def test_content_batch(client, painting_file, mocker):
+    """A batch runs in order and writes the category once."""
+    import manager
+    save = mocker.spy(manager.store, 'save')
+    body = client.post('/api/content/batch', json={'operations': [
+        {'op': 'update', 'category': 'painting', 'id': 'p2', 'updates': {'medium': {'en': 'Ink'}}},
+        {'op': 'move-to-pile', 'category': 'painting', 'sourceId': 'p1', 'targetId': 'p3'},
+        {'op': 'delete', 'category': 'painting', 'id': 'p2'},
+    ]}).get_json()
+
+    assert body['success'] is True
+    assert body['results'][1]['targetGalleryCount'] == 2
+    assert save.call_count == 1
+    items = json.loads(painting_file.read_text())
+    assert [i['id'] for i in items] == ['p3']
+
+def test_content_batch_all_or_nothing(client, painting_file):
+    """A failing operation rolls back the ones before it."""
+    before = painting_file.read_text()
+    response = client.post('/api/content/batch', json={'operations': [
+        {'op': 'delete', 'category': 'painting', 'id': 'p1'},
+        {'op': 'delete', 'category': 'painting', 'id': 'missing'},
+    ]})
+
+    assert response.status_code == 404
+    body = response.get_json()
+    assert body['failedAt'] == 1
+    assert [r['success'] for r in body['results']] == [True, False]
+    assert painting_file.read_text() == before
+    ids = [i['id'] for i in client.get('/api/content').get_json()['painting']]
+    assert ids == ['p1', 'p2', 'p3']
+
+def test_server_timing_and_metrics(client, painting_file):
+    """Requests report their phases and show up in /api/metrics."""
+    response = client.post('/api/content/update', json={
+        'category': 'painting', 'id': 'p2', 'updates': {'url': 'http://new.jpg'}})
+    timing = response.headers['Server-Timing']
+    for name in ('parse', 'io', 'serialize', 'total'):
+        assert f'{name};dur=' in timing
+
+    metrics = client.get('/api/metrics')
+    assert metrics.mimetype == 'text/plain'
+    text = metrics.get_data(as_text=True)
+    assert 'admin_requests_total{route="/api/content/update",method="POST",status="200"}' in text
+    assert 'admin_phase_duration_seconds_count{phase="io"}' in text
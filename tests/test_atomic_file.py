@@ -0,0 +1,30 @@
+import os
+
+import pytest
+
+from atomic_file import atomic_write
+
+
+def test_new_file_is_world_readable(tmp_path):
+    path = tmp_path / 'data.json'
+    atomic_write(path, '[]')
+    assert path.read_text() == '[]'
+    assert os.stat(path).st_mode & 0o777 == 0o644
+
+
+def test_keeps_existing_mode(tmp_path):
+    path = tmp_path / 'data.json'
+    path.write_text('old')
+    os.chmod(path, 0o640)
+    atomic_write(path, 'new')
+    assert path.read_text() == 'new'
+    assert os.stat(path).st_mode & 0o777 == 0o640
+
+
+def test_failed_write_leaves_file_and_no_temp(tmp_path):
+    path = tmp_path / 'data.json'
+    path.write_text('old')
+    with pytest.raises(UnicodeEncodeError):
+        atomic_write(path, '\udc80')
+    assert path.read_text() == 'old'
+    assert os.listdir(tmp_path) == ['data.json']
@@ -0,0 +1,40 @@
+import json
+
+import benchmark
+
+
+def test_generate_dataset(tmp_path):
+    info = benchmark.generate_dataset(tmp_path, 30, keys=10)
+
+    painting = json.loads((tmp_path / 'data' / 'painting.json').read_text(encoding='utf-8'))
+    assert len(painting) == 30
+    assert set(painting[1]['title']) == set(benchmark.LANGUAGES)
+    assert len(painting[0]['gallery']) == benchmark.PILE_SIZE
+    assert 'gallery' not in painting[1]
+    assert 'painting' in info['categories']
+
+    en = json.loads((tmp_path / 'lang' / 'en.json').read_text(encoding='utf-8'))
+    fr = json.loads((tmp_path / 'lang' / 'fr.json').read_text(encoding='utf-8'))
+    assert len(en) == 10
+    assert len(fr) == 8
+    languages = json.loads((tmp_path / 'config' / 'languages.json').read_text(encoding='utf-8'))
+    assert [l['code'] for l in languages['supportedLanguages']] == list(benchmark.LANGUAGES)
+
+
+def test_compare_flags_slower_medians_only():
+    baseline = {"sizes": {"100": {
+        "a": {"median_ms": 10.0}, "b": {"median_ms": 10.0}, "c": {"median_ms": 0.2}}}}
+    results = {"sizes": {
+        "100": {"a": {"median_ms": 14.0}, "b": {"median_ms": 12.0}, "c": {"median_ms": 0.9},
+                "new": {"median_ms": 50.0}},
+        "1000": {"a": {"median_ms": 99.0}},
+    }}
+    # b is within tolerance, c within timer noise, the rest has no baseline
+    assert benchmark.compare(results, baseline) == [("100", "a", 10.0, 14.0)]
+
+
+def test_measure_small_dataset():
+    """The benchmarks run end to end against a generated content root."""
+    results = benchmark.measure(50, repeat=1, names=['get_all_content', 'delete_content', 'upload_and_save'])
+    assert set(results) == {'get_all_content', 'delete_content', 'upload_and_save'}
+    assert all(r['median_ms'] > 0 for r in results.values())
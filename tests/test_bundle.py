@@ -0,0 +1,84 @@
+import pytest
+import gzip
+import json
+import shutil
+from pathlib import Path
+
+import bundle
+from config_loader import ConfigLoader
+
+ROOT = Path(__file__).resolve().parent.parent
+
+@pytest.fixture
+def site(tmp_path):
+    """A content root with the repo's config and a few dated items"""
+    shutil.copytree(ROOT / 'config', tmp_path / 'config')
+    (tmp_path / 'data').mkdir()
+    config = ConfigLoader(tmp_path)
+    assert config.load_all()
+    paths = config.get_category_map()
+    Path(paths['painting']).write_text(json.dumps(
+        [{"id": f"p{i}", "date": f"2024-01-{i + 10}"} for i in range(5)], indent=4))
+    Path(paths['music']).write_text(json.dumps(
+        [{"id": "m0", "date": "2024-01-12", "created": "2024-02-01"}], indent=4))
+    return config
+
+def read_shard(config, shard):
+    return json.loads((Path(config.data_dir) / shard['url']).read_text(encoding='utf-8'))
+
+def test_build_shards_feed_newest_first(site):
+    """Items of all categories are merged, sorted like the site and paged."""
+    manifest = bundle.build(site, page_size=4)
+
+    assert manifest['total'] == 6
+    assert manifest['counts']['painting'] == 5
+    assert manifest['counts']['music'] == 1
+    assert [s['count'] for s in manifest['shards']] == [4, 2]
+
+    ids = [i['id'] for s in manifest['shards'] for i in read_shard(site, s)]
+    assert ids == ['m0', 'p4', 'p3', 'p2', 'p1', 'p0']
+    assert read_shard(site, manifest['shards'][0])[0]['_category'] == 'music'
+
+def test_build_writes_minified_and_gzip(site):
+    """Shards are minified, with a .gz sibling holding the same bytes."""
+    manifest = bundle.build(site, page_size=4)
+    path = Path(site.data_dir) / manifest['shards'][0]['url']
+
+    raw = path.read_bytes()
+    assert b'\n' not in raw and b', ' not in raw
+    assert gzip.decompress(Path(f"{path}.gz").read_bytes()) == raw
+    assert (Path(site.data_dir) / 'bundles' / 'manifest.json.gz').exists()
+
+def test_rebuild_removes_stale_shards(site):
+    """Shards from an earlier build are removed."""
+    bundle.build(site, page_size=2)
+    manifest = bundle.build(site, page_size=10)
+
+    files = sorted(p.name for p in (Path(site.data_dir) / 'bundles').iterdir())
+    expected = [s['url'].split('/')[-1] for s in manifest['shards']]
+    assert [f for f in files if f.endswith('.json') and f.startswith('feed-')] == expected
+
+def test_manifest_records_source_hashes(site):
+    """Same-length edits (a changed date) make the bundles stale."""
+    import hashlib
+    manifest = bundle.build(site, page_size=4)
+    paths = site.get_category_map()
+    painting = Path(paths['painting'])
+
+    assert manifest['sources']['painting'] == {
+        "file": painting.name, "sha256": hashlib.sha256(painting.read_bytes()).hexdigest()}
+    missing = [c for c, path in paths.items() if not Path(path).exists()]
+    assert all(manifest['sources'][c]['sha256'] is None for c in missing)
+    assert bundle.stale(site) == []
+
+    painting.write_text(painting.read_text().replace('2024-01-10', '2024-01-19'))
+    assert bundle.stale(site) == ['painting']
+
+def test_invalidate_drops_manifest_only(site):
+    manifest = bundle.build(site, page_size=4)
+    out_dir = Path(site.data_dir) / 'bundles'
+    assert bundle.invalidate(out_dir) is True
+    assert not list(out_dir.glob('manifest.json*'))
+    assert (Path(site.data_dir) / manifest['shards'][0]['url']).exists()
+    assert bundle.stale(site) is None
+    assert bundle.invalidate(out_dir) is False
@@ -0,0 +1,60 @@
+import pytest
+import json
+import os
+import shutil
+from pathlib import Path
+
+from config_loader import ConfigLoader
+
+ROOT = Path(__file__).resolve().parent.parent
+
+@pytest.fixture
+def config(tmp_path):
+    shutil.copytree(ROOT / 'config', tmp_path / 'config')
+    config = ConfigLoader(tmp_path, watch_interval=0)
+    assert config.load_all()
+    return config
+
+def write_categories(config, content_types):
+    path = config.config_dir / 'categories.json'
+    path.write_text(json.dumps({"contentTypes": content_types}))
+    # Make sure the mtime moves even on coarse clocks
+    st = os.stat(path)
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 10**9))
+
+def test_indexed_lookups(config):
+    assert config.get_content_type('painting')['mediaType'] == 'image'
+    assert config.get_content_type('nope') is None
+    assert config.get_media_type('image')['id'] == 'image'
+    assert 'painting' in config.get_gallery_categories()
+    assert config.get_category_data_file('painting') == str(config.data_dir / 'painting.json')
+
+def test_reload_on_change_notifies_subscribers(config):
+    """Edited config files are picked up and subscribers get the new snapshot."""
+    seen = []
+    config.subscribe(seen.append)
+    old = config.snapshot()
+
+    write_categories(config, [{"id": "video", "mediaType": "video"}])
+    assert list(config.get_category_map()) == ['video']
+    assert len(seen) == 1 and seen[0] is config.snapshot()
+    # The previous snapshot is left as it was
+    assert 'painting' in old.category_map
+
+def test_watch_interval_throttles_checks(config):
+    config.watch_interval = 3600
+    config.snapshot()
+    write_categories(config, [{"id": "video", "mediaType": "video"}])
+    assert 'painting' in config.get_category_map()
+    assert config.reload_if_changed()
+    assert list(config.get_category_map()) == ['video']
+
+def test_load_all_is_idempotent(config, mocker):
+    """Loading unchanged files again doesn't re-parse or notify."""
+    seen = []
+    config.subscribe(seen.append)
+    parse = mocker.spy(json, 'load')
+
+    assert config.load_all()
+    assert parse.call_count == 0
+    assert seen == []
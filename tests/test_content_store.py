@@ -0,0 +1,295 @@
+import pytest
+import json
+import os
+
+import base64
+
+from content_store import ContentStore, DuplicateIdError, journal_path
+
+@pytest.fixture
+def store(tmp_path):
+    paths = {'painting': str(tmp_path / 'painting.json')}
+    with open(paths['painting'], 'w', encoding='utf-8') as f:
+        json.dump([{"id": "painting_1", "title": {"en": "One"}}], f)
+    return ContentStore(paths.get)
+
+def test_load_caches_parsed_list(store):
+    """Second load is served from memory."""
+    first = store.load('painting')
+    second = store.load('painting')
+    assert first is second
+    assert store.stats()['hits'] == 1
+    assert store.stats()['misses'] == 1
+
+def test_reload_when_file_changes_on_disk(store):
+    """An external write (different size/mtime) invalidates the cached copy."""
+    store.load('painting')
+    with open(store.path_for('painting'), 'w', encoding='utf-8') as f:
+        json.dump([{"id": "painting_1"}, {"id": "painting_2"}], f)
+
+    assert len(store.load('painting')) == 2
+    assert store.stats()['misses'] == 2
+
+def test_save_keeps_cache_warm(store):
+    """Saving through the store does not force a re-parse."""
+    items = store.load('painting')
+    items.append({"id": "painting_2"})
+    store.save('painting', items)
+
+    assert store.load('painting') is items
+    with open(store.path_for('painting'), 'r', encoding='utf-8') as f:
+        assert len(json.load(f)) == 2
+
+def test_missing_or_empty_file_loads_as_empty(tmp_path):
+    """Missing and blank data files are treated as empty categories."""
+    empty = tmp_path / 'drawing.json'
+    empty.write_text('  ')
+    store = ContentStore({'drawing': str(empty), 'music': str(tmp_path / 'music.json')}.get)
+    assert store.load('drawing') == []
+    assert store.load('music') == []
+
+def test_invalid_category(store):
+    """Unknown categories raise ValueError like manager does."""
+    with pytest.raises(ValueError, match="Category 'invalid' is invalid"):
+        store.load('invalid')
+
+@pytest.fixture
+def indexed(tmp_path):
+    path = str(tmp_path / 'painting.json')
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump([{"id": f"painting_{i}", "title": {"en": str(i)}} for i in range(5)], f)
+    return ContentStore({'painting': path}.get)
+
+def test_find_by_id(indexed):
+    """Ids map straight to list positions."""
+    assert indexed.find('painting', 'painting_3') == 3
+    assert indexed.get('painting', 'painting_3')['title']['en'] == '3'
+    assert indexed.find('painting', 'missing') is None
+
+def test_index_follows_remove_and_append(indexed):
+    """Removing shifts the tail; appending indexes the new item."""
+    indexed.remove('painting', 1)
+    indexed.append('painting', {"id": "painting_new"})
+    assert indexed.find('painting', 'painting_1') is None
+    assert indexed.find('painting', 'painting_2') == 1
+    assert indexed.find('painting', 'painting_4') == 3
+    assert indexed.find('painting', 'painting_new') == 4
+
+def test_update_changing_id_reindexes(indexed):
+    """Renaming an id moves its index key."""
+    indexed.update('painting', 2, {"id": "renamed"})
+    assert indexed.find('painting', 'painting_2') is None
+    assert indexed.find('painting', 'renamed') == 2
+
+def test_match_title_for_projects(tmp_path):
+    """GitHub projects have no id and are matched by title."""
+    path = str(tmp_path / 'projects.json')
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump([{"title": "repo-a"}, {"title": "repo-b"}], f)
+    store = ContentStore({'projects': path}.get)
+    assert store.find('projects', 'repo-b') is None
+    assert store.find('projects', 'repo-b', match_title=True) == 1
+    store.remove('projects', 0)
+    assert store.find('projects', 'repo-b', match_title=True) == 0
+
+def test_duplicate_ids_are_reported(indexed):
+    """A shared id raises instead of silently matching the first item."""
+    indexed.append('painting', {"id": "painting_0"})
+    with pytest.raises(DuplicateIdError):
+        indexed.find('painting', 'painting_0')
+    assert indexed.stats()['duplicates'] == {'painting': ['painting_0']}
+    assert indexed.unique_id('painting', 'painting_0') == 'painting_0_2'
+
+@pytest.fixture
+def journaled(tmp_path):
+    path = str(tmp_path / 'painting.json')
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump([{"id": "p1", "url": "http://a.jpg"}, {"id": "p2", "url": "http://b.jpg"}], f)
+    return ContentStore({'painting': path}.get, journal=True, compact_threshold=100)
+
+def test_journal_mode_appends_records(journaled):
+    """Saves append to the journal and leave the snapshot untouched."""
+    path = journaled.path_for('painting')
+    with open(path, 'r', encoding='utf-8') as f:
+        snapshot = f.read()
+
+    journaled.append('painting', {"id": "p3", "url": "http://c.jpg"})
+    journaled.save('painting')
+    journaled.update('painting', 0, {"gallery": ["http://c.jpg"]})
+    journaled.remove('painting', 2)
+    journaled.save('painting')
+
+    with open(path, 'r', encoding='utf-8') as f:
+        assert f.read() == snapshot
+    with open(journal_path(path), 'r', encoding='utf-8') as f:
+        assert [json.loads(line)['op'] for line in f] == ['add', 'update', 'remove']
+
+def test_journal_replayed_on_load(journaled):
+    """A fresh store sees snapshot + journal."""
+    journaled.append('painting', {"id": "p3"})
+    journaled.remove('painting', 0)
+    journaled.save('painting')
+
+    fresh = ContentStore({'painting': journaled.path_for('painting')}.get)
+    assert [i['id'] for i in fresh.load('painting')] == ['p2', 'p3']
+
+def test_compact_folds_journal(journaled):
+    """Compaction rewrites the canonical file and drops the journal."""
+    path = journaled.path_for('painting')
+    journaled.update('painting', 1, {"url": "http://new.jpg"})
+    journaled.save('painting')
+
+    assert journaled.compact('painting') == 1
+    assert not os.path.exists(journal_path(path))
+    with open(path, 'r', encoding='utf-8') as f:
+        assert json.load(f)[1]['url'] == 'http://new.jpg'
+
+def test_compact_threshold(tmp_path):
+    """Reaching the threshold compacts automatically."""
+    path = str(tmp_path / 'music.json')
+    store = ContentStore({'music': path}.get, journal=True, compact_threshold=3)
+    for i in range(3):
+        store.append('music', {"id": f"m{i}"})
+        store.save('music')
+
+    assert not os.path.exists(journal_path(path))
+    with open(path, 'r', encoding='utf-8') as f:
+        assert len(json.load(f)) == 3
+
+@pytest.fixture
+def dated_store(tmp_path):
+    path = tmp_path / 'painting.json'
+    path.write_text(json.dumps([
+        {"id": f"p{i}", "date": f"2024-01-0{d}"} for i, d in enumerate([3, 1, 5, 2, 4])
+    ]))
+    return ContentStore({'painting': str(path)}.get)
+
+def walk(store, **kwargs):
+    """All ids, fetched page by page"""
+    ids, cursor = [], None
+    while True:
+        items, cursor, total = store.page('painting', cursor=cursor, limit=2, **kwargs)
+        ids += [i['id'] for i in items]
+        if cursor is None:
+            return ids
+
+def test_page_file_order(dated_store):
+    """Without sort, pages follow the file order."""
+    items, cursor, total = dated_store.page('painting', limit=2)
+    assert [i['id'] for i in items] == ['p0', 'p1']
+    assert total == 5
+    assert walk(dated_store) == ['p0', 'p1', 'p2', 'p3', 'p4']
+
+def test_page_sorted(dated_store):
+    """date sorts ascending, -date descending."""
+    assert walk(dated_store, sort='date') == ['p1', 'p3', 'p0', 'p4', 'p2']
+    assert walk(dated_store, sort='-date') == ['p2', 'p4', 'p0', 'p3', 'p1']
+
+def test_page_sort_order_reused(dated_store):
+    """The sort order is built once until the category changes."""
+    dated_store.page('painting', sort='date', limit=2)
+    entry = dated_store._entries['painting']
+    order = entry.orders['date']
+    dated_store.page('painting', sort='-date', limit=2)
+    assert entry.orders['date'] is order
+
+    dated_store.append('painting', {"id": "p5", "date": "2024-01-00"})
+    assert 'date' not in entry.orders
+
+def test_cursor_stable_across_changes(dated_store):
+    """Removing an already served item doesn't skip or repeat items."""
+    items, cursor, _ = dated_store.page('painting', limit=2)
+    dated_store.remove('painting', 0)
+    items, cursor, _ = dated_store.page('painting', cursor=cursor, limit=2)
+    assert [i['id'] for i in items] == ['p2', 'p3']
+
+    items, cursor, _ = dated_store.page('painting', sort='-date', limit=2)
+    dated_store.append('painting', {"id": "p9", "date": "2024-01-09"})
+    items, cursor, _ = dated_store.page('painting', sort='-date', cursor=cursor, limit=2)
+    assert [i['id'] for i in items] == ['p3', 'p1']
+
+def test_cursor_item_deleted(dated_store):
+    """Deleting the item a cursor points at doesn't skip the one after it."""
+    items, cursor, _ = dated_store.page('painting', limit=2)
+    assert [i['id'] for i in items] == ['p0', 'p1']
+    dated_store.remove('painting', dated_store.find('painting', 'p1'))
+    items, cursor, _ = dated_store.page('painting', cursor=cursor, limit=2)
+    assert [i['id'] for i in items] == ['p2', 'p3']
+
+def test_page_rejects_bad_sort_and_cursor(dated_store):
+    with pytest.raises(ValueError):
+        dated_store.page('painting', sort='title')
+    with pytest.raises(ValueError):
+        dated_store.page('painting', cursor='not a cursor')
+
+def raw_cursor(payload):
+    return base64.urlsafe_b64encode(json.dumps(payload).encode()).decode().rstrip('=')
+
+@pytest.mark.parametrize('sort, payload', [
+    (None, [0, ["x"]]),  # unhashable key
+    (None, ["", "1", "p1"]),  # position given as text
+    (None, ["", True, "p1"]),
+    ('-date', ['-date', None, None]),
+    ('date', ['date', 3, "p1"]),  # sort value must be text
+    (None, ["", 0, "p1", "extra"]),
+])
+def test_page_rejects_malformed_cursors(dated_store, sort, payload):
+    with pytest.raises(ValueError):
+        dated_store.page('painting', sort=sort, cursor=raw_cursor(payload))
+
+def test_cursor_only_valid_for_its_sort(dated_store):
+    """A cursor resumes the sort it was made for, not another one."""
+    _, cursor, _ = dated_store.page('painting', limit=2)
+    with pytest.raises(ValueError):
+        dated_store.page('painting', sort='date', cursor=cursor)
+    _, cursor, _ = dated_store.page('painting', sort='date', limit=2)
+    with pytest.raises(ValueError):
+        dated_store.page('painting', sort='-date', cursor=cursor)
+    with pytest.raises(ValueError):
+        dated_store.page('painting', cursor=cursor)
+
+def test_transaction_discards_changes_on_error(store):
+    """A failing transaction leaves no unsaved edits behind."""
+    with pytest.raises(RuntimeError):
+        with store.transaction():
+            store.append('painting', {"id": "painting_2"})
+            raise RuntimeError("boom")
+
+    assert [i['id'] for i in store.load('painting')] == ['painting_1']
+
+def test_snapshot_write_is_atomic(store, tmp_path):
+    """Saves replace the file through a temp file and keep its mode."""
+    os.chmod(store.path_for('painting'), 0o644)
+    store.append('painting', {"id": "painting_2"})
+    store.save('painting')
+
+    assert os.stat(store.path_for('painting')).st_mode & 0o777 == 0o644
+    assert not list(tmp_path.glob('*.tmp'))
+
+@pytest.fixture
+def two_categories(tmp_path):
+    paths = {name: str(tmp_path / f'{name}.json') for name in ('painting', 'music')}
+    for name, path in paths.items():
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump([{"id": f"{name}_1"}], f)
+    return paths
+
+@pytest.mark.parametrize('journal', [False, True])
+def test_save_many_writes_all_or_nothing(two_categories, tmp_path, journal):
+    """No data file changes unless every category could be written."""
+    store = ContentStore(two_categories.get, journal=journal)
+    before = {name: (tmp_path / f'{name}.json').read_text() for name in two_categories}
+    store.append('painting', {"id": "painting_2"})
+    store.append('music', {"id": "music_2", "bad": {1, 2}})  # not JSON
+
+    with pytest.raises(TypeError):
+        store.save_many(['painting', 'music'])
+    assert {name: (tmp_path / f'{name}.json').read_text() for name in two_categories} == before
+    assert not list(tmp_path.glob('*.tmp'))
+    assert [i['id'] for i in store.load('painting')] == ['painting_1']
+
+    store.append('painting', {"id": "painting_2"})
+    store.append('music', {"id": "music_2"})
+    store.save_many(['painting', 'music'])
+    reopened = ContentStore(two_categories.get)
+    assert len(reopened.load('painting')) == len(reopened.load('music')) == 2
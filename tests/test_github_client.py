@@ -0,0 +1,120 @@
+import pytest
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from github_client import GitHubClient
+
+class StubGitHub(BaseHTTPRequestHandler):
+    """Minimal GitHub API: one repo, releases by tag, asset uploads"""
+    protocol_version = 'HTTP/1.1'  # keep-alive
+
+    def log_message(self, *args):
+        pass
+
+    def setup(self):
+        super().setup()
+        self.server.connections += 1
+
+    def _reply(self, status, body):
+        data = json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_GET(self):
+        self.server.hits.append(('GET', self.path))
+        if self.path == '/repos/u/r/releases/tags/media' and self.server.release:
+            return self._reply(200, self.server.release)
+        self._reply(404, {"message": "Not Found"})
+
+    def do_POST(self):
+        self.server.hits.append(('POST', self.path.split('?')[0]))
+        body = self.rfile.read(int(self.headers['Content-Length']))
+        if self.path == '/repos/u/r/releases':
+            host = f"http://127.0.0.1:{self.server.server_port}"
+            self.server.release = {"id": 1, "upload_url": host + "/upload/1/assets{?name,label}"}
+            return self._reply(201, self.server.release)
+        if self.path.startswith('/upload/1/assets'):
+            self.server.uploaded.append(body)
+            return self._reply(201, {"browser_download_url": "http://dl/" + self.path.split('name=')[1]})
+        self._reply(404, {"message": "Not Found"})
+
+@pytest.fixture
+def stub_github():
+    server = ThreadingHTTPServer(('127.0.0.1', 0), StubGitHub)
+    server.connections = 0
+    server.hits = []
+    server.uploaded = []
+    server.release = None
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+@pytest.fixture
+def client(stub_github):
+    return GitHubClient('t0ken', api_url=f"http://127.0.0.1:{stub_github.server_port}")
+
+def test_release_created_once_then_cached(client, stub_github):
+    """A missing release is created, then served from cache."""
+    first = client.get_release('u/r', 'media')
+    second = client.get_release('u/r', 'media')
+
+    assert first is second
+    assert stub_github.hits == [('GET', '/repos/u/r/releases/tags/media'), ('POST', '/repos/u/r/releases')]
+    assert client.stats() == {"requests": 2, "requestsSaved": 1, "cachedReleases": 1}
+
+def test_concurrent_misses_share_one_lookup(client, stub_github):
+    """Threads missing the cache together send one GET and one create."""
+    barrier = threading.Barrier(5)
+    releases = []
+
+    def fetch():
+        barrier.wait()
+        releases.append(client.get_release('u/r', 'media'))
+
+    threads = [threading.Thread(target=fetch) for _ in range(5)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert stub_github.hits == [('GET', '/repos/u/r/releases/tags/media'), ('POST', '/repos/u/r/releases')]
+    assert all(release is releases[0] for release in releases)
+    assert client.stats()['requestsSaved'] == 4
+
+def test_cache_expires(client, stub_github):
+    """Expired release metadata is fetched again."""
+    client.release_ttl = 0
+    client.get_release('u/r', 'media')
+    client.get_release('u/r', 'media')
+    assert stub_github.hits[-1] == ('GET', '/repos/u/r/releases/tags/media')
+    assert client.stats()['requestsSaved'] == 0
+
+def test_uploads_reuse_connection(client, stub_github):
+    """Several uploads cost one release lookup and one connection."""
+    for i in range(3):
+        release = client.get_release('u/r', 'media')
+        upload_url = release['upload_url'].replace('{?name,label}', '')
+        r = client.request('POST', f"{upload_url}?name=track{i}.mp3", data=b'audio')
+        assert r.json()['browser_download_url'] == f"http://dl/track{i}.mp3"
+
+    assert stub_github.uploaded == [b'audio'] * 3
+    assert client.stats()['requestsSaved'] == 2
+    assert stub_github.connections == 1
+
+def test_manager_upload_against_stub(stub_github, mocker):
+    """manager.upload_to_github_release goes through the shared client."""
+    import manager
+    stub = GitHubClient('t0ken', api_url=f"http://127.0.0.1:{stub_github.server_port}")
+    mocker.patch.object(manager, 'github', stub)
+    mocker.patch.object(manager, 'GITHUB_REPO', 'u/r')
+
+    url = manager.upload_to_github_release(__file__, 'song.mp3')
+
+    assert url.startswith('http://dl/') and url.endswith('_song.mp3')
+    assert stub.get_release('u/r', 'media')['id'] == 1
+    assert stub.stats()['requestsSaved'] == 1
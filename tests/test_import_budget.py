@@ -0,0 +1,28 @@
+import pytest
+
+import import_budget
+
+SAMPLE = """import time: self [us] | cumulative | imported package
+import time:       120 |        120 |   _io
+import time:       300 |        300 |     json.decoder
+import time:       200 |        500 |   json
+import time:        50 |        670 | config_loader
+import time:        40 |         40 | unrelated
+"""
+
+def test_parse_importtime():
+    modules = import_budget.parse_importtime(SAMPLE)
+    assert modules[1] == ('json.decoder', 300, 300, 2)
+    assert modules[3] == ('config_loader', 50, 670, 0)
+
+def test_import_tree_collects_direct_imports():
+    total, children = import_budget.import_tree(import_budget.parse_importtime(SAMPLE), 'config_loader')
+    assert total == 670
+    assert children == [('_io', 120), ('json', 500)]
+    with pytest.raises(ValueError):
+        import_budget.import_tree(import_budget.parse_importtime(SAMPLE), 'missing')
+
+def test_measure_real_import():
+    """A fresh interpreter reports the module's own import time."""
+    total, children = import_budget.measure('content_store')
+    assert total > 0
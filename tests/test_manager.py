@@ -1,6 +1,8 @@
 import pytest
 from unittest.mock import MagicMock, patch, mock_open
 import json
+import time
+from datetime import datetime
 import os
 import sys
 
@@ -20,13 +22,13 @@ def mock_json_open(mocker):
     ])
     return mocker.patch('builtins.open', mock_open(read_data=read_data))
 
-def test_upload_and_save_success(mock_cloudinary, mock_json_open, mocker):
+def test_upload_and_save_success(mock_cloudinary, mock_json_open, mocker, tmp_path):
     """Test successful upload and JSON update."""
     mocker.patch('os.path.exists', return_value=True)
     mocker.patch('manager.update_site_timestamp') # mock timestamp update
     
     # Mock the JSON_MAP to point to a fake file
-    mocker.patch.dict(manager.JSON_MAP, {'painting': 'data/painting.json'})
+    mocker.patch.dict(manager.JSON_MAP, {'painting': str(tmp_path / 'painting.json')})
 
     result = manager.upload_and_save(
         file_path='/path/to/image.jpg',
@@ -54,11 +56,11 @@ def test_upload_and_save_invalid_category():
             category='invalid'
         )
 
-def test_save_from_url_success(mock_json_open, mocker):
+def test_save_from_url_success(mock_json_open, mocker, tmp_path):
     """Test saving an item from a direct URL."""
     mocker.patch('os.path.exists', return_value=True)
     mocker.patch('manager.update_site_timestamp')
-    mocker.patch.dict(manager.JSON_MAP, {'music': 'data/music.json'})
+    mocker.patch.dict(manager.JSON_MAP, {'music': str(tmp_path / 'music.json')})
 
     result = manager.save_from_url(
         url='http://archive.org/song.mp3',
@@ -70,3 +72,257 @@ def test_save_from_url_success(mock_json_open, mocker):
     assert result['url'] == 'http://archive.org/song.mp3'
     assert result['title']['en'] == 'Retro Jam'
     assert result['genre']['en'] == 'Synthwave'
+
+@pytest.fixture
+def tmp_category(tmp_path, mocker):
+    """A real, empty painting.json wired into JSON_MAP"""
+    path = tmp_path / 'painting.json'
+    path.write_text('[]')
+    mocker.patch.dict(manager.JSON_MAP, {'painting': str(path)})
+    mocker.patch('manager.update_site_timestamp')
+    return path
+
+def test_upload_many_keeps_order_and_writes_once(tmp_category, mocker):
+    """Uploads run concurrently; results follow input order, one save per category."""
+    import time
+
+    def fake_upload(file_path, category, filename=None):
+        # Later files finish first
+        time.sleep(0.05 if file_path.endswith('a.jpg') else 0)
+        return f'http://cdn/{os.path.basename(file_path)}'
+
+    mocker.patch('manager.upload_single', side_effect=fake_upload)
+    save = mocker.spy(manager.store, 'save')
+
+    results = manager.upload_many([
+        {'file_path': '/x/a.jpg', 'title': 'A', 'category': 'painting'},
+        {'file_path': '/x/b.jpg', 'title': 'B', 'category': 'painting'},
+        {'file_path': '/x/c.jpg', 'title': 'C', 'category': 'nope'},
+    ], workers=3)
+
+    assert [r['url'] for r in results[:2]] == ['http://cdn/a.jpg', 'http://cdn/b.jpg']
+    assert isinstance(results[2], ValueError)
+    assert results[0]['id'] != results[1]['id']
+    assert save.call_count == 1
+    manager.update_site_timestamp.assert_called_once()
+    assert [i['title']['en'] for i in json.loads(tmp_category.read_text())] == ['A', 'B']
+
+def test_upload_many_times_uploads_for_the_request(tmp_category, mocker):
+    """Uploads on the worker pool show up in the request's upload phase."""
+    from request_metrics import metrics, timed
+
+    @timed('upload')
+    def fake_upload(file_path, category, filename=None):
+        time.sleep(0.01)
+        return 'http://cdn/x.jpg'
+
+    mocker.patch('manager.upload_single', side_effect=fake_upload)
+    token = metrics.begin_request()
+    manager.upload_many([
+        {'file_path': '/x/a.jpg', 'title': 'A', 'category': 'painting'},
+        {'file_path': '/x/b.jpg', 'title': 'B', 'category': 'painting'},
+    ], workers=2)
+    _, phases = metrics.end_request(token, 'test', 'POST', 200)
+    assert phases['upload'] >= 0.02
+
+def test_upload_many_reports_failed_upload(tmp_category, mocker):
+    """One failing upload doesn't stop the others from being saved."""
+    def fake_upload(file_path, category, filename=None):
+        if 'bad' in file_path:
+            raise RuntimeError('upload refused')
+        return 'http://cdn/ok.jpg'
+
+    mocker.patch('manager.upload_single', side_effect=fake_upload)
+    results = manager.upload_many([
+        {'file_path': '/x/bad.jpg', 'title': 'Bad', 'category': 'painting'},
+        {'file_path': '/x/ok.jpg', 'title': 'Ok', 'category': 'painting'},
+    ])
+
+    assert str(results[0]) == 'upload refused'
+    assert results[1]['url'] == 'http://cdn/ok.jpg'
+
+def test_concurrent_saves_get_distinct_ids(tmp_category, mocker):
+    """Ids are picked and appended under one lock, so saves racing on the
+    same id still end up with distinct ones."""
+    import threading
+
+    unique_id = manager.store.unique_id
+
+    def slow_unique_id(category, base_id):
+        candidate = unique_id(category, base_id)
+        time.sleep(0.01)  # let another save pick an id in between
+        return candidate
+
+    mocker.patch.object(manager.store, 'unique_id', side_effect=slow_unique_id)
+    threads = [
+        threading.Thread(target=manager.save_entries, args=('painting', [{'id': 'same', 'title': str(n)}]))
+        for n in range(4)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    ids = [i['id'] for i in json.loads(tmp_category.read_text())]
+    assert sorted(ids) == ['same', 'same_2', 'same_3', 'same_4']
+
+def test_save_invalidates_then_rebuilds_bundles(tmp_category, isolated_bundles, mocker):
+    """A save drops the bundle manifest at once; the flush builds it again."""
+    import bundle
+    mocker.patch.object(manager.config, 'get_category_map', return_value={'painting': str(tmp_category)})
+    bundle.build(manager.config, page_size=10, store=manager.store, out_dir=isolated_bundles)
+
+    manager.save_entries('painting', [{'id': 'p1', 'date': '2024-01-01'}])
+    assert bundle.read_manifest(isolated_bundles) is None
+
+    manager.rebuild_bundles()
+    manifest = bundle.read_manifest(isolated_bundles)
+    assert manifest['total'] == 1
+    assert manifest['sources']['painting']['sha256'] == bundle.file_hash(tmp_category)
+
+def test_save_without_bundles_builds_none(tmp_category, isolated_bundles):
+    manager.save_entries('painting', [{'id': 'p1'}])
+    manager.rebuild_bundles()
+    assert not isolated_bundles.exists()
+
+@pytest.fixture
+def pile_dir(tmp_path):
+    pile = tmp_path / 'sketchbook'
+    pile.mkdir()
+    for name in ['c.jpg', 'a.jpg', 'B.PNG', 'notes.txt']:
+        (pile / name).write_bytes(b'x')
+    return pile
+
+def test_pile_upload_keeps_alphabetical_order(tmp_category, pile_dir, mocker):
+    """Concurrent pile uploads still give cover + gallery in file order."""
+    import time
+
+    def fake_upload(file_path, category, filename=None):
+        time.sleep(0.05 if file_path.endswith('B.PNG') else 0)
+        return f'http://cdn/{os.path.basename(file_path)}'
+
+    mocker.patch('manager.upload_single', side_effect=fake_upload)
+    entry = manager.upload_and_save(str(pile_dir), 'Pile', 'painting', pile=True, jobs=3)
+
+    assert entry['url'] == 'http://cdn/B.PNG'
+    assert entry['gallery'] == ['http://cdn/a.jpg', 'http://cdn/c.jpg']
+
+def test_pile_upload_retries_then_fails(tmp_category, pile_dir, mocker):
+    """A persistently failing image aborts the pile after its retries."""
+    mocker.patch('manager.time.sleep')
+
+    def fake_upload(file_path, category, filename=None):
+        if file_path.endswith('a.jpg'):
+            raise RuntimeError('503')
+        return 'http://cdn/ok'
+
+    upload = mocker.patch('manager.upload_single', side_effect=fake_upload)
+
+    with pytest.raises(manager.PileUploadError, match='a.jpg'):
+        manager.upload_and_save(str(pile_dir), 'Pile', 'painting', pile=True, retries=2)
+
+    failed_calls = [c for c in upload.call_args_list if c[0][0].endswith('a.jpg')]
+    assert len(failed_calls) == 3
+    assert json.loads(tmp_category.read_text()) == []
+
+def test_pile_upload_skip_failed(tmp_category, pile_dir, mocker):
+    """With skip_failed the item is saved without the failing image."""
+    def fake_upload(file_path, category, filename=None):
+        if file_path.endswith('a.jpg'):
+            raise RuntimeError('503')
+        return f'http://cdn/{os.path.basename(file_path)}'
+
+    mocker.patch('manager.upload_single', side_effect=fake_upload)
+    entry = manager.upload_and_save(str(pile_dir), 'Pile', 'painting', pile=True,
+                                    retries=0, skip_failed=True)
+
+    assert entry['url'] == 'http://cdn/B.PNG'
+    assert entry['gallery'] == ['http://cdn/c.jpg']
+
+def test_upload_single_streams_small_file_object(mocker):
+    """File objects go to Cloudinary as-is, named by filename."""
+    import io
+    upload = mocker.patch('cloudinary.uploader.upload', return_value={'secure_url': 'http://cdn/a.jpg'})
+    large = mocker.patch('cloudinary.uploader.upload_large')
+
+    stream = io.BytesIO(b'small image')
+    assert manager.upload_single(stream, 'painting', filename='a.jpg') == 'http://cdn/a.jpg'
+    assert upload.call_args[0][0] is stream
+    large.assert_not_called()
+
+def test_upload_single_chunks_large_file_object(mocker):
+    """Files over the chunk size use Cloudinary's chunked upload."""
+    import io
+    mocker.patch('manager.UPLOAD_CHUNK_SIZE', 4)
+    large = mocker.patch('cloudinary.uploader.upload_large', return_value={'secure_url': 'http://cdn/v.mp4'})
+
+    assert manager.upload_single(io.BytesIO(b'0123456789'), 'video', filename='v.mp4') == 'http://cdn/v.mp4'
+    assert large.call_args[1]['chunk_size'] == 4
+    assert large.call_args[1]['filename'] == 'v.mp4'
+
+def test_github_release_upload_streams_with_length(mocker):
+    """GitHub uploads stream file objects with an explicit Content-Length."""
+    import io
+    mocker.patch('manager.get_or_create_release', return_value={
+        'upload_url': 'https://uploads.github.com/repos/u/r/releases/1/assets{?name,label}'})
+    response = MagicMock()
+    response.json.return_value = {'browser_download_url': 'https://github.com/u/r/song.mp3'}
+    post = mocker.patch.object(manager.github, 'request', return_value=response)
+
+    stream = io.BytesIO(b'ID3 audio bytes')
+    stream.seek(3)
+    url = manager.upload_to_github_release(stream, 'song.mp3')
+
+    assert url == 'https://github.com/u/r/song.mp3'
+    body = post.call_args[1]['data']
+    assert len(body) == len(b' audio bytes')
+    assert body.read() == b' audio bytes'
+    assert post.call_args[1]['headers']['Content-Type'] == 'audio/mpeg'
+
+def test_upload_single_dedups_identical_content(mocker):
+    """The same bytes are uploaded once; later uploads reuse the URL."""
+    import io
+    upload = mocker.patch('cloudinary.uploader.upload', side_effect=[
+        {'secure_url': 'http://cdn/scan.jpg'}, {'secure_url': 'http://cdn/other.jpg'}])
+
+    first = manager.upload_single(io.BytesIO(b'same scan'), 'drawing', filename='scan.jpg')
+    second = manager.upload_single(io.BytesIO(b'same scan'), 'painting', filename='copy.jpg')
+    other = manager.upload_single(io.BytesIO(b'another scan'), 'drawing', filename='b.jpg')
+
+    assert first == second == 'http://cdn/scan.jpg'
+    assert other == 'http://cdn/other.jpg'
+    assert upload.call_count == 2
+
+@pytest.fixture
+def site_index(tmp_path, monkeypatch):
+    """index.html with an old 'Last Updated' stamp, as cwd and content root"""
+    index = tmp_path / 'index.html'
+    index.write_text('<p><span>Last Updated:</span> 1 Jan 2020</p>', encoding='utf-8')
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(manager.config, 'content_root', tmp_path)
+    monkeypatch.setattr(manager, '_stamped', {})
+    return index
+
+def test_timestamp_updates_coalesced(site_index, mocker):
+    """Many updates in a row cost a single write."""
+    write = mocker.patch('manager.write_site_timestamp', wraps=manager.write_site_timestamp)
+    for _ in range(40):
+        manager.update_site_timestamp(delay=0.05)
+    time.sleep(0.3)
+
+    assert write.call_count == 1
+    today = datetime.now().strftime("%d %b %Y")
+    assert site_index.read_text(encoding='utf-8') == f'<p><span>Last Updated:</span> {today}</p>'
+
+def test_timestamp_flushed_on_demand(site_index):
+    """flush_site_timestamp writes a pending update right away."""
+    manager.update_site_timestamp(delay=60)
+    manager.flush_site_timestamp()
+    assert '2020' not in site_index.read_text(encoding='utf-8')
+
+def test_timestamp_unchanged_not_rewritten(site_index, mocker):
+    """A file already showing today's date is not read or written again."""
+    manager.write_site_timestamp()
+    opened = mocker.patch('builtins.open', wraps=open)
+    manager.write_site_timestamp()
+    opened.assert_not_called()
@@ -0,0 +1,37 @@
+import pytest
+import hashlib
+import io
+
+import media_index
+from media_index import MediaIndex, file_digest, find_duplicate_urls
+
+def test_digest_streams_and_rewinds(tmp_path, monkeypatch):
+    """Hashing reads in chunks and leaves file objects where they were."""
+    monkeypatch.setattr(media_index, 'HASH_CHUNK_SIZE', 4)
+    data = b'0123456789abcdef'
+    path = tmp_path / 'scan.jpg'
+    path.write_bytes(data)
+
+    stream = io.BytesIO(data)
+    assert file_digest(stream) == hashlib.sha256(data).hexdigest()
+    assert stream.tell() == 0
+    assert file_digest(str(path)) == hashlib.sha256(data).hexdigest()
+    assert file_digest(str(tmp_path / 'missing.jpg')) is None
+
+def test_index_persists(tmp_path):
+    """Recorded hashes survive a reload."""
+    index = MediaIndex(tmp_path / 'media-index.json')
+    assert index.lookup('abc') is None
+    index.record('abc', 'http://cdn/a.jpg', 'a.jpg')
+
+    reloaded = MediaIndex(tmp_path / 'media-index.json')
+    assert reloaded.lookup('abc') == 'http://cdn/a.jpg'
+    assert reloaded.hits == 1
+
+def test_find_duplicate_urls():
+    """Cover and gallery URLs are both checked across categories."""
+    data = {
+        'painting': [{"id": "p1", "url": "http://a", "gallery": ["http://b"]}],
+        'drawing': [{"id": "d1", "url": "http://b"}, {"id": "d2", "url": "http://c"}],
+    }
+    assert find_duplicate_urls(data.keys(), data.get) == {"http://b": ["painting/p1", "drawing/d1"]}
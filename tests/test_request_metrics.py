@@ -0,0 +1,115 @@
+import pytest
+import time
+
+from request_metrics import Histogram, Metrics
+
+
+def test_histogram_buckets_are_cumulative():
+    histogram = Histogram(buckets=(0.01, 0.1))
+    for seconds in (0.005, 0.05, 0.5, 0.01):
+        histogram.observe(seconds)
+    assert histogram.cumulative() == [(0.01, 2), (0.1, 3), ('+Inf', 4)]
+    assert histogram.count == 4
+    assert histogram.sum == pytest.approx(0.565)
+
+
+def test_phases_are_exclusive_within_a_request(monkeypatch):
+    """A nested phase's time is taken off the enclosing one."""
+    clock = [100.0]
+    monkeypatch.setattr(time, 'perf_counter', lambda: clock[0])
+    metrics = Metrics()
+    token = metrics.begin_request()
+    with metrics.phase('io'):
+        clock[0] += 0.01
+        with metrics.phase('parse'):
+            clock[0] += 0.02
+    clock[0] += 0.005
+    total, phases = metrics.end_request(token, '/api/x', 'GET', 200)
+
+    assert phases['parse'] == pytest.approx(0.02)
+    assert phases['io'] == pytest.approx(0.01)
+    assert total == pytest.approx(0.035)
+    assert metrics.current_phases() is None
+
+
+def test_phases_outside_requests_only_feed_histograms():
+    metrics = Metrics()
+    timed = metrics.timed('upload')(lambda: 'url')
+    assert timed() == 'url'
+    assert metrics.phase_times['upload'].count == 1
+    assert metrics.requests == {}
+
+
+def test_server_timing_header():
+    header = Metrics().server_timing(0.0123, {'io': 0.002})
+    assert header == 'io;dur=2.00;desc="File I/O", total;dur=12.30'
+
+
+def test_render_prometheus_text():
+    metrics = Metrics()
+    token = metrics.begin_request()
+    with metrics.phase('serialize'):
+        pass
+    metrics.end_request(token, '/api/content/item', 'GET', 404)
+    text = metrics.render()
+
+    assert '# TYPE admin_requests_total counter' in text
+    assert 'admin_requests_total{route="/api/content/item",method="GET",status="404"} 1' in text
+    assert '# TYPE admin_request_duration_seconds histogram' in text
+    assert 'admin_request_duration_seconds_bucket{route="/api/content/item",le="+Inf"} 1' in text
+    assert 'admin_request_duration_seconds_count{route="/api/content/item"} 1' in text
+    assert 'admin_phase_duration_seconds_count{phase="serialize"} 1' in text
+    assert text.endswith('\n')
+
+
+def test_label_values_are_escaped():
+    metrics = Metrics()
+    metrics.end_request(metrics.begin_request(), 'a"b\\c', 'GET', 200)
+    assert 'route="a\\"b\\\\c"' in metrics.render()
+
+
+def test_upload_is_a_phase(monkeypatch, tmp_path):
+    """manager.upload_single counts as the request's upload phase."""
+    import manager
+    from request_metrics import metrics
+
+    class Uploader:
+        def upload(self, file, **options):
+            time.sleep(0.005)
+            return {"secure_url": "https://cdn/x.jpg"}
+
+    monkeypatch.setattr(manager, 'cloudinary_uploader', lambda: Uploader())
+    monkeypatch.setattr(manager, 'GITHUB_TOKEN', None)
+    image = tmp_path / 'x.jpg'
+    image.write_bytes(b'image')
+
+    token = metrics.begin_request()
+    try:
+        assert manager.upload_single(str(image), 'painting') == "https://cdn/x.jpg"
+    finally:
+        _, phases = metrics.end_request(token, 'test', 'POST', 200)
+    assert phases['upload'] >= 0.005
+
+
+def test_phases_from_pool_threads_count_for_the_request():
+    """Work run in a copy of the request's context adds to its phases,
+    each thread nesting its own phases."""
+    import contextvars
+    from concurrent.futures import ThreadPoolExecutor
+
+    metrics = Metrics()
+
+    def work():
+        with metrics.phase('upload'):
+            time.sleep(0.01)
+            with metrics.phase('io'):
+                time.sleep(0.01)
+
+    token = metrics.begin_request()
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        for _ in range(4):
+            pool.submit(contextvars.copy_context().run, work)
+    _, phases = metrics.end_request(token, '/api/x', 'POST', 200)
+
+    assert phases['io'] >= 0.04
+    assert 0.04 <= phases['upload'] < phases['io'] + 0.04
@@ -0,0 +1,84 @@
+import pytest
+import json
+
+from content_store import ContentStore
+from search_index import SearchIndex, tokenize
+
+@pytest.fixture
+def index(tmp_path):
+    paths = {'painting': str(tmp_path / 'painting.json'), 'projects': str(tmp_path / 'projects.json')}
+    with open(paths['painting'], 'w', encoding='utf-8') as f:
+        json.dump([
+            {"id": "p1", "title": {"en": "Summer Garden", "fr": "Jardin d'été"},
+             "medium": {"en": "Oil on canvas", "fr": "Huile sur toile"}},
+            {"id": "p2", "title": {"en": "Winter Night", "fr": "Nuit d'hiver"}},
+        ], f)
+    with open(paths['projects'], 'w', encoding='utf-8') as f:
+        json.dump([{"title": "garden-planner", "description": {"en": "Plans gardens"}}], f)
+    store = ContentStore(paths.get)
+    return SearchIndex(store, lambda: list(paths), ['en', 'fr'])
+
+def ids(results):
+    return [item.get('id', item.get('title')) for _, item in results]
+
+def test_tokenize_folds_accents_for_fr_only():
+    assert tokenize("Jardin d'Été", 'fr') == ['jardin', 'd', 'ete']
+    assert tokenize("Café", 'en') == ['café']
+
+def test_prefix_and_accent_matching(index):
+    """Words match as prefixes, accents are ignored in French text."""
+    assert ids(index.search('gard')) == ['p1', 'garden-planner']
+    assert ids(index.search('ete', lang='fr')) == ['p1']
+    assert ids(index.search('ete', lang='en')) == []
+    assert ids(index.search('huile toi', lang='fr')) == ['p1']
+    assert ids(index.search('huile night')) == []
+
+def test_category_filter(index):
+    assert ids(index.search('gard', categories=['projects'])) == ['garden-planner']
+
+def test_apply_updates_incrementally(index):
+    """Saved mutations update the index without re-reading the category."""
+    store = index.store
+    index.search('x')
+    rebuilt = store.stats()['misses']
+
+    before = store.version('painting')
+    item = store.update('painting', 1, {"title": {"en": "Spring Night"}})
+    removed = store.remove('painting', 0)
+    store.save('painting')
+    index.apply('painting', before, changed=[item], removed=[removed])
+
+    assert ids(index.search('spring')) == ['p2']
+    assert ids(index.search('summer')) == []
+    assert store.stats()['misses'] == rebuilt
+
+def test_external_edit_reindexes(index):
+    """A data file changed on disk is re-indexed on the next search."""
+    assert ids(index.search('autumn')) == []
+    with open(index.store.path_for('painting'), 'w', encoding='utf-8') as f:
+        json.dump([{"id": "p9", "title": {"en": "Autumn Leaves"}}], f)
+
+    assert ids(index.search('autumn')) == ['p9']
+
+def test_rebuild_counts_items(index):
+    assert index.rebuild() == {'painting': 2, 'projects': 1}
+    assert index.stats()['rebuilds'] == 1
+
+def test_hits_resolved_through_store_index(index, mocker):
+    """Hits are looked up by key, not by scanning the category, and keep file order."""
+    store = index.store
+    store.append('painting', {"id": "p3", "title": {"en": "Garden Path"}})
+    store.append('painting', {"id": "p4", "title": {"en": "Garden Wall"}})
+    store.save('painting')
+    index.search('x')
+
+    find = mocker.spy(store, 'find')
+    assert ids(index.search('garden', categories=['painting'])) == ['p1', 'p3', 'p4']
+    assert find.call_count == 3
+
+def test_duplicate_ids_all_match(index):
+    store = index.store
+    store.append('painting', {"id": "p1", "title": {"en": "Garden Copy"}})
+    store.save('painting')
+    assert [item['title']['en'] for _, item in index.search('garden', categories=['painting'])] == [
+        'Summer Garden', 'Garden Copy']
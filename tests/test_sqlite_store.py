@@ -0,0 +1,80 @@
+import pytest
+import json
+import os
+
+from sqlite_store import SqliteStore
+
+@pytest.fixture
+def paths(tmp_path):
+    painting = tmp_path / 'painting.json'
+    painting.write_text(json.dumps([
+        {"id": "p1", "title": {"en": "Été"}, "url": "http://a.jpg"},
+        {"id": "p2", "url": "http://b.jpg"},
+    ]))
+    return {'painting': str(painting), 'music': str(tmp_path / 'music.json')}
+
+@pytest.fixture
+def store(tmp_path, paths):
+    return SqliteStore(paths.get, tmp_path / 'content.db')
+
+def test_imports_json_on_first_use(store):
+    """A category not yet in the database is imported from its JSON file."""
+    assert [i['id'] for i in store.load('painting')] == ['p1', 'p2']
+    assert store.exists('painting')
+    assert store.load('music') == []
+
+def test_mutations_survive_reopen(tmp_path, paths, store):
+    """Saves are committed: a new store on the same database sees them."""
+    store.append('painting', {"id": "p3", "url": "http://c.jpg"})
+    store.update('painting', 0, {"gallery": ["http://c.jpg"]})
+    store.remove('painting', 1)
+    store.save('painting')
+
+    reopened = SqliteStore(paths.get, tmp_path / 'content.db')
+    items = reopened.load('painting')
+    assert [i['id'] for i in items] == ['p1', 'p3']
+    assert items[0]['gallery'] == ["http://c.jpg"]
+    assert reopened.find('painting', 'p3') == 1
+
+def test_reload_after_write_from_other_store(tmp_path, paths, store):
+    """The version counter invalidates another process's cached copy."""
+    store.load('painting')
+    other = SqliteStore(paths.get, tmp_path / 'content.db')
+    other.append('painting', {"id": "p3"})
+    other.save('painting')
+
+    assert len(store.load('painting')) == 3
+
+def test_export_writes_static_json(paths, store):
+    """Export produces the same file format as the JSON backend, and
+    replaces the file atomically without changing its mode."""
+    os.chmod(paths['painting'], 0o644)
+    store.append('painting', {"id": "p3"})
+    store.save('painting')
+    assert store.export('painting') == 3
+    assert os.stat(paths['painting']).st_mode & 0o777 == 0o644
+    assert not [n for n in os.listdir(os.path.dirname(paths['painting'])) if n.endswith('.tmp')]
+
+    with open(paths['painting'], 'r', encoding='utf-8') as f:
+        text = f.read()
+    items = json.loads(text)
+    assert text == json.dumps(items, indent=4, ensure_ascii=False)
+    assert items[0]['title']['en'] == 'Été'
+
+def test_save_many_is_one_transaction(tmp_path, paths, store):
+    """A category that can't be written rolls back the others."""
+    store.load('music')
+    store.append('painting', {"id": "p3"})
+    store.append('music', {"id": "m1", "bad": {1, 2}})  # not JSON
+    with pytest.raises(TypeError):
+        store.save_many(['painting', 'music'])
+
+    reopened = SqliteStore(paths.get, tmp_path / 'content.db')
+    assert [i['id'] for i in reopened.load('painting')] == ['p1', 'p2']
+
+    store.append('painting', {"id": "p3"})
+    store.append('music', {"id": "m1"})
+    store.save_many(['painting', 'music'])
+    reopened = SqliteStore(paths.get, tmp_path / 'content.db')
+    assert [i['id'] for i in reopened.load('painting')] == ['p1', 'p2', 'p3']
+    assert [i['id'] for i in reopened.load('music')] == ['m1']
@@ -0,0 +1,284 @@
+import pytest
+import gzip
+import http.client
+import os
+import socket
+import threading
+
+from static_server import CachingHandler, FileCache, make_server, parse_ranges
+
+
+@pytest.fixture
+def site(tmp_path):
+    (tmp_path / 'index.html').write_text('<h1>home</h1>')
+    (tmp_path / 'app.js').write_text('console.log(1)')
+    (tmp_path / 'data').mkdir()
+    feed = b'[' + b'{"id": 1},' * 200 + b'{}]'
+    (tmp_path / 'data' / 'feed.json').write_bytes(feed)
+    (tmp_path / 'data' / 'feed.json.gz').write_bytes(gzip.compress(feed))
+    return tmp_path
+
+
+@pytest.fixture
+def serve(site):
+    servers = []
+
+    def start(handler_class=CachingHandler):
+        class Handler(handler_class):
+            file_cache = FileCache()
+
+            def __init__(self, *args, **kwargs):
+                if handler_class is CachingHandler:
+                    kwargs['directory'] = str(site)
+                super().__init__(*args, **kwargs)
+
+            def log_message(self, *args):
+                pass
+
+        server = make_server(Handler, 0, host='127.0.0.1')
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        servers.append(server)
+        return server.server_address[1], Handler
+
+    yield start
+    for server in servers:
+        server.shutdown()
+        server.server_close()
+
+
+def get(port, path, headers=None):
+    conn = http.client.HTTPConnection('127.0.0.1', port, timeout=5)
+    conn.request('GET', path, headers=headers or {})
+    response = conn.getresponse()
+    body = response.read()
+    conn.close()
+    return response, body
+
+
+def test_serves_from_memory_with_validators(serve, site):
+    port, handler = serve()
+    response, body = get(port, '/app.js')
+    assert response.status == 200
+    assert body == b'console.log(1)'
+    assert response.getheader('ETag')
+    assert response.getheader('Cache-Control') == 'no-cache'
+    assert response.getheader('Last-Modified')
+
+    get(port, '/app.js')
+    assert handler.file_cache.stats()['hits'] == 1
+
+
+def test_conditional_request_gets_304(serve):
+    port, _ = serve()
+    first, _ = get(port, '/app.js')
+    response, body = get(port, '/app.js', {'If-None-Match': first.getheader('ETag')})
+    assert response.status == 304
+    assert body == b''
+    assert response.getheader('ETag') == first.getheader('ETag')
+
+
+def test_weak_etag_matches_for_304(serve):
+    """If-None-Match uses weak comparison; If-Range stays strong."""
+    port, _ = serve()
+    etag = get(port, '/app.js')[0].getheader('ETag')
+
+    response, _ = get(port, '/app.js', {'If-None-Match': f'"other", W/{etag}'})
+    assert response.status == 304
+
+    response, body = get(port, '/app.js', {'Range': 'bytes=0-2', 'If-Range': f'W/{etag}'})
+    assert response.status == 200
+    assert body == b'console.log(1)'
+
+
+def test_changed_file_is_revalidated(serve, site):
+    port, _ = serve()
+    first, _ = get(port, '/app.js')
+    path = site / 'app.js'
+    path.write_text('console.log(2) // edited')
+    st = os.stat(path)
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 10**9))
+
+    response, body = get(port, '/app.js', {'If-None-Match': first.getheader('ETag')})
+    assert response.status == 200
+    assert body == b'console.log(2) // edited'
+
+
+def test_precompressed_sibling(serve, site):
+    port, _ = serve()
+    response, body = get(port, '/data/feed.json', {'Accept-Encoding': 'br;q=1.0, gzip'})
+    assert response.getheader('Content-Encoding') == 'gzip'
+    assert response.getheader('Content-Type') == 'application/json'
+    assert response.getheader('Vary') == 'Accept-Encoding'
+    assert gzip.decompress(body) == (site / 'data' / 'feed.json').read_bytes()
+
+    response, body = get(port, '/data/feed.json')
+    assert response.getheader('Content-Encoding') is None
+    assert body == (site / 'data' / 'feed.json').read_bytes()
+
+
+def test_stale_sibling_is_ignored(serve, site):
+    port, _ = serve()
+    path = site / 'data' / 'feed.json'
+    st = os.stat(path)
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 10**9))
+    response, _ = get(port, '/data/feed.json', {'Accept-Encoding': 'gzip'})
+    assert response.getheader('Content-Encoding') is None
+
+
+def test_large_files_stream_from_disk(serve, site):
+    port, handler = serve()
+    handler.file_cache = FileCache(max_file=10)
+    response, body = get(port, '/data/feed.json')
+    assert body == (site / 'data' / 'feed.json').read_bytes()
+    assert handler.file_cache.stats()['files'] == 0
+
+
+def test_cache_evicts_least_recently_used(tmp_path):
+    cache = FileCache(max_bytes=10)
+    for name in 'abc':
+        (tmp_path / name).write_bytes(b'x' * 4)
+        cache.get(str(tmp_path / name), os.stat(tmp_path / name))
+    assert cache.stats()['files'] == 2
+    assert cache.stats()['bytes'] == 8
+
+
+def test_immutable_bundle_shards(serve, site):
+    (site / 'data' / 'feed-0-abc123.json').write_text('[]')
+    port, _ = serve()
+    response, _ = get(port, '/data/feed-0-abc123.json')
+    assert 'immutable' in response.getheader('Cache-Control')
+
+
+def test_directory_serves_index(serve):
+    port, _ = serve()
+    response, body = get(port, '/')
+    assert response.status == 200
+    assert body == b'<h1>home</h1>'
+    assert response.getheader('ETag')
+
+
+def test_spa_fallback(serve, site, monkeypatch):
+    import server
+    monkeypatch.setattr(server, 'ROOT', str(site))
+    port, _ = serve(server.SPAHandler)
+    response, body = get(port, '/gallery.html')
+    assert response.status == 200
+    assert body == b'<h1>home</h1>'
+
+    response, _ = get(port, '/missing.js')
+    assert response.status == 404
+
+
+def test_slow_client_does_not_block_others(serve):
+    port, _ = serve()
+    # A connection that never sends its request holds its own thread only
+    slow = socket.create_connection(('127.0.0.1', port))
+    try:
+        slow.sendall(b'GET /app.js HTTP/1.1\r\n')
+        response, body = get(port, '/app.js')
+        assert body == b'console.log(1)'
+    finally:
+        slow.close()
+
+
+@pytest.fixture
+def track(site):
+    data = bytes(range(256)) * 4096  # 1 MiB, too big for the memory cache
+    (site / 'track.mp3').write_bytes(data)
+    return data
+
+
+@pytest.mark.parametrize('header, expected', [
+    ('bytes=0-99', [(0, 99)]),
+    ('bytes=100-', [(100, 999)]),
+    ('bytes=-100', [(900, 999)]),
+    ('bytes=990-2000', [(990, 999)]),
+    ('bytes=0-0, 5-9', [(0, 0), (5, 9)]),
+    ('bytes=1000-', []),
+    ('bytes=-0', []),
+    ('bytes=9-5', None),
+    ('bytes=a-5', None),
+    ('items=0-5', None),
+    ('bytes=' + ','.join(['0-1'] * 33), None),
+])
+def test_parse_ranges(header, expected):
+    assert parse_ranges(header, 1000) == expected
+
+
+@pytest.mark.parametrize('path', ['/track.mp3', '/app.js'])
+def test_single_range(serve, site, track, path):
+    data = (site / path.lstrip('/')).read_bytes()
+    port, _ = serve()
+    response, body = get(port, path, {'Range': 'bytes=5-9'})
+    assert response.status == 206
+    assert response.getheader('Content-Range') == f'bytes 5-9/{len(data)}'
+    assert body == data[5:10]
+
+
+def test_full_response_advertises_ranges(serve, track):
+    port, _ = serve()
+    response, body = get(port, '/track.mp3')
+    assert response.status == 200
+    assert response.getheader('Accept-Ranges') == 'bytes'
+    assert body == track
+
+
+def test_multiple_ranges(serve, track):
+    port, _ = serve()
+    response, body = get(port, '/track.mp3', {'Range': 'bytes=0-3,-4'})
+    assert response.status == 206
+    ctype = response.getheader('Content-Type')
+    assert ctype.startswith('multipart/byteranges; boundary=')
+    assert int(response.getheader('Content-Length')) == len(body)
+
+    boundary = ctype.split('boundary=')[1].encode()
+    parts = body.split(b'--' + boundary)
+    assert parts[-1] == b'--\r\n'
+    chunks = [p.split(b'\r\n\r\n', 1) for p in parts[1:-1]]
+    assert b'Content-Range: bytes 0-3/1048576' in chunks[0][0]
+    assert chunks[0][1] == track[:4] + b'\r\n'
+    assert b'Content-Range: bytes 1048572-1048575/1048576' in chunks[1][0]
+    assert chunks[1][1] == track[-4:] + b'\r\n'
+
+
+def test_unsatisfiable_range(serve, track):
+    port, _ = serve()
+    response, body = get(port, '/track.mp3', {'Range': 'bytes=2000000-'})
+    assert response.status == 416
+    assert response.getheader('Content-Range') == f'bytes */{len(track)}'
+
+
+def test_if_range(serve, track):
+    port, _ = serve()
+    etag = get(port, '/track.mp3')[0].getheader('ETag')
+
+    response, body = get(port, '/track.mp3', {'Range': 'bytes=0-9', 'If-Range': etag})
+    assert response.status == 206
+    assert body == track[:10]
+
+    response, body = get(port, '/track.mp3', {'Range': 'bytes=0-9', 'If-Range': '"stale"'})
+    assert response.status == 200
+    assert body == track
+
+
+def test_range_ignores_compressed_sibling(serve, site):
+    port, _ = serve()
+    response, body = get(port, '/data/feed.json', {'Range': 'bytes=0-0', 'Accept-Encoding': 'gzip'})
+    assert response.status == 206
+    assert response.getheader('Content-Encoding') is None
+    assert body == b'['
+
+
+def test_large_bodies_use_sendfile(serve, track, monkeypatch):
+    calls = []
+    original = socket.socket.sendfile
+
+    def sendfile(self, file, offset=0, count=None):
+        calls.append((offset, count))
+        return original(self, file, offset, count)
+
+    monkeypatch.setattr(socket.socket, 'sendfile', sendfile)
+    port, _ = serve()
+    _, body = get(port, '/track.mp3', {'Range': 'bytes=10-'})
+    assert body == track[10:]
+    assert calls == [(10, len(track) - 10)]
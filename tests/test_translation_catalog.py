@@ -0,0 +1,75 @@
+import pytest
+import json
+
+from translation_catalog import TranslationCatalog
+
+@pytest.fixture
+def catalog(tmp_path):
+    (tmp_path / 'en.json').write_text(json.dumps({"a": "A", "b": "B", "c": "C"}))
+    (tmp_path / 'fr.json').write_text(json.dumps({"a": "A fr"}))
+    (tmp_path / 'ht.json').write_text(json.dumps({"a": "A ht", "b": "B ht", "c": "C ht"}))
+    return TranslationCatalog(tmp_path)
+
+def test_files_parsed_once(catalog):
+    """Repeated reads are served from memory until a file changes."""
+    first = catalog.all()
+    assert catalog.all() == first
+    assert catalog.stats()['misses'] == 3
+
+    (catalog.lang_dir / 'fr.json').write_text(json.dumps({"a": "A fr", "b": "B fr"}))
+    assert catalog.get('fr') == {"a": "A fr", "b": "B fr"}
+    assert catalog.stats()['misses'] == 4
+
+def test_missing_and_coverage(catalog):
+    assert catalog.missing() == {"fr": ["b", "c"]}
+    assert catalog.coverage()['fr'] == {"total": 3, "translated": 1, "missing": 2}
+    assert catalog.coverage()['ht']['missing'] == 0
+
+def test_set_updates_missing_incrementally(catalog):
+    """Writing keys adjusts the missing sets without re-reading the files."""
+    catalog.missing()
+    misses = catalog.stats()['misses']
+
+    catalog.set('fr', 'b', 'B fr')
+    catalog.set('en', 'd', 'D')
+    assert catalog.missing() == {"fr": ["c", "d"], "ht": ["d"]}
+    assert catalog.stats()['misses'] == misses
+    assert json.loads((catalog.lang_dir / 'fr.json').read_text())['b'] == 'B fr'
+
+def test_set_unknown_language(catalog):
+    with pytest.raises(FileNotFoundError):
+        catalog.set('xx', 'a', 'A')
+
+def test_new_language_file_is_listed(catalog):
+    catalog.languages()
+    (catalog.lang_dir / 'mx.json').write_text(json.dumps({"a": "A mx"}))
+    assert catalog.missing()['mx'] == ["b", "c"]
+
+def test_set_many_writes_each_file_once(catalog, mocker):
+    """A batch rewrites each touched file once and reports every key."""
+    write = mocker.spy(catalog, '_write')
+    results = catalog.set_many([
+        ('fr', 'b', 'B fr'), ('fr', 'c', 'C fr'), ('en', 'd', 'D'), ('xx', 'a', 'A'),
+    ])
+
+    assert sorted(call.args[0] for call in write.call_args_list) == ['en', 'fr']
+    assert [r['success'] for r in results] == [True, True, True, False]
+    assert catalog.missing() == {"fr": ["d"], "ht": ["d"]}
+    assert not list(catalog.lang_dir.glob('*.tmp'))
+
+def test_concurrent_batches_keep_all_keys(catalog):
+    """Parallel batches on the same file don't lose each other's keys."""
+    from concurrent.futures import ThreadPoolExecutor
+    batches = [[('fr', f'k{n}_{i}', 'x') for i in range(10)] for n in range(8)]
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        list(pool.map(catalog.set_many, batches))
+
+    saved = json.loads((catalog.lang_dir / 'fr.json').read_text())
+    assert all(key in saved for batch in batches for _, key, _ in batch)
+
+def test_write_keeps_file_mode(catalog):
+    import os
+    path = catalog.lang_dir / 'fr.json'
+    os.chmod(path, 0o644)
+    catalog.set('fr', 'b', 'B fr')
+    assert os.stat(path).st_mode & 0o777 == 0o644
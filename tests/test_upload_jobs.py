@@ -0,0 +1,142 @@
+import pytest
+import json
+import os
+
+from upload_jobs import JobQueue
+
+@pytest.fixture
+def queue(tmp_path):
+    return JobQueue(tmp_path / 'jobs', workers=1, retries=2, retry_delay=0)
+
+def test_job_runs_and_reports_result(queue):
+    """A queued job runs in the background and keeps its result."""
+    queue.register('echo', lambda job: {"echo": job["params"]["value"]})
+
+    job = queue.submit('echo', {"value": 42})
+    assert job["status"] == "queued"
+
+    done = queue.wait(job["id"])
+    assert done["status"] == "done"
+    assert done["result"] == {"echo": 42}
+    assert done["attempts"] == 1
+    assert done["progress"] == {"done": 1, "total": 1}
+
+def test_job_retried_until_it_succeeds(queue):
+    """Failing attempts are retried, up to the retry limit."""
+    calls = []
+    def flaky(job):
+        calls.append(job["attempts"])
+        if len(calls) < 3:
+            raise RuntimeError("timeout")
+        return "ok"
+    queue.register('flaky', flaky)
+
+    done = queue.wait(queue.submit('flaky', {})["id"])
+
+    assert done["status"] == "done"
+    assert calls == [1, 2, 3]
+
+def test_job_fails_after_retries(queue):
+    """A job that keeps failing ends with the last error."""
+    queue.register('broken', lambda job: (_ for _ in ()).throw(RuntimeError("remote down")))
+
+    done = queue.wait(queue.submit('broken', {})["id"])
+
+    assert done["status"] == "failed"
+    assert done["attempts"] == 3
+    assert done["error"] == "remote down"
+
+def test_value_error_is_not_retried(queue):
+    """Invalid input (ValueError) fails the job at once."""
+    def invalid(job):
+        raise ValueError("Category 'nope' is invalid.")
+    queue.register('invalid', invalid)
+
+    done = queue.wait(queue.submit('invalid', {})["id"])
+
+    assert done["status"] == "failed"
+    assert done["attempts"] == 1
+
+def test_job_files_removed_when_finished(queue):
+    """The job directory holding uploaded files goes away once the job is done."""
+    queue.register('noop', lambda job: None)
+    job_id, job_dir = queue.reserve()
+    (job_dir / 'upload.jpg').write_bytes(b'jpeg')
+
+    queue.wait(queue.submit('noop', {}, job_id=job_id)["id"])
+
+    assert not job_dir.exists()
+
+def test_pending_jobs_survive_restart(tmp_path):
+    """Jobs persisted before a restart are run by the next queue."""
+    before = JobQueue(tmp_path / 'jobs')
+    before.register('echo', lambda job: job["params"])
+    before.start = lambda: None  # stopped before any worker picked it up
+    job = before.submit('echo', {"value": 1})
+
+    persisted = json.loads((tmp_path / 'jobs' / 'jobs.json').read_text())
+    assert [j["status"] for j in persisted] == ["queued"]
+
+    after = JobQueue(tmp_path / 'jobs', retry_delay=0)
+    after.register('echo', lambda job: job["params"])
+    after.start()
+
+    done = after.wait(job["id"])
+    assert done["status"] == "done"
+    assert done["result"] == {"value": 1}
+
+def test_finished_jobs_trimmed(tmp_path):
+    """Only the most recent finished jobs are kept."""
+    queue = JobQueue(tmp_path / 'jobs', keep_finished=2)
+    queue.register('noop', lambda job: None)
+    ids = [queue.submit('noop', {})["id"] for _ in range(4)]
+    for job_id in ids:
+        queue.wait(job_id)
+
+    assert len(queue.list()) == 2
+
+def test_queues_sharing_a_directory_never_run_the_same_job(tmp_path):
+    """Two queues (two admin processes) loading the same pending jobs run each once."""
+    import time
+    runs = []
+
+    def record(name):
+        def handler(job):
+            runs.append((name, job["id"]))
+            time.sleep(0.01)
+        return handler
+
+    first = JobQueue(tmp_path / 'jobs', workers=2)
+    first.register('noop', record('first'))
+    start = first.start
+    first.start = lambda: None
+    ids = [first.submit('noop', {})["id"] for _ in range(8)]
+
+    second = JobQueue(tmp_path / 'jobs', workers=2)
+    second.register('noop', record('second'))
+    second.start()
+    first.start = start
+    first.start()
+
+    deadline = time.monotonic() + 10
+    while len(runs) < len(ids) and time.monotonic() < deadline:
+        time.sleep(0.01)
+    time.sleep(0.1)
+    assert sorted(job_id for _, job_id in runs) == sorted(ids)
+
+def test_claim_of_a_stopped_process_is_taken_over(tmp_path):
+    """A job claimed by a queue that no longer exists is run again."""
+    before = JobQueue(tmp_path / 'jobs')
+    before.register('echo', lambda job: job["params"])
+    before.start = lambda: None
+    job = before.submit('echo', {"value": 1})
+    claims = tmp_path / 'jobs' / 'claims'
+    claims.mkdir()
+    (claims / job["id"]).write_text(f"{os.getpid()} gone")
+
+    after = JobQueue(tmp_path / 'jobs', retry_delay=0)
+    after.register('echo', lambda job: job["params"])
+    after.start()
+
+    assert after.wait(job["id"])["status"] == "done"
+    assert (claims / job["id"]).read_text() == after.owner
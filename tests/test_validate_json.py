@@ -0,0 +1,113 @@
+import pytest
+import json
+import shutil
+from pathlib import Path
+
+import validate_json
+
+ROOT = Path(__file__).resolve().parent.parent
+
+
+@pytest.fixture
+def site(tmp_path, monkeypatch):
+    """A content root with the repo's config, en/fr lang files and a painting"""
+    shutil.copytree(ROOT / 'config', tmp_path / 'config')
+    (tmp_path / 'data').mkdir()
+    (tmp_path / 'lang').mkdir()
+    (tmp_path / 'lang' / 'en.json').write_text(json.dumps({"a": "A"}))
+    (tmp_path / 'lang' / 'fr.json').write_text(json.dumps({"a": "A fr"}))
+    (tmp_path / 'data' / 'painting.json').write_text(json.dumps([
+        {"id": "p1", "title": {"en": "Sun", "fr": "Soleil"}, "url": "http://a.jpg"},
+    ]))
+    monkeypatch.chdir(tmp_path)
+    return tmp_path
+
+
+def results_by_path(files, schema=True, jobs=1, cache=None):
+    spec = validate_json.load_schema() if schema else None
+    return {r['path']: r for r in validate_json.validate_files(files, spec, jobs, cache)}
+
+
+def test_compiled_validator():
+    validate = validate_json.compile_validator(
+        {"id": "painting", "fields": {"required": ["title", "url"],
+                                      "optional": [{"name": "medium", "type": "text"}]}},
+        ['en', 'fr'])
+
+    assert validate({"title": {"en": "A", "fr": "B"}, "url": "u"}) == ([], [])
+    assert validate({"title": "Plain", "url": "u", "medium": "Oil"}) == ([], [])
+    errors, _ = validate({"title": {"en": ""}, "url": "u"})
+    assert errors == ["missing required field 'title'"]
+    errors, warnings = validate({"title": {"en": "A", "de": "B"}, "url": "u", "medium": 3, "gallery": "x"})
+    assert errors == ["'medium' must be text or a {lang: text} object", "'gallery' must be a list"]
+    assert warnings == ["'title' has unsupported languages de", "'title' lacks fr"]
+    assert validate("nope") == (["is not an object"], [])
+
+
+def test_data_files_are_checked_against_their_content_type(site):
+    (site / 'data' / 'music.json').write_text(json.dumps([
+        {"id": "m1", "title": {"en": "Song", "fr": "Chanson"}},
+        {"id": "m1", "title": {"en": "Song"}, "url": "http://b.mp3"},
+    ]))
+    results = results_by_path(['data/painting.json', 'data/music.json'])
+
+    assert results['data/painting.json']['errors'] == []
+    music = results['data/music.json']
+    assert music['errors'] == ["item 0 (m1): missing required field 'url'", "item 1 (m1): duplicate id"]
+    assert music['warnings'] == ["item 1 (m1): 'title' lacks fr"]
+
+
+def test_lang_files(site):
+    (site / 'lang' / 'de.json').write_text(json.dumps({"a": ["not", "text"]}))
+    result = results_by_path(['lang/de.json'])['lang/de.json']
+    assert result['errors'] == ["non-text values for a"]
+    assert result['warnings'] == ["'de' is not in config/languages.json"]
+
+
+def test_syntax_errors_without_schema(site):
+    (site / 'data' / 'broken.json').write_text('[{"id": 1,]')
+    results = results_by_path(['data/broken.json', 'data/painting.json'], schema=False)
+    assert results['data/broken.json']['syntax'].startswith('Line 1, Column 11')
+    assert 'syntax' not in results['data/painting.json']
+
+
+def test_process_pool_matches_serial(site):
+    (site / 'data' / 'music.json').write_text(json.dumps([{"id": "m1", "title": "Song"}]))
+    files = validate_json.find_files(['data', 'config', 'lang'])
+    serial = results_by_path(files)
+    parallel = results_by_path(files, jobs=2)
+    for path in files:
+        assert parallel[path]['errors'] == serial[path]['errors']
+        assert parallel[path]['warnings'] == serial[path]['warnings']
+
+
+def test_cache_skips_unchanged_files(site, capsys):
+    cache = site / '.validate-cache.json'
+    assert validate_json.validate_json_files(['data', 'lang'], schema=True, cache_path=str(cache))
+    assert 'Unchanged (cached): 0' in capsys.readouterr().out
+
+    (site / 'lang' / 'fr.json').write_text(json.dumps({"a": "A fr", "b": "B fr"}))
+    assert validate_json.validate_json_files(['data', 'lang'], schema=True, cache_path=str(cache))
+    assert 'Unchanged (cached): 2' in capsys.readouterr().out
+
+    # A changed config changes the checks: nothing is reused
+    languages = json.loads((site / 'config' / 'languages.json').read_text())
+    languages['supportedLanguages'].append({"code": "ht"})
+    (site / 'config' / 'languages.json').write_text(json.dumps(languages))
+    assert validate_json.validate_json_files(['data', 'lang'], schema=True, cache_path=str(cache))
+    assert 'Unchanged (cached): 0' in capsys.readouterr().out
+
+
+def test_failures_are_not_cached(site, capsys):
+    cache = site / '.validate-cache.json'
+    (site / 'data' / 'painting.json').write_text(json.dumps([{"id": "p1"}]))
+    for _ in range(2):
+        assert not validate_json.validate_json_files(['data'], schema=True, cache_path=str(cache))
+        assert "missing required field 'title'" in capsys.readouterr().out
+
+
+def test_strict_fails_on_warnings(site):
+    (site / 'data' / 'painting.json').write_text(json.dumps([
+        {"id": "p1", "title": {"en": "Sun"}, "url": "http://a.jpg"}]))
+    assert validate_json.validate_json_files(['data'], schema=True)
+    assert not validate_json.validate_json_files(['data'], schema=True, strict=True)